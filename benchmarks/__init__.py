@@ -0,0 +1,18 @@
+""" Performance benchmarks for blowdrycss. These are development tools and are not installed with the package.
+
+Run each benchmark from the project root, where ``blowdrycss_settings.py`` can be found. ::
+
+    $ python -m benchmarks.datalibrary_benchmark
+    $ python -m benchmarks.pipeline_benchmark --scales 1000,10000,100000
+    $ python -m benchmarks.history
+
+``synthetic_project`` generates the projects that ``pipeline_benchmark`` runs on. ``history`` records the pipeline
+timings and exits with ``1`` when a stage regressed.
+
+``test_history`` tests ``history``. tox runs it from the project root. ::
+
+    $ python -m unittest discover -s benchmarks -t . -p "test_*.py"
+
+"""
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
@@ -0,0 +1,142 @@
+""" Benchmark clash detection in ``DataLibrary`` using a large synthetic ``custom_property_alias_dict``.
+
+The synthetic dictionary assigns ``aliases_per_property`` custom aliases to every CSS property. A fraction of the
+aliases (``clash_ratio``) is drawn from a small shared pool, so many properties end up clashing with each other.
+
+The pairwise set intersection approach that ``set_clashing_aliases()`` used to take is timed as a reference, and
+its result is checked against the inverted index approach. The full ``DataLibrary()`` construction is timed over the
+same synthetic dictionary with the alias cache disabled.
+
+**Usage Case:** ::
+
+    $ python -m benchmarks.datalibrary_benchmark
+    $ python -m benchmarks.datalibrary_benchmark --aliases-per-property 200 --repeat 5
+
+"""
+# python 2
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# builtins
+from argparse import ArgumentParser
+from copy import deepcopy
+from random import Random
+from timeit import default_timer
+
+# custom
+from blowdrycss.datalibrary import DataLibrary
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+def synthetic_custom_property_alias_dict(property_names, aliases_per_property=50, clash_ratio=0.1, seed=0):
+    """ Build a reproducible custom alias dictionary for every name in ``property_names``.
+
+    :type property_names: set
+    :param property_names: Official CSS property names to create aliases for.
+
+    :type aliases_per_property: int
+    :param aliases_per_property: Number of custom aliases per property.
+
+    :type clash_ratio: float
+    :param clash_ratio: Fraction of the aliases drawn from a shared pool, which makes them clash.
+
+    :type seed: int
+    :param seed: Random seed.
+
+    :return: (*dict*) -- Returns ``{property_name: set of aliases}``.
+
+    """
+    random = Random(seed)
+    shared_pool = ['shared' + str(index) + '-' for index in range(max(1, aliases_per_property))]
+    custom_dict = {}
+    for property_name in sorted(property_names):
+        aliases = set()
+        for index in range(aliases_per_property):
+            if random.random() < clash_ratio:
+                aliases.add(random.choice(shared_pool))
+            else:
+                aliases.add(property_name + '-custom' + str(index) + '-')
+        custom_dict[property_name] = aliases
+    return custom_dict
+
+
+def pairwise_clashing_aliases(property_alias_dict):
+    """ Reference O(P²) implementation that compares every alias set with every other alias set.
+
+    :type property_alias_dict: dict
+    :param property_alias_dict: Maps property names to alias sets.
+
+    :return: (*dict*) -- Returns ``{property_name: set of clashing aliases}``.
+
+    """
+    clashing_alias_dict = {}
+    for key1, alias_set1 in property_alias_dict.items():
+        for key2, alias_set2 in property_alias_dict.items():
+            intersection = alias_set1.intersection(alias_set2)
+            if len(intersection) > 0 and key1 != key2:
+                clashing_alias_dict[key1] = clashing_alias_dict.get(key1, set()).union(intersection)
+    return clashing_alias_dict
+
+
+def best_of(function, repeat=3):
+    """ :return: (*float*) -- Returns the fastest of ``repeat`` wall clock timings of ``function()`` in seconds. """
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        function()
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Benchmark DataLibrary clash detection.')
+    parser.add_argument('--aliases-per-property', type=int, default=50)
+    parser.add_argument('--clash-ratio', type=float, default=0.1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    settings.alias_cache_enabled = False                                # Always time the real build.
+    data_library = DataLibrary()
+    synthetic_dict = synthetic_custom_property_alias_dict(
+        property_names=data_library.property_names,
+        aliases_per_property=args.aliases_per_property,
+        clash_ratio=args.clash_ratio,
+    )
+    data_library.custom_property_alias_dict = synthetic_dict
+    data_library.autogen_property_alias_dict()
+    data_library.merge_dictionaries()
+    merged_dict = deepcopy(data_library.property_alias_dict)
+    alias_count = sum(len(alias_set) for alias_set in merged_dict.values())
+
+    def inverted_index():
+        data_library.property_alias_dict = merged_dict
+        data_library.set_clashing_aliases()
+
+    def remove():
+        data_library.property_alias_dict = merged_dict
+        data_library.remove_clashing_aliases()
+
+    inverted_seconds = best_of(inverted_index, repeat=args.repeat)
+    expected = pairwise_clashing_aliases(merged_dict)
+    assert data_library.clashing_alias_dict == expected, 'Inverted index and pairwise results differ.'
+    pairwise_seconds = best_of(lambda: pairwise_clashing_aliases(merged_dict), repeat=args.repeat)
+    remove_seconds = best_of(remove, repeat=args.repeat)
+
+    custom_property_alias_dict = settings.custom_property_alias_dict
+    settings.custom_property_alias_dict = synthetic_dict                # Build over the same synthetic dict.
+    try:
+        build_seconds = best_of(DataLibrary, repeat=args.repeat)
+    finally:
+        settings.custom_property_alias_dict = custom_property_alias_dict
+
+    print('properties:', len(merged_dict), ' aliases:', alias_count, ' clashing properties:', len(expected))
+    print('set_clashing_aliases (inverted index): %.6f s' % inverted_seconds)
+    print('pairwise reference:                    %.6f s' % pairwise_seconds)
+    print('remove_clashing_aliases:               %.6f s' % remove_seconds)
+    print('DataLibrary() over the synthetic dict: %.6f s' % build_seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+""" Keep a local history of pipeline benchmark results, and flag stage level regressions against it.
+
+Each run of ``benchmarks.pipeline_benchmark`` is appended as one JSON line to the history file. The line is tagged
+with the blowdrycss version, the Python version, and a fingerprint of the machine. Results are only ever compared
+with earlier results from the same machine and Python version.
+
+**Regression rule:** For every scale and stage, the median of the ``repeat`` timings is compared with the baseline
+median. A stage regressed if it got slower by more than ``threshold`` (a fraction), and the slowdown is larger than
+``mad_factor`` times the noise. The noise is the larger median absolute deviation (MAD) of the two runs, scaled by
+1.4826 so that it estimates a standard deviation.
+
+**Exit code:** ``1`` if any stage regressed, else ``0``. This makes the command usable as a local performance gate.
+
+**Usage Case:** ::
+
+    $ python -m benchmarks.history --scales 1000,10000 --repeat 7
+    $ python -m benchmarks.history --compare-only
+    $ python -m benchmarks.history --baseline-version 1.0.3 --threshold 0.05
+
+"""
+# python 2
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# builtins
+from argparse import ArgumentParser
+from collections import OrderedDict
+from datetime import datetime
+from hashlib import sha1
+from io import open
+from json import dumps, loads
+from multiprocessing import cpu_count
+from os import makedirs, path
+import platform
+import sys
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+default_history_path = path.join(path.expanduser('~'), '.cache', 'blowdrycss', 'benchmark_history.jsonl')
+
+
+def median(values):
+    """ :return: (*float*) -- Returns the median of ``values``. """
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def median_absolute_deviation(values):
+    """ :return: (*float*) -- Returns the median absolute deviation of ``values`` from their median. """
+    center = median(values)
+    return median([abs(value - center) for value in values])
+
+
+def project_version():
+    """ :return: (*str*) -- Returns ``__version__`` from ``version.py`` in the project root. """
+    version = {}
+    version_path = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'version.py')
+    try:
+        with open(version_path, encoding='utf-8') as version_file:
+            exec(version_file.read(), version)
+    except IOError:
+        return 'unknown'
+    return version.get('__version__', 'unknown')
+
+
+def machine_fingerprint():
+    """ :return: (*str*) -- Returns a short hash of the host name, operating system, CPU type and CPU count. """
+    identity = '|'.join((
+        platform.node(), platform.system(), platform.machine(), platform.processor(), str(cpu_count()),
+    ))
+    return sha1(identity.encode('utf-8')).hexdigest()[:12]
+
+
+def make_entry(scale_results):
+    """ Tag ``scale_results`` for the history file.
+
+    :type scale_results: dict
+    :param scale_results: ``{file_count: {stage: [seconds, ...]}}`` as produced by
+      ``pipeline_benchmark.benchmark_scale()``.
+
+    :return: (*OrderedDict*) -- Returns the history entry.
+
+    """
+    return OrderedDict((
+        ('timestamp', datetime.now().isoformat()),
+        ('version', project_version()),
+        ('python', '%d.%d.%d' % sys.version_info[:3]),
+        ('machine', machine_fingerprint()),
+        ('results', OrderedDict((str(file_count), results) for file_count, results in scale_results.items())),
+    ))
+
+
+def append_entry(entry, history_path=default_history_path):
+    """ Append ``entry`` as one JSON line to ``history_path``. The directory is created if needed.
+
+    :return: None
+
+    """
+    directory = path.dirname(path.abspath(history_path))
+    if not path.isdir(directory):
+        makedirs(directory)
+    with open(history_path, 'a', encoding='utf-8') as history_file:
+        history_file.write(dumps(entry) + '\n')
+
+
+def read_history(history_path=default_history_path):
+    """ :return: (*list*) -- Returns every entry of ``history_path``, oldest first. Unreadable lines are skipped. """
+    if not path.isfile(history_path):
+        return []
+
+    entries = []
+    with open(history_path, encoding='utf-8') as history_file:
+        for line in history_file:
+            try:
+                entries.append(loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def comparable(entry, other):
+    """ :return: (*bool*) -- Returns True if both entries come from the same machine and Python minor version. """
+    same_python = entry['python'].split('.')[:2] == other['python'].split('.')[:2]
+    return entry['machine'] == other['machine'] and same_python
+
+
+def find_baseline(entries, current, version=None):
+    """ Find the most recent entry in ``entries`` that can be compared with ``current``.
+
+    :type entries: list
+    :param entries: History entries, oldest first. ``current`` must not be among them.
+
+    :type current: dict
+    :param current: The entry to compare.
+
+    :type version: str
+    :param version: Only consider entries of this blowdrycss version. ``None`` considers every version.
+
+    :return: (*dict*) -- Returns the baseline entry, or None.
+
+    """
+    for entry in reversed(entries):
+        if comparable(entry, current) and (version is None or entry['version'] == version):
+            return entry
+    return None
+
+
+def compare(baseline, current, threshold=0.10, mad_factor=3.0):
+    """ Compare every scale and stage that both entries measured.
+
+    :type threshold: float
+    :param threshold: Slowdowns up to this fraction of the baseline median are tolerated.
+
+    :type mad_factor: float
+    :param mad_factor: Slowdowns within this many scaled MADs are treated as noise.
+
+    :return: (*list*) -- Returns one ``OrderedDict`` per scale and stage with the ``baseline`` and ``current``
+      medians, the ``change`` as a fraction, and whether it ``regressed``.
+
+    """
+    rows = []
+    for scale, results in current['results'].items():
+        for stage, timings in results.items():
+            baseline_timings = baseline['results'].get(scale, {}).get(stage)
+            if not baseline_timings or not timings:
+                continue
+
+            baseline_median, current_median = median(baseline_timings), median(timings)
+            noise = 1.4826 * max(median_absolute_deviation(baseline_timings), median_absolute_deviation(timings))
+            change = (current_median - baseline_median) / baseline_median if baseline_median else 0.0
+            regressed = change > threshold and current_median - baseline_median > mad_factor * noise
+            rows.append(OrderedDict((
+                ('scale', scale), ('stage', stage), ('baseline', baseline_median), ('current', current_median),
+                ('change', change), ('regressed', regressed),
+            )))
+    return rows
+
+
+def report(rows, baseline, current):
+    """ :return: (*str*) -- Returns the comparison as a concise plain text report. """
+    lines = [
+        'baseline: ' + baseline['version'] + ' @ ' + baseline['timestamp'],
+        'current:  ' + current['version'] + ' @ ' + current['timestamp'],
+        '',
+        '%-20s %8s %11s %11s %8s' % ('stage', 'files', 'baseline', 'current', 'change'),
+    ]
+    for row in rows:
+        lines.append('%-20s %8s %10.4fs %10.4fs %+7.1f%%%s' % (
+            row['stage'], row['scale'], row['baseline'], row['current'], 100 * row['change'],
+            '  REGRESSION' if row['regressed'] else '',
+        ))
+    regressions = sum(row['regressed'] for row in rows)
+    lines.extend(['', str(regressions) + ' regression(s) in ' + str(len(rows)) + ' stage measurement(s).'])
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Record pipeline benchmarks and compare them with the history.')
+    parser.add_argument('--history', default=default_history_path, help='JSONL history file.')
+    parser.add_argument('--scales', default='1000,10000', help='Comma separated file counts.')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per scale. The median is compared.')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Tolerated slowdown as a fraction.')
+    parser.add_argument('--mad-factor', type=float, default=3.0, help='Slowdowns within this many MADs are noise.')
+    parser.add_argument('--baseline-version', default=None, help='Compare with the latest entry of this version.')
+    parser.add_argument('--compare-only', action='store_true', help='Compare the latest entry. Run nothing.')
+    args = parser.parse_args(argv)
+
+    entries = read_history(history_path=args.history)
+    if args.compare_only:
+        if not entries:
+            print('The history is empty:', args.history)
+            return 0
+        current, entries = entries[-1], entries[:-1]
+    else:
+        import logging
+        import cssutils
+        from benchmarks.pipeline_benchmark import benchmark_scale
+
+        cssutils.log.setLevel(logging.CRITICAL)                         # Invalid classes are expected.
+        current = make_entry(OrderedDict(
+            (file_count, benchmark_scale(file_count=file_count, repeat=args.repeat))
+            for file_count in [int(scale) for scale in args.scales.split(',')]
+        ))
+        append_entry(current, history_path=args.history)
+
+    baseline = find_baseline(entries, current, version=args.baseline_version)
+    if baseline is None:
+        print('\nNo comparable baseline in', args.history, '(same machine and Python version).')
+        return 0
+
+    rows = compare(baseline, current, threshold=args.threshold, mad_factor=args.mad_factor)
+    print('\n' + report(rows, baseline, current))
+    return 1 if any(row['regressed'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
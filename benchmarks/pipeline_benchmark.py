@@ -0,0 +1,150 @@
+""" Time every stage of the blowdrycss pipeline separately on synthetic projects of increasing size.
+
+**Stages:**
+
+- ``FileFinder`` -- Discover the project files.
+- ``ClassParser`` -- Extract the class selectors from every file.
+- ``ClassPropertyParser`` -- Keep the class selectors that match the encoding.
+- ``CSSBuilder`` -- Decode and validate the CSS rules.
+- ``MediaQueryBuilder`` -- Build the breakpoint and scaling media queries.
+- ``CSSFile`` -- Write ``blowdry.css`` and ``blowdry.min.css``.
+
+The synthetic projects come from ``benchmarks.synthetic_project``. Each scale is generated once, then the whole
+pipeline runs ``repeat`` times.
+
+**Usage Case:** ::
+
+    $ python -m benchmarks.pipeline_benchmark
+    $ python -m benchmarks.pipeline_benchmark --scales 1000 --repeat 5
+
+"""
+# python 2
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import bytes
+
+# builtins
+from argparse import ArgumentParser
+from collections import OrderedDict
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+from os import path
+import logging
+
+# custom
+from benchmarks.synthetic_project import file_writers, generate_project
+from blowdrycss.classparser import ClassParser
+from blowdrycss.classpropertyparser import ClassPropertyParser
+from blowdrycss.cssbuilder import CSSBuilder
+from blowdrycss.filehandler import FileFinder, CSSFile
+from blowdrycss.mediaquerybuilder import MediaQueryBuilder
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+stages = ('FileFinder', 'ClassParser', 'ClassPropertyParser', 'CSSBuilder', 'MediaQueryBuilder', 'CSSFile')
+
+
+def run_pipeline():
+    """ Run the pipeline once over ``settings.project_directory``, the same way ``blowdry.parse()`` does.
+
+    :return: (*OrderedDict*) -- Returns ``{stage: seconds}``.
+
+    """
+    timings = OrderedDict()
+
+    start = default_timer()
+    file_finder = FileFinder(recent=False)
+    timings['FileFinder'] = default_timer() - start
+
+    start = default_timer()
+    class_parser = ClassParser(file_dict=file_finder.file_dict)
+    timings['ClassParser'] = default_timer() - start
+
+    start = default_timer()
+    class_property_parser = ClassPropertyParser(class_set=class_parser.class_set)
+    timings['ClassPropertyParser'] = default_timer() - start
+    use_this_set = class_property_parser.class_set.copy()
+
+    start = default_timer()
+    css_builder = CSSBuilder(property_parser=class_property_parser)
+    css_text = bytes(css_builder.get_css_text())
+    timings['CSSBuilder'] = default_timer() - start
+
+    start = default_timer()
+    css_builder.property_parser.class_set = use_this_set.difference(css_builder.property_parser.class_set)
+    css_builder.property_parser.removed_class_set = set()
+    media_query_builder = MediaQueryBuilder(property_parser=class_property_parser)
+    css_text += media_query_builder.get_css_text().encode('utf-8')
+    timings['MediaQueryBuilder'] = default_timer() - start
+
+    start = default_timer()
+    css_file = CSSFile()
+    css_file.write(css_text=css_text)
+    css_file.minify(css_text=css_text)
+    timings['CSSFile'] = default_timer() - start
+    return timings
+
+
+def benchmark_scale(file_count=1000, repeat=3, directory=None, seed=0):
+    """ Generate a synthetic project with ``file_count`` files, then time the pipeline ``repeat`` times.
+
+    :type file_count: int
+    :param file_count: Number of synthetic files.
+
+    :type repeat: int
+    :param repeat: Number of pipeline runs.
+
+    :type directory: str
+    :param directory: Where to generate the project. ``None`` uses a temporary directory that is removed afterwards.
+
+    :type seed: int
+    :param seed: Random seed of the synthetic project.
+
+    :return: (*OrderedDict*) -- Returns ``{stage: [seconds of each run]}``.
+
+    """
+    saved = settings.project_directory, settings.css_directory, settings.file_types
+    temporary = directory is None
+    directory = mkdtemp() if temporary else directory
+    try:
+        generate_project(directory=path.join(directory, 'project'), file_count=file_count, seed=seed)
+        settings.project_directory = path.join(directory, 'project')
+        settings.css_directory = path.join(directory, 'css')
+        settings.file_types = tuple('*' + extension for extension in sorted(file_writers))
+
+        results = OrderedDict((stage, []) for stage in stages)
+        for _ in range(repeat):
+            for stage, seconds in run_pipeline().items():
+                results[stage].append(seconds)
+        return results
+    finally:
+        settings.project_directory, settings.css_directory, settings.file_types = saved
+        if temporary:
+            rmtree(directory)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Time each blowdrycss pipeline stage on synthetic projects.')
+    parser.add_argument('--scales', default='1000,10000,100000', help='Comma separated file counts.')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import cssutils
+    cssutils.log.setLevel(logging.CRITICAL)                             # Invalid classes are expected.
+
+    scale_results = OrderedDict(
+        (file_count, benchmark_scale(file_count=file_count, repeat=args.repeat, seed=args.seed))
+        for file_count in [int(scale) for scale in args.scales.split(',')]
+    )
+
+    print('\n%-20s %10s %12s %12s' % ('stage', 'files', 'best (s)', 'worst (s)'))
+    for file_count, results in scale_results.items():
+        for stage, timings in results.items():
+            print('%-20s %10d %12.4f %12.4f' % (stage, file_count, min(timings), max(timings)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+""" Generate synthetic blowdrycss projects of any size.
+
+Each project contains ``file_count`` files spread across the supported template extensions. Every file references
+class selectors drawn from a shared vocabulary:
+
+- ``encoded_ratio`` -- Fraction of the vocabulary that is a valid blowdrycss encoding e.g. ``padding-10``. The rest
+  are ordinary class names e.g. ``card-title-7`` that blowdrycss discards.
+- ``breakpoint_ratio`` -- Fraction of the encoded classes with a breakpoint suffix e.g. ``padding-10-medium-up``.
+- ``scaling_ratio`` -- Fraction of the encoded classes with the scaling flag e.g. ``font-size-24-s``.
+
+The number of classes per file follows a log-normal distribution around ``classes_per_file``, so a few large files
+sit among many small ones like in a real project.
+
+**Usage Case:** ::
+
+    $ python -m benchmarks.synthetic_project /tmp/synthetic --files 1000
+
+>>> from benchmarks.synthetic_project import generate_project
+>>> file_paths = generate_project(directory='/tmp/synthetic', file_count=1000)
+
+"""
+# python 2
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# builtins
+from argparse import ArgumentParser
+from io import open
+from os import makedirs, path
+from random import Random
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+def markup(class_groups):
+    """ :return: (*str*) -- Returns HTML with one ``div`` per class group. """
+    return '\n'.join('<div class="' + ' '.join(group) + '">text</div>' for group in class_groups)
+
+
+def html_file(class_groups):
+    return '<html>\n<!-- synthetic -->\n<body>\n' + markup(class_groups) + '\n</body>\n</html>\n'
+
+
+def jinja_file(class_groups):
+    return '{% extends "base.jinja2" %}\n{% block content %}\n{{ title }}\n' + markup(class_groups) + \
+           '\n{# synthetic #}\n{% endblock %}\n'
+
+
+def aspx_file(class_groups):
+    return '<%@ Page Language="C#" %>\n<%-- synthetic --%>\n<html>\n' + markup(class_groups) + '\n</html>\n'
+
+
+def erb_file(class_groups):
+    return '<%# synthetic %>\n<%= yield %>\n' + markup(class_groups) + '\n'
+
+
+def php_file(class_groups):
+    return '<?php echo $title; ?>\n' + markup(class_groups) + '\n'
+
+
+def vue_file(class_groups):
+    return '<template>\n<div>\n' + markup(class_groups) + '\n</div>\n</template>\n' + \
+           '<script>\nexport default {}\n</script>\n'
+
+
+def js_file(class_groups):
+    lines = ['// synthetic']
+    for index, group in enumerate(class_groups):
+        if index % 2:
+            lines.append('element.classList.add("' + ' '.join(group) + '");')
+        else:
+            lines.append('element.className += "' + ' '.join(group) + '";')
+    return '\n'.join(lines) + '\n'
+
+
+#: Maps each generated extension to the function that renders a file of that type.
+file_writers = {
+    '.html': html_file,
+    '.jinja2': jinja_file,
+    '.aspx': aspx_file,
+    '.erb': erb_file,
+    '.php': php_file,
+    '.vue': vue_file,
+    '.js': js_file,
+}
+
+encoded_templates = (
+    'padding-{n}', 'margin-top-{n}px', 'margin-{n}', 'width-{n}', 'height-{n}px', 'font-size-{n}', 'bold',
+    'text-align-center', 'display-none', 'color-h{hex}', 'bgc-h{hex}', 'border-{n}px-solid-h{hex}', 'c-blue',
+    'padding-top-{n}', 'line-height-{n}px', 'opacity-{fraction}',
+)
+breakpoints = (
+    '-xsmall-only', '-small-up', '-medium-up', '-medium-down', '-large-only', '-xlarge-up', '-720-up', '-960-down',
+)
+
+
+def class_vocabulary(size=500, encoded_ratio=0.8, breakpoint_ratio=0.1, scaling_ratio=0.1, seed=0):
+    """ Build a reproducible list of ``size`` unique class selectors.
+
+    :type size: int
+    :param size: Number of class selectors.
+
+    :type encoded_ratio: float
+    :param encoded_ratio: Fraction of valid blowdrycss encodings.
+
+    :type breakpoint_ratio: float
+    :param breakpoint_ratio: Fraction of the encoded classes with a breakpoint suffix.
+
+    :type scaling_ratio: float
+    :param scaling_ratio: Fraction of the encoded classes with the scaling flag ``-s``.
+
+    :type seed: int
+    :param seed: Random seed.
+
+    :return: (*list*) -- Returns the class selectors.
+
+    """
+    random = Random(seed)
+    vocabulary, seen = [], set()
+    while len(vocabulary) < size:
+        if random.random() < encoded_ratio:
+            css_class = random.choice(encoded_templates).format(
+                n=random.randint(1, 200),
+                hex='%06x' % random.randint(0, 0xffffff),
+                fraction=random.randint(1, 9) / 10,
+            ).replace('.', 'p')
+            if random.random() < breakpoint_ratio:
+                css_class += random.choice(breakpoints)
+            elif random.random() < scaling_ratio:
+                css_class += '-s'
+        else:
+            css_class = random.choice(('card', 'nav', 'btn', 'item', 'row', 'col')) + '-' + \
+                random.choice(('title', 'body', 'link', 'wrap', 'icon')) + '-' + str(random.randint(1, 10 ** 6))
+
+        if css_class not in seen:
+            seen.add(css_class)
+            vocabulary.append(css_class)
+    return vocabulary
+
+
+def generate_project(directory='', file_count=1000, vocabulary_size=500, encoded_ratio=0.8, breakpoint_ratio=0.1,
+                     scaling_ratio=0.1, classes_per_file=40, size_sigma=1.0, extensions=None, seed=0):
+    """ Write a synthetic project to ``directory``. At most 100 files are written per sub-directory.
+
+    :type directory: str
+    :param directory: Project directory. It is created if it does not exist.
+
+    :type file_count: int
+    :param file_count: Number of files.
+
+    :type vocabulary_size: int
+    :param vocabulary_size: Number of distinct class selectors used across the project.
+
+    :type classes_per_file: int
+    :param classes_per_file: Median number of class selectors per file.
+
+    :type size_sigma: float
+    :param size_sigma: Shape of the log-normal file size distribution. ``0`` makes every file the same size.
+
+    :type extensions: tuple
+    :param extensions: Extensions to cycle through. Defaults to every key of ``file_writers``.
+
+    See ``class_vocabulary()`` for ``encoded_ratio``, ``breakpoint_ratio``, ``scaling_ratio`` and ``seed``.
+
+    :return: (*list*) -- Returns the paths of the files written.
+
+    """
+    random = Random(seed)
+    vocabulary = class_vocabulary(
+        size=vocabulary_size, encoded_ratio=encoded_ratio, breakpoint_ratio=breakpoint_ratio,
+        scaling_ratio=scaling_ratio, seed=seed,
+    )
+    extensions = sorted(file_writers) if extensions is None else list(extensions)
+
+    file_paths = []
+    for index in range(file_count):
+        sub_directory = path.join(directory, 'part' + str(index // 100))
+        if index % 100 == 0 and not path.isdir(sub_directory):
+            makedirs(sub_directory)
+
+        class_count = max(1, int(random.lognormvariate(0, size_sigma) * classes_per_file))
+        classes = [random.choice(vocabulary) for _ in range(class_count)]
+        class_groups = [classes[start:start + 4] for start in range(0, class_count, 4)]
+
+        extension = extensions[index % len(extensions)]
+        file_path = path.join(sub_directory, 'file' + str(index) + extension)
+        with open(file_path, 'w', encoding='utf-8') as generic_file:
+            generic_file.write(file_writers[extension](class_groups))
+        file_paths.append(file_path)
+    return file_paths
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Generate a synthetic blowdrycss project.')
+    parser.add_argument('directory')
+    parser.add_argument('--files', type=int, default=1000)
+    parser.add_argument('--vocabulary-size', type=int, default=500)
+    parser.add_argument('--encoded-ratio', type=float, default=0.8)
+    parser.add_argument('--breakpoint-ratio', type=float, default=0.1)
+    parser.add_argument('--scaling-ratio', type=float, default=0.1)
+    parser.add_argument('--classes-per-file', type=int, default=40)
+    parser.add_argument('--size-sigma', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    file_paths = generate_project(
+        directory=args.directory, file_count=args.files, vocabulary_size=args.vocabulary_size,
+        encoded_ratio=args.encoded_ratio, breakpoint_ratio=args.breakpoint_ratio, scaling_ratio=args.scaling_ratio,
+        classes_per_file=args.classes_per_file, size_sigma=args.size_sigma, seed=args.seed,
+    )
+    print(len(file_paths), 'files written to', args.directory)
+
+
+if __name__ == '__main__':
+    main()
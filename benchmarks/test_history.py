@@ -0,0 +1,71 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+
+# custom
+from benchmarks.history import compare, find_baseline, median, median_absolute_deviation
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+def make_entry(results, machine='abc', python='3.6.1', version='1.0.0'):
+    return {'timestamp': '', 'version': version, 'python': python, 'machine': machine, 'results': results}
+
+
+class TestHistory(TestCase):
+    def test_median_absolute_deviation(self):
+        self.assertEqual(median([3, 1, 2]), 2)
+        self.assertEqual(median([4, 1, 2, 3]), 2.5)
+        self.assertEqual(median_absolute_deviation([1, 2, 3, 4, 100]), 1)          # The outlier does not count.
+        self.assertEqual(median_absolute_deviation([2.0, 2.0, 2.0]), 0)
+
+    def test_compare_within_threshold(self):
+        baseline = make_entry({'1000': {'build': [1.0, 1.0, 1.0]}})
+        current = make_entry({'1000': {'build': [1.05, 1.05, 1.05]}})
+        row, = compare(baseline, current, threshold=0.10)
+        self.assertEqual((row['scale'], row['stage']), ('1000', 'build'))
+        self.assertAlmostEqual(row['change'], 0.05)
+        self.assertFalse(row['regressed'])
+
+    def test_compare_within_noise(self):
+        baseline = make_entry({'1000': {'build': [0.6, 0.8, 1.0, 1.2, 1.4]}})
+        current = make_entry({'1000': {'build': [0.8, 1.0, 1.2, 1.4, 1.6]}})
+        row, = compare(baseline, current, threshold=0.10, mad_factor=3.0)
+        self.assertAlmostEqual(row['change'], 0.2)                                   # Beyond the threshold.
+        self.assertFalse(row['regressed'])                                          # Inside 3 * 1.4826 * 0.2.
+
+    def test_compare_regression(self):
+        baseline = make_entry({'1000': {'build': [0.99, 1.0, 1.01]}})
+        current = make_entry({'1000': {'build': [1.49, 1.5, 1.51]}})
+        row, = compare(baseline, current, threshold=0.10, mad_factor=3.0)
+        self.assertAlmostEqual(row['change'], 0.5)
+        self.assertTrue(row['regressed'])
+
+    def test_compare_missing_stage_or_scale(self):
+        baseline = make_entry({'1000': {'build': [1.0], 'extract': []}})
+        current = make_entry({
+            '1000': {'build': [1.0], 'extract': [5.0], 'write': [5.0]},                # Not measured by the baseline.
+            '10000': {'build': [50.0]},
+        })
+        self.assertEqual([(row['scale'], row['stage']) for row in compare(baseline, current)], [('1000', 'build')])
+
+    def test_find_baseline(self):
+        current = make_entry({}, python='3.6.4', version='1.1.0')
+        match = make_entry({}, python='3.6.1', version='1.0.0')                     # Only the patch level differs.
+        entries = [
+            make_entry({}, version='0.9.0'),
+            match,
+            make_entry({}, machine='xyz', version='1.1.0'),                         # Other machine.
+            make_entry({}, python='3.5.2', version='1.1.0'),                        # Other Python version.
+        ]
+        self.assertIs(find_baseline(entries, current), match)
+        self.assertIs(find_baseline(entries, current, version='0.9.0'), entries[0])
+        self.assertEqual(find_baseline(entries, current, version='1.1.0'), None)
+        self.assertEqual(find_baseline([], current), None)
+
+
+if __name__ == '__main__':
+    main()
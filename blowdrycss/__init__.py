@@ -12,14 +12,13 @@ from __future__ import absolute_import
 # builtins
 import sys
 import os
-# custom
-from blowdrycss.settingsbuilder import write_blowdrycss_settings_dot_py
 
 
 cwd = os.getcwd()
 
 # Build blowdrycss_settings.py if it doesn't exist and the user is not inside the sphinx docs directory.
 if not os.path.isfile('blowdrycss_settings.py') and not cwd.endswith('docs'):
+    from blowdrycss.settingsbuilder import write_blowdrycss_settings_dot_py     # Only needed on the first run.
     write_blowdrycss_settings_dot_py()
 
 # Allow blowdrycss_settings.py to be found in the users current working directory (cwd).
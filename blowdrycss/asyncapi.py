@@ -0,0 +1,139 @@
+"""
+Asyncio entry points for servers and tools that already run an event loop, for example an async asset server or a
+language server that rebuilds the CSS while the user types.
+
+``parse_async()`` does the same work as ``blowdry.parse(recent=False)``, but never blocks the loop:
+
+- File discovery, reads, and writes run in the loop's default thread pool.
+- The CPU bound stages, class extraction and CSS building, run in the ``executor`` of the caller's choice.
+  ``None`` selects the default thread pool. A ``ProcessPoolExecutor`` works too since ``Config`` is picklable.
+- Cancelling the task stops the run at the next ``await``. Nothing is written unless the build finished.
+
+``parse_iter()`` is an async generator that yields a ``Progress`` record after every stage and read batch.
+
+Requires Python 3.7+. The module is not imported by ``blowdrycss/__init__.py``.
+
+**Usage Case:**
+
+>>> import asyncio
+>>> from concurrent.futures import ProcessPoolExecutor
+>>> from blowdrycss.asyncapi import parse_async
+>>> from blowdrycss.config import Config
+>>> async def rebuild():
+>>>     with ProcessPoolExecutor() as executor:
+>>>         return await parse_async(
+>>>             project_directory='/path/to/project',
+>>>             config=Config.from_settings(),
+>>>             executor=executor,
+>>>             progress=lambda update: print(update.stage, update.done, update.total),
+>>>         )
+>>> result = asyncio.run(rebuild())
+>>> sorted(result.class_set)
+['bold', 'padding-10']
+
+"""
+# builtins
+from asyncio import gather, get_running_loop
+from collections import namedtuple
+from functools import partial
+from os import path
+
+# custom
+from blowdrycss.compiler import compile_classes, extract_classes, read_source
+from blowdrycss.config import Config
+from blowdrycss.filehandler import CSSFile, FileManifest
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+#: Yielded by ``parse_iter()``.
+#:
+#: - ``stage`` (*str*) -- ``'discover'``, ``'read'``, ``'build'``, ``'write'``, or ``'done'``.
+#: - ``done`` (*int*) -- Units of work finished in this stage e.g. files read so far.
+#: - ``total`` (*int*) -- Units of work in this stage.
+#: - ``result`` (*Result*) -- The ``compiler.Result``. None until the ``'build'`` stage is finished.
+Progress = namedtuple('Progress', ('stage', 'done', 'total', 'result'))
+
+
+def write_output(css='', minified_css=''):
+    """ Write the CSS where ``parse()`` would write it. Empty texts are skipped.
+
+    :return: (*list*) -- Returns the paths of the files written.
+
+    """
+    css_file = CSSFile()
+    return [
+        css_file.write_serialized(text=text, minified=minified)
+        for text, minified in ((css, False), (minified_css, True)) if text
+    ]
+
+
+async def parse_iter(project_directory=None, config=None, executor=None, read_concurrency=32, write=True):
+    """ Scan ``project_directory`` and build the CSS, yielding a ``Progress`` record as the work proceeds.
+
+    :type project_directory: str
+    :param project_directory: Directory to scan. Defaults to ``settings.project_directory``.
+
+    :type config: Config
+    :param config: Decoding and output configuration. Defaults to ``Config.from_settings()``.
+
+    :type executor: concurrent.futures.Executor
+    :param executor: Runs class extraction and CSS building. None selects the loop's default thread pool.
+
+    :type read_concurrency: int
+    :param read_concurrency: Number of files read concurrently. Each batch is followed by a ``'read'`` record.
+
+    :type write: bool
+    :param write: Write the output files to ``settings.css_directory``. Otherwise, only return the ``Result``.
+
+    :return: (*async generator*) -- Yields ``Progress`` records. The last one has ``stage == 'done'``.
+
+    """
+    loop = get_running_loop()
+    config = Config.from_settings() if config is None else config
+    project_directory = settings.project_directory if project_directory is None else project_directory
+    if not path.isdir(project_directory):
+        raise NotADirectoryError(project_directory + ' is not a directory.')
+
+    manifest = await loop.run_in_executor(None, partial(FileManifest, project_directory, config))
+    file_paths = sorted(manifest.entries)
+    yield Progress(stage='discover', done=len(file_paths), total=len(file_paths), result=None)
+
+    class_set, diagnostics = set(), []
+    for start in range(0, len(file_paths), read_concurrency):
+        batch = file_paths[start:start + read_concurrency]
+        sources = await gather(*(loop.run_in_executor(None, read_source, file_path) for file_path in batch))
+        batch_class_set, batch_diagnostics = await loop.run_in_executor(executor, extract_classes, sources)
+        class_set.update(batch_class_set)
+        diagnostics.extend(batch_diagnostics)
+        yield Progress(stage='read', done=start + len(batch), total=len(file_paths), result=None)
+
+    result = await loop.run_in_executor(executor, compile_classes, class_set, config, diagnostics)
+    yield Progress(stage='build', done=len(result.class_set), total=len(class_set), result=result)
+
+    if write:
+        written = await loop.run_in_executor(None, write_output, result.css, result.minified_css)
+        yield Progress(stage='write', done=len(written), total=len(written), result=result)
+
+    yield Progress(stage='done', done=1, total=1, result=result)
+
+
+async def parse_async(project_directory=None, config=None, executor=None, read_concurrency=32, write=True,
+                      progress=None):
+    """ Coroutine that scans ``project_directory``, builds, and writes the CSS. See ``parse_iter()`` for the
+    parameters.
+
+    :type progress: callable
+    :param progress: Optional callback that receives each ``Progress`` record.
+
+    :return: (*Result*) -- Returns the ``compiler.Result`` of the build.
+
+    """
+    result = None
+    async for update in parse_iter(project_directory=project_directory, config=config, executor=executor,
+                                   read_concurrency=read_concurrency, write=write):
+        if progress is not None:
+            progress(update)
+        result = update.result
+    return result
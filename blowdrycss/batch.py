@@ -0,0 +1,288 @@
+"""
+Batch mode. Builds the CSS of many projects in one process, so that the start up cost is paid once instead of once
+per project:
+
+- Python, cssutils, and the alias tables in ``datalibrary`` are loaded once per process.
+- ``decode_cache`` keeps the CSS of every class selector decoded with each ``Config``. A project only decodes the
+  class selectors that no earlier project decoded with the same ``Config``, e.g. sites sharing one theme.
+- With ``jobs > 1``, the projects are spread over a pool of worker processes. Each worker stays warm and keeps its
+  own ``decode_cache`` for the projects it builds.
+- A project that fails e.g. on a file that is not UTF-8 is reported in its ``Summary``. The other projects are
+  still built.
+
+**Projects file:**
+
+A JSON list with one object per project. Only ``project_directory`` is required. ``css_directory`` defaults to
+``<project_directory>/css``. The other keys default to the current settings. ``overrides`` may set any of
+``config.setting_fields``. Relative paths are relative to the directory of the projects file. Two projects may not
+write the same output file. ::
+
+    [
+        {"project_directory": "site1", "css_directory": "site1/css"},
+        {
+            "project_directory": "site2",
+            "css_directory": "site2/static",
+            "output_file_name": "site",
+            "output_extension": ".scss",
+            "overrides": {"use_em": false, "minify": false}
+        }
+    ]
+
+**Usage Case:** ::
+
+    $ blowdrycss --batch projects.json --jobs 4
+
+>>> from blowdrycss.batch import load_projects, run_batch
+>>> summaries = run_batch(projects=load_projects(file_path='projects.json'), jobs=4)
+
+"""
+# python 2
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import str
+from io import open
+
+# builtins
+from collections import namedtuple
+from json import load
+from multiprocessing import Pool
+from os import path
+from time import time
+import logging
+
+# custom
+from blowdrycss.blowdry import build_css
+from blowdrycss.compiler import Result, extract_classes, read_source
+from blowdrycss.config import Config, setting_fields
+from blowdrycss.filehandler import CSSFile, FileManifest, serialize_css, split_css
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+#: Maps ``(config_key(config), css_class)`` to the CSS text (*bytes*) of the class selector. Invalid class selectors
+#: map to ``None``.
+decode_cache = {}
+
+#: Returned by ``build_project()`` for each project.
+#:
+#: - ``project`` (*Project*) -- The project that was built.
+#: - ``result`` (*Result*) -- The ``compiler.Result`` of the build. ``None`` if the build failed.
+#: - ``written`` (*list*) -- Paths of the files written.
+#: - ``cached`` (*bool*) -- True if every class selector was taken from ``decode_cache``.
+#: - ``seconds`` (*float*) -- Duration of the build.
+#: - ``error`` (*str*) -- Why the build failed. ``None`` if it succeeded.
+Summary = namedtuple('Summary', ('project', 'result', 'written', 'cached', 'seconds', 'error'))
+
+
+class Project(namedtuple('Project', (
+        'project_directory', 'css_directory', 'output_file_name', 'output_extension', 'overrides'))):
+    """ One entry of the projects file.
+
+    | **Members:**
+
+    | **project_directory** (*str*) -- Directory searched for ``file_types``.
+
+    | **css_directory** (*str*) -- Directory where the output files are written. Defaults to
+      ``<project_directory>/css``.
+
+    | **output_file_name** (*str*) -- Output file name without the extension e.g. ``'blowdry'``.
+
+    | **output_extension** (*str*) -- Output file extension e.g. ``'.css'``.
+
+    | **overrides** (*dict*) -- Values of ``config.setting_fields`` that replace the current settings.
+
+    :return: None
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, values, base_directory=''):
+        """ Build a ``Project`` from one object of the projects file.
+
+        :type values: dict
+        :param values: Keys are the ``Project`` fields. Only ``project_directory`` is required.
+
+        :type base_directory: str
+        :param base_directory: Relative directories are joined to it.
+
+        :raises ValueError: If ``values`` contains an unknown key, or ``overrides`` contains a key that is not in
+          ``config.setting_fields``.
+
+        :raises OSError: If ``project_directory`` is not a directory.
+
+        :return: (*Project*) -- Returns the project.
+
+        """
+        unknown = set(values).difference(cls._fields)
+        if unknown:
+            raise ValueError('Unknown project key(s): ' + ', '.join(sorted(unknown)))
+        overrides = dict(values.get('overrides', {}))
+        unknown = set(overrides).difference(setting_fields)
+        if unknown:
+            raise ValueError('Unknown override(s): ' + ', '.join(sorted(unknown)))
+
+        project_directory = path.join(base_directory, values['project_directory'])
+        if not path.isdir(project_directory):
+            raise OSError('project_directory ' + project_directory + ' is not a directory.')
+        return cls(
+            project_directory=project_directory,
+            css_directory=path.join(base_directory, values.get('css_directory', path.join(project_directory, 'css'))),
+            output_file_name=values.get('output_file_name', settings.output_file_name),
+            output_extension=values.get('output_extension', settings.output_extension),
+            overrides=overrides,
+        )
+
+
+def load_projects(file_path=''):
+    """ Read the projects file. See the module documentation for the format.
+
+    :type file_path: str
+    :param file_path: Path of the JSON projects file.
+
+    :raises ValueError: If two projects write the same output file.
+
+    :return: (*list*) -- Returns a list of ``Project``.
+
+    """
+    with open(file_path, 'r', encoding='utf-8') as projects_file:
+        entries = load(projects_file)
+    base_directory = path.dirname(path.abspath(file_path))
+    projects = [Project.from_dict(values=values, base_directory=base_directory) for values in entries]
+
+    output_paths = set()
+    for project in projects:
+        output_path = path.normcase(path.abspath(
+            path.join(project.css_directory, project.output_file_name + project.output_extension)
+        ))
+        if output_path in output_paths:
+            raise ValueError('More than one project writes ' + output_path)
+        output_paths.add(output_path)
+    return projects
+
+
+def config_key(config):
+    """ :return: (*tuple*) -- Returns a hashable key of the ``setting_fields`` of ``config``. """
+    return tuple(
+        tuple(value.items()) if name == 'breakpoints' else value for name, value in zip(setting_fields, config)
+    )
+
+
+def compile_cached(class_set=set(), config=None, diagnostics=()):
+    """ Same as ``compiler.compile_classes()``, except that only the class selectors missing from ``decode_cache``
+    are decoded. They are decoded in one ``build_css()`` call, and its CSS is split per class selector.
+
+    :type class_set: set
+    :param class_set: Class selectors e.g. from ``extract_classes()``. It is not modified.
+
+    :type config: Config
+    :param config: Decoding and output configuration. Defaults to ``Config()``.
+
+    :type diagnostics: iterable
+    :param diagnostics: Messages copied to ``Result.diagnostics``.
+
+    :return: (*tuple*) -- Returns ``(result, cached)`` where ``cached`` is True if nothing had to be decoded.
+
+    """
+    config = Config() if config is None else config
+    key = config_key(config)
+    missing_class_set = set(css_class for css_class in class_set if (key, css_class) not in decode_cache)
+    if missing_class_set:
+        valid_class_set, css_text = build_css(class_set=missing_class_set, config=config, verbose=False)
+        pieces = split_css(css_text=css_text)
+        for css_class in missing_class_set:
+            lower_class = css_class.lower()                                     # The builders lower the case.
+            decode_cache[(key, css_class)] = pieces.get(lower_class, b'') if lower_class in valid_class_set else None
+
+    pieces = dict(
+        (css_class.lower(), decode_cache[(key, css_class)]) for css_class in class_set
+        if decode_cache[(key, css_class)] is not None
+    )
+    css_text = b'\n'.join(pieces[css_class] for css_class in sorted(pieces))
+    result = Result(
+        css=serialize_css(css_text=css_text) if config.human_readable else '',
+        minified_css=serialize_css(css_text=css_text, minified=True) if config.minify else '',
+        class_set=set(pieces),
+        removed_class_set=set(css_class.lower() for css_class in class_set).difference(pieces),
+        diagnostics=list(diagnostics),
+    )
+    return result, not missing_class_set
+
+
+def build_project(project):
+    """ Find the classes in ``project.project_directory``, build the CSS, and write the output files.
+
+    An exception raised while building is logged and reported in the summary, so that one broken project does not
+    stop the batch.
+
+    :type project: Project
+    :param project: The project to build.
+
+    :return: (*Summary*) -- Returns the summary of the build.
+
+    """
+    start = time()
+    try:
+        config = Config.from_settings(**project.overrides)
+        manifest = FileManifest(project_directory=project.project_directory, config=config)
+        sources = [read_source(file_path) for file_path in sorted(manifest.entries)]
+        class_set, diagnostics = extract_classes(sources=sources)
+        result, cached = compile_cached(class_set=class_set, config=config, diagnostics=diagnostics)
+
+        css_file = CSSFile(
+            file_directory=project.css_directory, file_name=project.output_file_name,
+            extension=project.output_extension
+        )
+        written = [
+            css_file.write_serialized(text=text, minified=minified)
+            for text, minified in ((result.css, False), (result.minified_css, True)) if text
+        ]
+    except Exception as error:
+        logging.exception('batch: %s failed.', project.project_directory)
+        return Summary(
+            project=project, result=None, written=[], cached=False, seconds=time() - start,
+            error=error.__class__.__name__ + ': ' + str(error),
+        )
+    return Summary(
+        project=project, result=result, written=written, cached=cached, seconds=time() - start, error=None
+    )
+
+
+def run_batch(projects=(), jobs=1):
+    """ Build every project and print one line per project. A failed project prints its error.
+
+    :type projects: iterable
+    :param projects: The ``Project`` instances to build.
+
+    :type jobs: int
+    :param jobs: Number of worker processes. ``1`` builds the projects one after another in this process.
+
+    :return: (*list*) -- Returns a ``Summary`` for each project in the order of ``projects``.
+
+    """
+    if settings.hide_css_errors:
+        import cssutils
+        cssutils.log.setLevel(logging.CRITICAL)
+
+    projects = list(projects)
+    if jobs > 1 and len(projects) > 1:
+        pool = Pool(processes=min(jobs, len(projects)))
+        try:
+            summaries = list(pool.imap(build_project, projects))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        summaries = [build_project(project) for project in projects]
+
+    for summary in summaries:
+        if summary.error is not None:
+            print(str(summary.project.project_directory) + ': failed,', summary.error)
+            continue
+        print(
+            str(summary.project.project_directory) + ':',
+            len(summary.result.class_set), 'classes,',
+            len(summary.result.removed_class_set), 'removed,',
+            str(round(summary.seconds, 3)) + 's' + (' (cached)' if summary.cached else ''),
+        )
+    return summaries
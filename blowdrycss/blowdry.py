@@ -2,35 +2,82 @@
 from __future__ import absolute_import, print_function, unicode_literals
 from builtins import bytes, str
 # builtins
+from collections import namedtuple
 import logging
-import cssutils
 from os import path
+from threading import Thread
 # custom
 from blowdrycss import log
-from blowdrycss.filehandler import FileFinder, CSSFile, GenericFile
-from blowdrycss.classparser import ClassParser
+from blowdrycss.filehandler import FileFinder, CSSFile, GenericFile, FingerprintRecord, ExtractionCache, canonical_css
+from blowdrycss.classparser import ClassParser, ClassExtractor, extraction_cache_path
 from blowdrycss.classpropertyparser import ClassPropertyParser
+from blowdrycss.config import Config
 from blowdrycss.cssbuilder import CSSBuilder
-from blowdrycss.datalibrary import clashing_alias_markdown, property_alias_markdown, clashing_alias_html, \
-    property_alias_html, clashing_alias_rst, property_alias_rst
+from blowdrycss.datalibrary import alias_docs, alias_fingerprint
 from blowdrycss.mediaquerybuilder import MediaQueryBuilder
-from blowdrycss.utilities import print_minification_stats, validate_output_file_name_setting, validate_output_extension_setting
+from blowdrycss.metrics import metrics
+from blowdrycss.profiling import memory_profiler, profiled
+from blowdrycss.timing import RunReport, Timer
+from blowdrycss.tracing import tracer
+from blowdrycss.utilities import (
+    get_file_path, print_minification_stats, validate_output_file_name_setting, validate_output_extension_setting,
+)
 import blowdrycss_settings as settings
 
 __author__ = 'chad nelson'
 __project__ = 'blowdrycss'
 
 
-def boilerplate():
+class DocsThread(Thread):
+    """ Runs ``write_alias_docs()`` in the background.
+
+    An exception raised by ``write_alias_docs()`` e.g. a pandoc or IO failure is logged and kept in ``exception``.
+    ``join()`` re-raises it in the caller, so a one-shot run exits with a non-zero status.
+
+    :type doc_formats: tuple
+    :param doc_formats: Passed to ``write_alias_docs()``.
+
+    """
+    def __init__(self, doc_formats=()):
+        super(DocsThread, self).__init__(name='blowdrycss-docs')
+        self.doc_formats = doc_formats
+        self.exception = None
+
+    def run(self):
+        try:
+            write_alias_docs(doc_formats=self.doc_formats)
+        except Exception as exception:
+            logging.error('Alias documentation failed: %s', exception, exc_info=True)
+            self.exception = exception
+
+    def join(self, timeout=None):
+        """ Wait for the thread. Re-raise the exception raised by ``write_alias_docs()`` if any.
+
+        :raises Exception: The exception raised by ``write_alias_docs()``.
+
+        """
+        super(DocsThread, self).join(timeout)
+        if self.exception is not None:
+            raise self.exception
+
+
+def boilerplate(report=None):
     """ Watchdog wrapper only calls this once to eliminate recurring performance impact.
 
     - Validate the output_file_name and output_extenion settings.
-    - Generate Markdown documentation files.
     - Generate HTML documentation files. (This location is important since it allows encoded css to be included
       in the documentation files.)
-    - Generate reStructuredText documentation files.
+    - Generate Markdown and reStructuredText documentation files in a background thread.
 
-    :return: None
+    Documentation files are only rendered and written if the alias tables changed since they were last generated.
+    See ``write_alias_docs()``.
+
+    :return: (*DocsThread*) -- Returns the background documentation thread, or None if it was not needed. The
+      thread is not a daemon, so a one-shot run still finishes writing the documentation before the process exits.
+      ``join()`` re-raises a documentation failure.
+
+    :type report: RunReport
+    :param report: Optional. Receives the ``docs`` stage i.e. the synchronous HTML documentation.
 
     """
     validate_output_file_name_setting()
@@ -40,49 +87,132 @@ def boilerplate():
         log.enable()
 
     if settings.hide_css_errors:
+        import cssutils
         cssutils.log.setLevel(logging.CRITICAL)
 
-    # Generate Markdown documentation files.
-    if settings.markdown_docs:
-        markdown_file = GenericFile(                                        # Document forbidden clashing aliases.
-            file_directory=settings.markdown_directory,
-            file_name='clashing_aliases',
-            extension='.md'
-        )
-        markdown_file.write(str(clashing_alias_markdown))
-        markdown_file = GenericFile(                                        # Document allowed property aliases.
-            file_directory=settings.markdown_directory,
-            file_name='property_aliases',
-            extension='.md'
-        )
-        markdown_file.write(str(property_alias_markdown))
-
     # Generate HTML documentation files. (This location is important since it allows encoded css to be included
-    # in the documentation files.)
+    # in the documentation files.) They are written before parse() searches project_directory.
     if settings.html_docs:
-        html_file = GenericFile(                                            # Document forbidden clashing aliases.
-            file_directory=settings.project_directory,
-            file_name='clashing_aliases',
-            extension='.html'
-        )
-        html_file.write(str(clashing_alias_html))
-        html_file = GenericFile(                                            # Document allowed property aliases.
-            file_directory=settings.project_directory,
-            file_name='property_aliases',
-            extension='.html'
-        )
-        html_file.write(str(property_alias_html))
+        report = RunReport() if report is None else report
+        with report.stage('docs'):
+            write_alias_docs(doc_formats=('html', ))
+
+    # Generate Markdown and reStructuredText documentation files off the critical path.
+    doc_formats = tuple(
+        doc_format for doc_format, enabled in (('markdown', settings.markdown_docs), ('rst', settings.rst_docs))
+        if enabled
+    )
+    if not doc_formats:
+        return None
 
-    # Generate reStructuredText documentation files.
     if settings.rst_docs:
         print('\nDocumentation Directory:', str(settings.docs_directory))     # str() is required for Python2
-        rst_file = GenericFile(file_directory=settings.docs_directory, file_name='clashing_aliases', extension='.rst')
-        rst_file.write(str(clashing_alias_rst))
-        rst_file = GenericFile(file_directory=settings.docs_directory, file_name='property_aliases', extension='.rst')
-        rst_file.write(str(property_alias_rst))
+    docs_thread = DocsThread(doc_formats=doc_formats)
+    docs_thread.start()
+    return docs_thread
+
+
+def write_alias_docs(doc_formats=('markdown', 'html', 'rst')):
+    """ Write ``clashing_aliases`` and ``property_aliases`` in each of ``doc_formats``.
+
+    The fingerprint of the alias tables is compared with the fingerprint recorded when the files were last written.
+    If the files are unchanged and the fingerprint matches, then the tables are neither rendered nor written.
+    This matters for reStructuredText since it runs pandoc, and for HTML since those writes land inside
+    ``project_directory`` and trigger the watcher.
 
+    :type doc_formats: tuple
+    :param doc_formats: Any of ``'markdown'``, ``'html'``, and ``'rst'``.
 
-def parse(recent=True, class_set=set(), css_text=b''):
+    :return: None
+
+    """
+    doc_directories = {
+        'markdown': (settings.markdown_directory, '.md'),
+        'html': (settings.project_directory, '.html'),
+        'rst': (settings.docs_directory, '.rst'),
+    }
+    fingerprint = alias_fingerprint()
+    record = FingerprintRecord(record_path=path.join(settings.alias_cache_directory, 'docs_fingerprints.json'))
+
+    for doc_format in doc_formats:
+        file_directory, extension = doc_directories[doc_format]
+        doc_files = [
+            GenericFile(file_directory=file_directory, file_name=file_name, extension=extension)
+            for file_name in ('clashing_aliases', 'property_aliases')                # Document clashing and allowed.
+        ]
+        if all(record.is_current(file_path=doc_file.file_path, fingerprint=fingerprint) for doc_file in doc_files):
+            logging.info('Alias documentation is current. Skipped: %s', doc_format)
+            continue
+
+        for doc_file, table in zip(doc_files, alias_docs(doc_format=doc_format)):
+            doc_file.write(str(table))
+            record.update(file_path=doc_file.file_path, fingerprint=fingerprint)
+        record.save()
+
+
+def build_css(class_set=set(), report=None, config=None, verbose=True):
+    """ Decodes ``class_set`` into CSS rules and media queries. Classes that do not match the defined class encoding
+    or fail cssutils validation are dropped.
+
+    - Filter class names. Only keep classes matching the defined class encoding.
+    - Build a set() of valid css properties. Some classes may be removed during cssutils validation.
+    - Build Media Queries from the remaining classes. (user setting option)
+
+    :type class_set: set
+    :param class_set: The set of css class selectors to decode.
+
+    :type report: RunReport
+    :param report: Optional. Receives the ``filtering``, ``build`` and ``media_queries`` stages and the ``rules``
+      count.
+
+    :type config: Config
+    :param config: Optional. Decoding configuration. Defaults to ``Config.from_settings()``.
+
+    :type verbose: bool
+    :param verbose: Let the builders print their start messages to stdout.
+
+    :return: (*tuple*) -- Returns ``(valid_class_set, css_text)`` where ``css_text`` is of type bytes.
+
+    """
+    report = RunReport() if report is None else report
+    config = Config.from_settings() if config is None else config
+
+    # Filter class names. Only keep classes matching the defined class encoding.
+    with report.stage('filtering'):
+        class_property_parser = ClassPropertyParser(class_set=class_set, config=config)
+    logging.debug('blowdry.class_property_parser.class_set:\t%s', class_property_parser.class_set)
+    use_this_set = class_property_parser.class_set.copy()
+
+    # Build a set() of valid css properties. Some classes may be removed during cssutils validation.
+    with report.stage('build'):
+        css_builder = CSSBuilder(property_parser=class_property_parser, verbose=verbose)
+        css_text = bytes(css_builder.get_css_text())
+    valid_class_set = css_builder.property_parser.class_set.copy()
+    report.count('rules', len(css_builder.css_rules))
+    report.add_class_costs(class_costs=css_builder.class_costs)
+
+    # Build Media Queries
+    if config.media_queries_enabled:
+        with report.stage('media_queries'):
+            unassigned_class_set = use_this_set.difference(css_builder.property_parser.class_set)
+            css_builder.property_parser.class_set = unassigned_class_set.copy()         # Only use unassigned classes
+            css_builder.property_parser.removed_class_set = set()                       # Clear set
+            media_query_builder = MediaQueryBuilder(property_parser=class_property_parser, verbose=verbose)
+            css_text += bytes(media_query_builder.get_css_text(), 'utf-8')
+        logging.debug(
+            'blowdry.media_query_builder.property_parser.class_set:\t%s', media_query_builder.property_parser.class_set
+        )
+        report.count('rules', len(media_query_builder.css_media_queries))
+        report.add_class_costs(class_costs=media_query_builder.class_costs)
+
+        media_class_set = unassigned_class_set.intersection(media_query_builder.property_parser.class_set)
+        valid_class_set = valid_class_set.union(media_class_set)
+
+    return valid_class_set, css_text
+
+
+@profiled
+def parse(recent=True, class_set=set(), css_text=b'', since=None, report=None, config=None):
     """ It parses every eligible file in the project i.e. file type matches an element of settings.file_types.
     This ensures that from time to time unused CSS class selectors are removed from blowdry.css.
 
@@ -137,18 +267,45 @@ def parse(recent=True, class_set=set(), css_text=b''):
     :type css_text: bytes
     :param css_text: The current version of the CSS text.
 
+    :type since: float
+    :param since: Optional epoch time. When ``recent`` is True, files modified at or after ``since`` are parsed
+      instead of files newer than blowdry.css.
+
+    :type report: RunReport
+    :param report: Optional. Collects the per-stage timings and counts of this run. It is written to
+      ``settings.run_report_path`` and printed if ``settings.run_report_table == True``.
+
+    :type config: Config
+    :param config: Optional. Passed to every stage. Defaults to ``Config.from_settings()``, built once per run.
+
     """
     if settings.timing_enabled:
-        from blowdrycss.timing import Timer
         timer = Timer()
 
+    report = RunReport() if report is None else report
+    config = Config.from_settings() if config is None else config
+
     print('\n~~~ blowdrycss started ~~~')
 
     # Get files to parse.
-    file_finder = FileFinder(recent=recent)
-
-    # Create set of all defined classes
-    class_parser = ClassParser(file_dict=file_finder.file_dict)
+    with report.stage('discovery'):
+        file_finder = FileFinder(recent=recent, since=since, config=config)
+
+    # Create set of all defined classes. Unchanged files are taken from the extraction cache.
+    with report.stage('extraction'):
+        extraction_cache = None
+        if settings.extraction_cache_enabled:
+            extraction_cache = ExtractionCache(record_path=extraction_cache_path())
+        class_parser = ClassParser(file_dict=file_finder.file_dict, extraction_cache=extraction_cache)
+        if extraction_cache is not None:
+            if not recent:
+                extraction_cache.prune(project_directory=file_finder.project_directory, file_paths=file_finder.files)
+            if extraction_cache.changed:
+                extraction_cache.save()
+    report.file_costs.update(class_parser.file_costs)
+    report.count('files', len(class_parser.file_path_list))
+    report.count('bytes_read', class_parser.bytes_read)
+    report.count('raw_classes', len(class_parser.class_set))
 
     # Unite class sets during on_modified case.
     if recent:
@@ -156,64 +313,226 @@ def parse(recent=True, class_set=set(), css_text=b''):
         use_this_set = modified_class_set.difference(class_set)
     else:
         use_this_set = class_parser.class_set
+    report.count('cache_hits', len(class_parser.class_set) - len(use_this_set))
+    report.count('cache_misses', len(use_this_set))
 
-    # Filter class names. Only keep classes matching the defined class encoding.
-    class_property_parser = ClassPropertyParser(class_set=use_this_set)
-    logging.info(msg='blowdry.class_property_parser.class_set:\t' + str(class_property_parser.class_set))
-    use_this_set = class_property_parser.class_set.copy()
-
-    # Build a set() of valid css properties. Some classes may be removed during cssutils validation.
-    css_builder = CSSBuilder(property_parser=class_property_parser)
-    css_text += bytes(css_builder.get_css_text())
-    builder_class_set = css_builder.property_parser.class_set.copy()
-
-    # Build Media Queries
-    if settings.media_queries_enabled:
-        unassigned_class_set = use_this_set.difference(css_builder.property_parser.class_set)
-        css_builder.property_parser.class_set = unassigned_class_set.copy()             # Only use unassigned classes
-        css_builder.property_parser.removed_class_set = set()                           # Clear set
-        media_query_builder = MediaQueryBuilder(property_parser=class_property_parser)
-        logging.debug(
-            msg=(
-                'blowdry.media_query_builder.property_parser.class_set:\t' +
-                str(media_query_builder.property_parser.class_set)
-            )
-        )
-        css_text += bytes(media_query_builder.get_css_text(), 'utf-8')
-
-        media_class_set = unassigned_class_set.intersection(media_query_builder.property_parser.class_set)
+    # Decode the classes and build the CSS. Invalid classes are removed.
+    valid_class_set, new_css_text = build_css(class_set=use_this_set, report=report, config=config)
+    css_text += new_css_text
+    report.count('valid_classes', len(valid_class_set))
+    report.count('removed_classes', len(use_this_set) - len(valid_class_set))
 
-        if recent:
-            class_set = class_set.union(builder_class_set)
-            class_set = class_set.union(media_class_set)
-        else:
-            class_set = builder_class_set.copy()
-            class_set = class_set.union(media_class_set)
+    if recent:
+        class_set = class_set.union(valid_class_set)
     else:
-        if recent:
-            class_set = class_set.union(builder_class_set)
-        else:
-            class_set = builder_class_set.copy()
+        class_set = valid_class_set.copy()
 
-    logging.debug('\nCSS Text:\n\n' + str(css_text))
+    logging.debug('\nCSS Text:\n\n%s', css_text)
     print('\nAuto-Generated CSS:')
 
     # Output the DRY CSS file. (user setting option)
-    if settings.human_readable:
-        css_file = CSSFile()
-        css_file.write(css_text=css_text)
-        print(path.join(css_file.file_directory, css_file.file_name) + css_file.extension)
+    if config.human_readable:
+        with report.stage('write'):
+            css_file = CSSFile()
+            css_file.write(css_text=css_text)
+        output_path = path.join(css_file.file_directory, css_file.file_name) + css_file.extension
+        report.count('output_bytes', path.getsize(output_path))
+        print(output_path)
 
     # Output the Minified DRY CSS file. (user setting option)
-    if settings.minify:
-        css_file = CSSFile()
-        css_file.minify(css_text=css_text)
-        print(path.join(css_file.file_directory, css_file.file_name) + '.min' + css_file.extension)
+    if config.minify:
+        with report.stage('minify'):
+            css_file = CSSFile()
+            css_file.minify(css_text=css_text)
+        output_path = path.join(css_file.file_directory, css_file.file_name) + '.min' + css_file.extension
+        report.count('output_bytes', path.getsize(output_path))
+        print(output_path)
 
     if settings.timing_enabled:
         timer.report()
 
-    if settings.minify:
+    if config.minify:
         print_minification_stats(file_name=settings.output_file_name, extension=settings.output_extension)
 
+    if memory_profiler.enabled:
+        report.memory_growth = memory_profiler.growth()
+        print(memory_profiler.table(memory=report.memory, growth=report.memory_growth))
+
+    if settings.run_report_path:
+        report.write(file_path=settings.run_report_path)
+
+    if settings.run_report_table:
+        print(report.table())
+
+    if settings.report_top:
+        print(report.top_table(top=settings.report_top))
+
+    tracer.flush()
+
+    if settings.metrics_path:
+        metrics.observe(report=report, class_set=class_set)
+        metrics.flush()
+
     return class_set, css_text
+
+
+#: Returned by ``check()``.
+#:
+#: - ``current`` (*bool*) -- True if every output file is up to date.
+#: - ``missing_class_set`` (*set*) -- Valid class selectors found in the project files but not in the output files.
+#: - ``extra_class_set`` (*set*) -- Class selectors defined by the output files that the project no longer uses.
+#: - ``stale_files`` (*list*) -- Output files that are missing or out of date.
+CheckResult = namedtuple('CheckResult', ('current', 'missing_class_set', 'extra_class_set', 'stale_files'))
+
+
+def check(config=None):
+    """ CI mode. Verify that the output files match what ``parse(recent=False)`` would write. Nothing is written.
+
+    The output files list their rules in arbitrary order, so they are compared by the digest of their canonical
+    form. See ``filehandler.canonical_css()``.
+
+    Fails fast. Each step only runs if the previous steps proved no difference:
+
+    - An enabled output file is missing.
+    - An output file defines a class selector that no project file contains. Extraction alone proves this. If
+      ``settings.extraction_cache_enabled``, unchanged files are taken from the extraction cache. The cache is not
+      saved.
+    - The classes are decoded. The expected digest differs from the digest of an output file.
+
+    :type config: Config
+    :param config: Optional. Defaults to ``Config.from_settings()``.
+
+    :return: (*CheckResult*) -- Returns the outcome. A summary is printed too.
+
+    """
+    config = Config.from_settings() if config is None else config
+    if settings.hide_css_errors:
+        import cssutils
+        cssutils.log.setLevel(logging.CRITICAL)
+
+    print('\n~~~ blowdrycss check ~~~')
+    extensions = [extension for extension, enabled in (
+        (settings.output_extension, config.human_readable), ('.min' + settings.output_extension, config.minify),
+    ) if enabled]
+    output_paths = [
+        get_file_path(file_directory=settings.css_directory, file_name=settings.output_file_name, extension=extension)
+        for extension in extensions
+    ]
+
+    missing_files = [file_path for file_path in output_paths if not path.isfile(file_path)]
+    if missing_files:
+        return print_check_result(CheckResult(
+            current=False, missing_class_set=set(), extra_class_set=set(), stale_files=missing_files,
+        ))
+
+    digests, class_sets = {}, {}
+    for file_path in output_paths:
+        with open(file_path, 'rb') as css_file:
+            digests[file_path], class_sets[file_path] = canonical_css(css_text=css_file.read())
+    disk_class_set = set().union(*class_sets.values())
+
+    extraction_cache = None
+    if settings.extraction_cache_enabled:
+        extraction_cache = ExtractionCache(record_path=extraction_cache_path())
+    file_finder = FileFinder(recent=False, config=config)
+    class_parser = ClassParser(file_dict=file_finder.file_dict, extraction_cache=extraction_cache)
+
+    extra_class_set = disk_class_set.difference(css_class.lower() for css_class in class_parser.class_set)
+    if extra_class_set:
+        return print_check_result(CheckResult(
+            current=False, missing_class_set=set(), extra_class_set=extra_class_set, stale_files=output_paths,
+        ))
+
+    valid_class_set, css_text = build_css(class_set=class_parser.class_set, config=config)
+    expected_digest, _ = canonical_css(css_text=css_text)
+    stale_files = [file_path for file_path in output_paths if digests[file_path] != expected_digest]
+    missing_class_set = set()
+    for class_set in class_sets.values():
+        missing_class_set.update(valid_class_set.difference(class_set))
+    return print_check_result(CheckResult(
+        current=not stale_files,
+        missing_class_set=missing_class_set,
+        extra_class_set=disk_class_set.difference(valid_class_set),
+        stale_files=stale_files,
+    ))
+
+
+def print_check_result(check_result):
+    """ Print a summary of ``check_result``.
+
+    :type check_result: CheckResult
+    :param check_result: Returned by ``check()``.
+
+    :return: (*CheckResult*) -- Returns ``check_result`` unchanged.
+
+    """
+    if check_result.current:
+        print('Up to date.')
+        return check_result
+
+    for file_path in check_result.stale_files:
+        print('Out of date:', file_path if path.isfile(file_path) else file_path + ' (missing)')
+    for label, class_set in (('Missing', check_result.missing_class_set), ('Extra', check_result.extra_class_set)):
+        if class_set:
+            print(label, 'class selectors (' + str(len(class_set)) + '):', ', '.join(sorted(class_set)))
+    return check_result
+
+
+@profiled
+def fast_parse(file_path='', class_set=set(), css_text=b'', report=None, config=None):
+    """ Watch mode priority fast path. Only decodes the classes that ``file_path`` introduces, and appends their
+    rules to the end of the existing output files. Nothing else is parsed, built, or reserialized.
+
+    The file is not rediscovered, other files are not examined, and unused classes are never removed here.
+    A later ``parse()`` (the reconciliation) rewrites the output files in their canonical form.
+
+    :type file_path: str
+    :param file_path: Path of the file that was just saved.
+
+    :type class_set: set
+    :param class_set: The set of known css class selectors.
+
+    :type css_text: bytes
+    :param css_text: The current version of the CSS text.
+
+    :type report: RunReport
+    :param report: Optional. Receives the ``extraction``, ``filtering``, ``build``, ``media_queries`` and ``write``
+      stages. ``write`` is absent if nothing was appended.
+
+    :type config: Config
+    :param config: Optional. Defaults to ``Config.from_settings()``.
+
+    :return: (*tuple*) -- Returns the updated ``(class_set, css_text)``.
+
+    """
+    report = RunReport() if report is None else report
+    config = Config.from_settings() if config is None else config
+
+    with report.stage('extraction'):
+        class_extractor = ClassExtractor(file_path=file_path)
+        found_class_set = {css_class.lower() for css_class in class_extractor.class_set}
+        new_class_set = found_class_set.difference(class_set)
+    report.count('files', 1)
+    report.count('bytes_read', path.getsize(file_path))
+    report.count('cache_hits', len(found_class_set) - len(new_class_set))
+    report.count('cache_misses', len(new_class_set))
+    if not new_class_set:
+        return class_set, css_text
+
+    valid_class_set, new_css_text = build_css(class_set=new_class_set, report=report, config=config)
+    if not valid_class_set:
+        return class_set, css_text
+
+    with report.stage('write'):
+        css_file = CSSFile()
+        output_path = path.join(css_file.file_directory, css_file.file_name)
+        if config.human_readable:
+            css_file.append(css_text=new_css_text)
+            report.count('output_bytes', path.getsize(output_path + css_file.extension))
+
+        if config.minify:
+            css_file.append_minified(css_text=new_css_text)
+            report.count('output_bytes', path.getsize(output_path + '.min' + css_file.extension))
+
+    print('\nFast path:', len(valid_class_set), 'class selector(s) added from', str(file_path))
+    return class_set.union(valid_class_set), css_text + new_css_text
@@ -32,6 +32,38 @@ The longer more specific name is used to prevent naming conflicts, and increase
 
 | timing_enabled (*bool*) -- Run performance timer to see the performance of ``blowdrycss``.
 
+| run_report_path (*string*) -- Path of a JSON file receiving the per-stage timings and counts of each run.
+  ``None`` disables the report file.
+
+| run_report_table (*bool*) -- Print the per-stage timings and counts of each run as a plain text table.
+
+| report_top (*int*) -- After each run, list the N files that took longest to extract and the N classes that took
+  longest to decode and validate. ``0`` disables the list.
+
+| latency_stats_path (*string*) -- Path of a JSON file with rolling p50/p95/p99 edit-to-CSS latencies of the watch
+  mode, split into queueing, debounce, parse, and write. ``None`` disables the stats file.
+
+| trace_path (*string*) -- Path of a Chrome Trace Event JSON file showing each stage, file, output, and watch event
+  on a timeline. Open it in ``chrome://tracing`` or Perfetto. ``None`` disables tracing.
+
+| metrics_path (*string*) -- Path of a Prometheus text format file of parse, cache, output, and watch queue metrics.
+  It is rewritten atomically after each run, e.g. for the node exporter textfile collector. ``None`` disables it.
+
+| profile_enabled (*bool*) -- Run ``blowdry.parse()`` under cProfile. Each profiled run writes a ``.pstats`` file
+  and a top ``profile_top`` cumulative time summary to ``profile_directory``.
+
+| profile_every (*int*) -- Only profile every Nth parse. In watch mode each event-triggered parse counts.
+
+| profile_top (*int*) -- Number of functions listed in each cumulative time summary.
+
+| profile_directory (*string*) -- Directory receiving the ``.pstats`` files and their summaries.
+
+| memory_profile_enabled (*bool*) -- Measure the peak and retained tracemalloc allocations of each stage, list the
+  top allocation sites, and in watch mode the memory growth between consecutive runs.
+
+| extraction_cache_enabled (*bool*) -- Remember the class selectors found in each project file between runs, in
+  ``alias_cache_directory``. Only the files whose size, modification time, or inode changed are read again.
+
 | markdown_docs (*bool*) -- Generate a markdown files that provides a quick syntax and clashing alias reference.
   Normally set to False except when posting to github.
 
@@ -131,6 +163,7 @@ log_file_name = 'blowdrycss.log'
 one_mega_byte = 1048576
 log_file_size = 4 * one_mega_byte                           # Max log file size
 log_backup_count = 1                                        # Maximum number of backup log files.
+log_queue_enabled = False                                   # Log through a queue. File I/O leaves the parsing thread.
 
 # All file types/extensions to search for in the defined project_directory that contain encoded class selectors.
 # Available formats:
@@ -140,6 +173,52 @@ file_types = ('*.html', )
 
 # Timing
 time_limit = 1800               # Frequency of a comprehensive run in seconds. See timing.LimitTimer() for details.
+adaptive_time_limit = True      # Reschedule comprehensive runs by cost and activity. See timing.AdaptiveLimitTimer().
+rescan_cost_ratio = 100         # Wait at least this many times the duration of the last comprehensive run.
+max_time_limit = 7200           # Longest interval in seconds between comprehensive runs when no files change.
+run_report_path = None          # Write a JSON breakdown of each run to this path. See timing.RunReport().
+run_report_table = False        # Print the per-stage breakdown of each run as a table.
+report_top = 0                  # List the N slowest files and costliest classes of each run. Same as --top N.
+trace_path = None               # Write a Chrome Trace Event timeline to this path. See tracing.py.
+trace_max_events = 100000       # Only the most recent trace events are kept.
+metrics_path = None             # Write Prometheus text format metrics to this path. See metrics.py.
+
+# Profiling (see profiling.py)
+profile_enabled = False         # Run blowdry.parse() under cProfile. Same as the --profile command line option.
+profile_every = 1               # Only profile every Nth parse. Raise it to keep watch mode overhead low.
+profile_top = 30                # Number of functions listed in each cumulative time summary.
+profile_directory = path.join(path.expanduser('~'), '.cache', 'blowdrycss', 'profiles')
+memory_profile_enabled = False  # Measure each stage with tracemalloc. Same as the --memory-profile option.
+memory_profile_top = 5          # Number of allocation sites listed per stage.
+memory_profile_frames = 1       # Stack frames stored per allocation. More frames cost more memory and time.
+
+# Polling (for Docker bind mounts, NFS, and other file systems that do not deliver file events)
+polling_enabled = False         # Poll file stats instead of waiting for file events. See pollingobserver.py.
+polling_interval = 1.0          # Seconds between polling ticks.
+polling_budget = 5000           # Maximum number of files stat'd per polling tick. 0 means no limit.
+
+# Watch mode fast path
+fast_path_enabled = False       # On save, append rules for the saved file's new classes first. Reconcile later.
+reconcile_delay = 2.0           # Seconds without a save before the background reconciliation runs.
+
+# Watch mode latency (edit-to-CSS, see timing.LatencyHistogram)
+latency_window = 1000           # Number of recent edits the p50/p95/p99 percentiles are computed from.
+latency_print_every = 20        # Print the percentiles after every Nth edit. 0 disables printing.
+latency_stats_path = None       # Rewrite a JSON file with the percentiles after each edit.
+
+# Live reload (watch mode only)
+live_reload_enabled = False     # Push "css-updated" Server-Sent Events to browsers. See livereload.py.
+live_reload_host = '127.0.0.1'  # Interface the live reload server binds to. Keep it local.
+live_reload_port = 35730        # Port the live reload server listens on.
+
+# Daemon (blowdrycss-daemon console script only)
+daemon_host = '127.0.0.1'       # Interface the daemon's HTTP/JSON API binds to. Keep it local.
+daemon_port = 35731             # Port the daemon's HTTP/JSON API listens on. See daemon.py.
+
+# Caches
+alias_cache_enabled = True      # Load the finished alias tables from disk instead of rebuilding them every start.
+alias_cache_directory = path.join(path.expanduser('~'), '.cache', 'blowdrycss')
+extraction_cache_enabled = False # Only re-read project files that changed since the last run. See ExtractionCache.
 
 # Boolean Flags
 auto_generate = True            # Auto-generate blowdry.css when a file that matches files_types is saved. (Watchdog)
@@ -6,8 +6,7 @@ import re
 from cssutils.css import Property
 # custom
 from blowdrycss.utilities import deny_empty_or_whitespace
-from blowdrycss_settings import use_em, xxsmall, xsmall, small, medium, large, xlarge, xxlarge, \
-    giant, xgiant, xxgiant, px_to_em
+from blowdrycss.config import Config
 
 __author__ = 'chad nelson'
 __project__ = 'blowdrycss'
@@ -38,9 +37,11 @@ class BreakpointParser(object):
 
     :type css_class: str
     :type css_property: Property
+    :type config: Config
 
     :param css_class: Potentially encoded css class that may or may not be parsable. May not be empty or None.
     :param css_property: Valid CSS Property as defined by ``cssutils.css.Property``.
+    :param config: Optional. Provides the breakpoints and unit conversion. Defaults to ``Config.from_settings()``.
 
     :return: None
 
@@ -86,31 +87,21 @@ class BreakpointParser(object):
     }
 
     """
-    def __init__(self, css_class='', css_property=Property()):
+    def __init__(self, css_class='', css_property=Property(), config=None):
         deny_empty_or_whitespace(css_class, variable_name='css_class')
         deny_empty_or_whitespace(css_property.cssText, variable_name='name')
 
         self.css_class = css_class
         self.css_property = css_property
-        self.units = 'em' if use_em else 'px'
+        self.config = Config.from_settings() if config is None else config
+        self.units = self.config.units
 
         # Dictionary of Breakpoint Dictionaries {'-only': (), '-down': [1], '-up': [0], }
         # '-only': ('min-width', 'max-width'),      # Lower and Upper Limits of the size.
         # '-down': ('max-width'),                   # Upper limit_key of size.
         # '-up': ('min-width'),                     # Lower Limit of size.
-        self.breakpoint_dict = {
-            '-xxsmall': {'-only': xxsmall, '-down': xxsmall[1], '-up': xxsmall[0], },
-            '-xsmall': {'-only': xsmall, '-down': xsmall[1], '-up': xsmall[0], },
-            '-small': {'-only': small, '-down': small[1], '-up': small[0], },
-            '-medium': {'-only': medium, '-down': medium[1], '-up': medium[0], },
-            '-large': {'-only': large, '-down': large[1], '-up': large[0], },
-            '-xlarge': {'-only': xlarge, '-down': xlarge[1], '-up': xlarge[0], },
-            '-xxlarge': {'-only': xxlarge, '-down': xxlarge[1], '-up': xxlarge[0], },
-            '-giant': {'-only': giant, '-down': giant[1], '-up': giant[0], },
-            '-xgiant': {'-only': xgiant, '-down': xgiant[1], '-up': xgiant[0], },
-            '-xxgiant': {'-only': xxgiant, '-down': xxgiant[1], '-up': xxgiant[0], },
-            'custom': {'-down': None, '-up': None, 'breakpoint': None},
-        }
+        self.breakpoint_dict = dict(self.config.breakpoint_dict)             # Precomputed once per Config.
+        self.breakpoint_dict['custom'] = {'-down': None, '-up': None, 'breakpoint': None}
 
         self.limit_key_set = {'-only', '-down', '-up', }
 
@@ -301,8 +292,8 @@ class BreakpointParser(object):
             custom_breakpoint = encoded_breakpoint.replace('_', '.')
 
             # Handle unit conversion.
-            if use_em:
-                custom_breakpoint = px_to_em(custom_breakpoint)
+            if self.config.use_em:
+                custom_breakpoint = self.config.px_to_em(custom_breakpoint)
 
             # Add transformed value to breakpoint_dict
             self.breakpoint_dict['custom'][self.limit_key] = custom_breakpoint
@@ -3,10 +3,175 @@ from __future__ import absolute_import, unicode_literals
 from io import open
 from builtins import str
 # builtins
+from hashlib import sha1
 from os import path
-from re import sub, findall, IGNORECASE
+from re import compile, IGNORECASE
+from timeit import default_timer
 import logging
 # custom
+from blowdrycss.tracing import tracer
+import blowdrycss_settings as settings
+
+
+js_substring = r'extract__class__set'
+js_replacement = js_substring + r'("'                 # Marks the class selector sets found by js_case.
+
+js_case = (
+    r'(domClass.add\(\s*.*?,\s*["\'])',                             # dojo
+    r'(domClass.add\(\s*.*?,\s*["\'])',
+    r'(dojo.addClass\(\s*.*?,\s*["\'])',
+    r'(domClass.remove\(\s*.*?,\s*["\'])',
+    r'(dojo.removeClass\(\s*.*?,\s*["\'])',
+    r'(YAHOO.util.Dom.addClass\(\s*.*?,\s*["\'])',                  # yui
+    r'(YAHOO.util.Dom.hasClass\(\s*.*?,\s*["\'])',
+    r'(YAHOO.util.Dom.removeClass\(\s*.*?,\s*["\'])',
+    r'(.addClass\(\s*["\'])',                                       # jquery
+    r'(.removeClass\(\s*["\'])',
+    r'(\$\(\s*["\']\.)',
+)
+
+
+def build_file_type_dict():
+    """ Build the substitution and findall regex patterns of every supported file extension. See ``FileRegexMap``.
+
+    :return: (*dict*) -- Maps each file extension e.g. ``'.html'`` to its ``sub_regexes`` and ``findall_regexes``.
+
+    """
+    sub_uri = (r'://', )                            # URIs (http://, ftp://) resemble inline JS comments (//)
+
+    sub_js = (
+        r'//.*?\n',                                                     # Remove JS Comments.
+        r'\n',                                                          # Remove new lines before block quotes.
+        r'/\*.*?\*/',                                                   # Remove block quotes.
+        r'(domClass.add\(\s*.*?,\s*["\'])',                             # dojo
+        r'(domClass.add\(\s*.*?,\s*["\'])',
+        r'(dojo.addClass\(\s*.*?,\s*["\'])',
+        r'(domClass.remove\(\s*.*?,\s*["\'])',
+        r'(dojo.removeClass\(\s*.*?,\s*["\'])',
+        r'(YAHOO.util.Dom.addClass\(\s*.*?,\s*["\'])',                  # yui
+        r'(YAHOO.util.Dom.hasClass\(\s*.*?,\s*["\'])',
+        r'(YAHOO.util.Dom.removeClass\(\s*.*?,\s*["\'])',
+        r'(.addClass\(\s*["\'])',                                       # jquery
+        r'(.removeClass\(\s*["\'])',
+        r'(\$\(\s*["\']\.)',
+    )
+    sub_html = sub_uri + sub_js + (r'<!--.*?-->', )
+    sub_jinja = (r'{.*?}?}', ) + sub_html + (r'{#.*?#}', )
+    sub_csharp = (r'//.*?\n', r'\n', r'/\*.*?\*/', )                    # Remove CS comments.
+    sub_dotnet = sub_html + (r'<%--.*?--%>', r'<%.*?%>', )              # Remove XHTML comments before elements.
+    sub_ruby = sub_html + (r'<%--.*?--%>', r'<%.*?%>', )                # Remove XHTML comments before elements.
+    sub_php = sub_html                                                  # Treat PHP like HTML and JS.
+
+    class_regex = (r'class=[\'"](.*?)["\']', )                          # general 'class' case
+
+    findall_regex_js = (
+        r'.classList.add\(\s*[\'"](.*?)["\']\s*\)',
+        r'.classList.remove\(\s*[\'"](.*?)["\']\s*\)',
+        r'.className\s*\+?=\s*.*?[\'"](.*?)["\']',
+        r'.getElementsByClassName\(\s*[\'"](.*?)["\']\s*\)',
+        r'.setAttribute\(\s*[\'"]class["\']\s*,\s*[\'"](.*?)["\']\s*\)',
+        js_substring + r'\(\s*[\'"](.*?)["\']\s*\)',                    # Find cases designated by js_substring.
+    )
+
+    findall_regex_cs = class_regex + (
+        r'.CssClass\s*\+?=\s*.*?[\'"](.*?)["\']',
+        r'.Attributes.Add\(\s*[\'"]class["\'],\s*.*?[\'"](.*?)["\']\s*\)',
+    )
+
+    findall_regex = class_regex + findall_regex_js
+
+    return {
+        '.js': {
+            'sub_regexes': sub_js,
+            'findall_regexes': findall_regex,
+        },
+        '.ts': {                                                        # Typescript
+            'sub_regexes': sub_js,
+            'findall_regexes': findall_regex,
+        },
+        '.vue': {                                                       # VueJs modular vue-loader
+            'sub_regexes': sub_html,
+            'findall_regexes': findall_regex,
+        },
+        '.html': {
+            'sub_regexes': sub_html,
+            'findall_regexes': findall_regex,
+        },
+        '.jinja': {
+            'sub_regexes': sub_jinja,
+            'findall_regexes': findall_regex,
+        },
+        '.jinja2': {
+            'sub_regexes': sub_jinja,
+            'findall_regexes': findall_regex,
+        },
+        '.jnj': {
+            'sub_regexes': sub_jinja,
+            'findall_regexes': findall_regex,
+        },
+        '.ja': {
+            'sub_regexes': sub_jinja,
+            'findall_regexes': findall_regex,
+        },
+        '.djt': {
+            'sub_regexes': sub_jinja,
+            'findall_regexes': findall_regex,
+        },
+        '.djhtml': {
+            'sub_regexes': sub_jinja,
+            'findall_regexes': findall_regex,
+        },
+        '.cs': {
+            'sub_regexes': sub_csharp,
+            'findall_regexes': findall_regex_cs,
+        },
+        '.aspx': {
+            'sub_regexes': sub_dotnet,
+            'findall_regexes': findall_regex,
+        },
+        '.ascx': {
+            'sub_regexes': sub_dotnet,
+            'findall_regexes': findall_regex,
+        },
+        '.master': {
+            'sub_regexes': sub_dotnet,
+            'findall_regexes': findall_regex,
+        },
+        '.erb': {
+            'sub_regexes': sub_ruby,
+            'findall_regexes': findall_regex,
+        },
+        '.php': {
+            'sub_regexes': sub_php,
+            'findall_regexes': findall_regex,
+        }
+    }
+
+
+#: Regex patterns of every supported file extension. Built once per process.
+file_type_dict = build_file_type_dict()
+
+#: ``file_type_dict`` with every pattern compiled. Maps each extension to ``(sub_patterns, findall_patterns)`` where
+#: each of ``sub_patterns`` is a ``(pattern, replacement)`` pair.
+compiled_regex_bank = dict(
+    (extension, (
+        tuple((compile(regex), js_replacement if regex in js_case else '') for regex in regexes['sub_regexes']),
+        tuple(compile(regex, IGNORECASE) for regex in regexes['findall_regexes']),
+    ))
+    for extension, regexes in file_type_dict.items()
+)
+
+
+def extraction_cache_path():
+    """ Build the path of the ``filehandler.ExtractionCache`` record. The file name contains a hash of this module's
+    source, so a change to the extraction rules never reuses the class selectors extracted by the old rules.
+
+    :return: (*str*) -- Returns the path of the record in ``settings.alias_cache_directory``.
+
+    """
+    with open(path.splitext(__file__)[0] + '.py', 'rb') as source_file:          # Same key for .py and .pyc.
+        key = sha1(source_file.read()).hexdigest()[:16]
+    return path.join(settings.alias_cache_directory, 'extraction_cache-' + key + '.json')
 
 
 class FileRegexMap(object):
@@ -57,6 +222,9 @@ class FileRegexMap(object):
 
     | **_path** (*str*) -- Relative or full path to the parsable file.
 
+    | **must_exist** (*bool*) -- If False, ``file_path`` is only used for its extension e.g. when the text is already
+      in memory. Default True.
+
     **Examples:**
 
     >>> from blowdrycss.classparser import FileRegexMap
@@ -68,144 +236,17 @@ class FileRegexMap(object):
     }
 
     """
-    def __init__(self, file_path=''):
+    def __init__(self, file_path='', must_exist=True):
         self.file_path = file_path.strip()                                      # Remove external whitespace.
         self._regex_dict = dict()
         self.name = ''
         self.extension = ''
-        self.js_replacement = r''
-        self.js_case = ()
-        self.file_type_dict = dict()
+        self.js_replacement = js_replacement
+        self.js_case = js_case
+        self.file_type_dict = file_type_dict
 
-        if path.isfile(self.file_path):
+        if path.isfile(self.file_path) or not must_exist:
             self.name, self.extension = path.splitext(self.file_path)
-
-            sub_uri = (r'://', )                            # URIs (http://, ftp://) resemble inline JS comments (//)
-
-            js_substring = r'extract__class__set'
-            self.js_replacement = js_substring + r'("'
-
-            self.js_case = (
-                r'(domClass.add\(\s*.*?,\s*["\'])',                             # dojo
-                r'(domClass.add\(\s*.*?,\s*["\'])',
-                r'(dojo.addClass\(\s*.*?,\s*["\'])',
-                r'(domClass.remove\(\s*.*?,\s*["\'])',
-                r'(dojo.removeClass\(\s*.*?,\s*["\'])',
-                r'(YAHOO.util.Dom.addClass\(\s*.*?,\s*["\'])',                  # yui
-                r'(YAHOO.util.Dom.hasClass\(\s*.*?,\s*["\'])',
-                r'(YAHOO.util.Dom.removeClass\(\s*.*?,\s*["\'])',
-                r'(.addClass\(\s*["\'])',                                       # jquery
-                r'(.removeClass\(\s*["\'])',
-                r'(\$\(\s*["\']\.)',
-            )
-
-            sub_js = (
-                r'//.*?\n',                                                     # Remove JS Comments.
-                r'\n',                                                          # Remove new lines before block quotes.
-                r'/\*.*?\*/',                                                   # Remove block quotes.
-                r'(domClass.add\(\s*.*?,\s*["\'])',                             # dojo
-                r'(domClass.add\(\s*.*?,\s*["\'])',
-                r'(dojo.addClass\(\s*.*?,\s*["\'])',
-                r'(domClass.remove\(\s*.*?,\s*["\'])',
-                r'(dojo.removeClass\(\s*.*?,\s*["\'])',
-                r'(YAHOO.util.Dom.addClass\(\s*.*?,\s*["\'])',                  # yui
-                r'(YAHOO.util.Dom.hasClass\(\s*.*?,\s*["\'])',
-                r'(YAHOO.util.Dom.removeClass\(\s*.*?,\s*["\'])',
-                r'(.addClass\(\s*["\'])',                                       # jquery
-                r'(.removeClass\(\s*["\'])',
-                r'(\$\(\s*["\']\.)',
-            )
-            sub_html = sub_uri + sub_js + (r'<!--.*?-->', )
-            sub_jinja = (r'{.*?}?}', ) + sub_html + (r'{#.*?#}', )
-            sub_csharp = (r'//.*?\n', r'\n', r'/\*.*?\*/', )                    # Remove CS comments.
-            sub_dotnet = sub_html + (r'<%--.*?--%>', r'<%.*?%>', )              # Remove XHTML comments before elements.
-            sub_ruby = sub_html + (r'<%--.*?--%>', r'<%.*?%>', )                # Remove XHTML comments before elements.
-            sub_php = sub_html                                                  # Treat PHP like HTML and JS.
-
-            class_regex = (r'class=[\'"](.*?)["\']', )                          # general 'class' case
-
-            findall_regex_js = (
-                r'.classList.add\(\s*[\'"](.*?)["\']\s*\)',
-                r'.classList.remove\(\s*[\'"](.*?)["\']\s*\)',
-                r'.className\s*\+?=\s*.*?[\'"](.*?)["\']',
-                r'.getElementsByClassName\(\s*[\'"](.*?)["\']\s*\)',
-                r'.setAttribute\(\s*[\'"]class["\']\s*,\s*[\'"](.*?)["\']\s*\)',
-                js_substring + r'\(\s*[\'"](.*?)["\']\s*\)',                    # Find cases designated by js_substring.
-            )
-
-            findall_regex_cs = class_regex + (
-                r'.CssClass\s*\+?=\s*.*?[\'"](.*?)["\']',
-                r'.Attributes.Add\(\s*[\'"]class["\'],\s*.*?[\'"](.*?)["\']\s*\)',
-            )
-
-            findall_regex = class_regex + findall_regex_js
-
-            self.file_type_dict = {
-                '.js': {
-                    'sub_regexes': sub_js,
-                    'findall_regexes': findall_regex,
-                },
-                '.ts': {                                                        # Typescript
-                    'sub_regexes': sub_js,
-                    'findall_regexes': findall_regex,
-                },
-                '.vue': {                                                       # VueJs modular vue-loader
-                    'sub_regexes': sub_html,
-                    'findall_regexes': findall_regex,
-                },
-                '.html': {
-                    'sub_regexes': sub_html,
-                    'findall_regexes': findall_regex,
-                },
-                '.jinja': {
-                    'sub_regexes': sub_jinja,
-                    'findall_regexes': findall_regex,
-                },
-                '.jinja2': {
-                    'sub_regexes': sub_jinja,
-                    'findall_regexes': findall_regex,
-                },
-                '.jnj': {
-                    'sub_regexes': sub_jinja,
-                    'findall_regexes': findall_regex,
-                },
-                '.ja': {
-                    'sub_regexes': sub_jinja,
-                    'findall_regexes': findall_regex,
-                },
-                '.djt': {
-                    'sub_regexes': sub_jinja,
-                    'findall_regexes': findall_regex,
-                },
-                '.djhtml': {
-                    'sub_regexes': sub_jinja,
-                    'findall_regexes': findall_regex,
-                },
-                '.cs': {
-                    'sub_regexes': sub_csharp,
-                    'findall_regexes': findall_regex_cs,
-                },
-                '.aspx': {
-                    'sub_regexes': sub_dotnet,
-                    'findall_regexes': findall_regex,
-                },
-                '.ascx': {
-                    'sub_regexes': sub_dotnet,
-                    'findall_regexes': findall_regex,
-                },
-                '.master': {
-                    'sub_regexes': sub_dotnet,
-                    'findall_regexes': findall_regex,
-                },
-                '.erb': {
-                    'sub_regexes': sub_ruby,
-                    'findall_regexes': findall_regex,
-                },
-                '.php': {
-                    'sub_regexes': sub_php,
-                    'findall_regexes': findall_regex,
-                }
-            }
         else:
             raise OSError('"' + self.file_path + '" does not exist.')
 
@@ -242,6 +283,9 @@ class ClassExtractor(object):
     | **findall_pattern** (*tuple of regexes*) -- Zero or more regex patterns used to find all class selectors
       in a given file.
 
+    | **text** (*str*) -- Optional. Parsed instead of the file contents. ``file_path`` then only selects the regex
+      patterns by its extension, and need not exist.
+
     **Example Usage:**
 
     >>> from blowdrycss.classparser import ClassExtractor
@@ -260,13 +304,15 @@ class ClassExtractor(object):
     {'purple', 'padding-left-5', 'squirrel', 'text-align-center', 'large-up', 'border-1', 'row', 'text-align-center'}
 
     """
-    def __init__(self, file_path=''):
-        if path.isfile(file_path):
+    def __init__(self, file_path='', text=None):
+        if path.isfile(file_path) or text is not None:
             self.file_path = file_path
-            self.file_regex_map = FileRegexMap(file_path=file_path)
+            self.text = text
+            self.file_regex_map = FileRegexMap(file_path=file_path, must_exist=text is None)
             regex_dict = self.file_regex_map.regex_dict
             self.sub_regexes = regex_dict['sub_regexes']
             self.findall_regexes = regex_dict['findall_regexes']
+            self.sub_patterns, self.findall_patterns = compiled_regex_bank[self.file_regex_map.extension]
         else:
             raise OSError('"' + file_path + '" does not exist.')
 
@@ -284,16 +330,16 @@ class ClassExtractor(object):
 
         """
         class_list = []
-        with open(self.file_path, 'r', encoding='utf-8') as _file:
-            text = _file.read()
-            for sub_regex in self.sub_regexes:                                      # Remove everything first.
-                if sub_regex in self.file_regex_map.js_case:
-                    text = sub(sub_regex, self.file_regex_map.js_replacement, text)
-                else:
-                    text = sub(sub_regex, '', text)
-            for findall_regex in self.findall_regexes:                              # Find everything second.
-                class_list += findall(findall_regex, text, IGNORECASE)              # Allow CamelCase i.e. ClaSs="bold"
-            logging.debug('classectractor.rawclasslist text: ' + text)
+        if self.text is None:
+            with open(self.file_path, 'r', encoding='utf-8') as _file:
+                text = _file.read()
+        else:
+            text = self.text
+        for sub_pattern, replacement in self.sub_patterns:                          # Remove everything first.
+            text = sub_pattern.sub(replacement, text)
+        for findall_pattern in self.findall_patterns:                               # Find everything second.
+            class_list += findall_pattern.findall(text)                             # Allow CamelCase i.e. ClaSs="bold"
+        logging.debug('classectractor.rawclasslist text: %s', text)
         return class_list
 
     @property
@@ -305,13 +351,14 @@ class ClassExtractor(object):
         """
         class_set = set()
 
-        logging.debug(msg='classextractor.raw_class_list:\t' + str(self.raw_class_list))
-        for classes in self.raw_class_list:
+        raw_class_list = self.raw_class_list                # Reads the file. Evaluate it only once.
+        logging.debug('classextractor.raw_class_list:\t%s', raw_class_list)
+        for classes in raw_class_list:
             class_set = set.union(
                 set(classes.split()),               # Split space delimited string into set().
                 class_set                           # Unite the new set with class_set.
             )                                       # Assign union() to class_set.
-        logging.debug(msg='classextractor.class_set:\t' + str(class_set))
+        logging.debug('classextractor.class_set:\t%s', class_set)
         return class_set
 
 
@@ -322,6 +369,15 @@ class ClassParser(object):
 
     **file_dict** (*dict*) -- Expecting FileFinder.file_dict as input.
 
+    **extraction_cache** (*ExtractionCache*) -- Optional. Files whose stat signature is unchanged are not read again.
+    Files that are read are recorded in it.
+
+    **Members**
+
+    **bytes_read** (*int*) -- Total size in bytes of every file read. Files found in ``extraction_cache`` are not read.
+
+    **file_costs** (*dict*) -- Maps each file path read to ``[extraction seconds, bytes, class count]``.
+
     **Returns** None
 
     **Example**
@@ -340,13 +396,16 @@ class ClassParser(object):
     { Returns a complete set of all the classes discovered after looking in at all file paths. }
 
     """
-    def __init__(self, file_dict):
+    def __init__(self, file_dict, extraction_cache=None):
+        self.extraction_cache = extraction_cache
         self.class_set = set()
+        self.bytes_read = 0
+        self.file_costs = {}
         self.file_dict = file_dict
         self.file_path_list = []
         self.build_file_path_list()
 
-        logging.debug(msg='classparser.html_class_parser.class_set:\t' + str(self.class_set))
+        logging.debug('classparser.html_class_parser.class_set:\t%s', self.class_set)
         self.build_class_set()
 
     def build_file_path_list(self):
@@ -366,7 +425,19 @@ class ClassParser(object):
 
         """
         for file_path in self.file_path_list:
-            class_extractor = ClassExtractor(file_path=file_path)
-            logging.debug(msg='classparser.class_extractor.class_set:\t' + str(class_extractor.class_set))
-            self.class_set = self.class_set.union(class_extractor.class_set)
-        logging.debug(msg='classparser final class_set:\t' + str(self.class_set))
+            start = default_timer()
+            class_set = None
+            if self.extraction_cache is not None:
+                signature, class_set = self.extraction_cache.lookup(file_path=file_path)
+            if class_set is None:
+                with tracer.span('extract', category='file', file=file_path):
+                    class_extractor = ClassExtractor(file_path=file_path)
+                    class_set = class_extractor.class_set
+                if self.extraction_cache is not None:
+                    self.extraction_cache.update(file_path=file_path, signature=signature, class_set=class_set)
+                file_size = path.getsize(file_path)
+                self.file_costs[file_path] = [default_timer() - start, file_size, len(class_set)]
+                self.bytes_read += file_size
+            logging.debug('classparser.class_extractor.class_set:\t%s', class_set)
+            self.class_set = self.class_set.union(class_set)
+        logging.debug('classparser final class_set:\t%s', self.class_set)
@@ -7,6 +7,8 @@ selectors are gathered externally by the ``HTMLClassParser()``.
 **Parameters:**
     | class_set (*set*) -- A set() of potential css properties.
 
+    | config (*Config*) -- Optional. Passed on to every value parser. Defaults to ``Config.from_settings()``.
+
 **Returns:** Object of Type ClassPropertyParser
 
 **Examples:**
@@ -54,6 +56,7 @@ from re import findall
 # plugins
 from cssutils import parseString
 # custom
+from blowdrycss.config import Config
 from blowdrycss.datalibrary import ordered_property_dict, property_alias_dict, property_regex_dict, \
     pseudo_classes, pseudo_elements
 from blowdrycss.utilities import deny_empty_or_whitespace
@@ -64,7 +67,8 @@ __project__ = 'blowdrycss'
 
 
 class ClassPropertyParser(object):
-    def __init__(self, class_set=set()):
+    def __init__(self, class_set=set(), config=None):
+        self.config = Config.from_settings() if config is None else config
         css = '''/* Generated with blowdrycss. */'''
         self.sheet = parseString(css)
         self.rules = []
@@ -438,8 +442,7 @@ class ClassPropertyParser(object):
         encoded_property_value = self.strip_priority_designator(css_class)
         return encoded_property_value
 
-    @staticmethod
-    def get_property_value(property_name='', encoded_property_value=''):
+    def get_property_value(self, property_name='', encoded_property_value=''):
         """
         Accepts an encoded_property_value that's been stripped of it's property named and priority
         Uses CSSPropertyValueParser, and returns a valid css property value or ''.
@@ -475,7 +478,7 @@ class ClassPropertyParser(object):
         deny_empty_or_whitespace(string=property_name, variable_name='property_name')
         deny_empty_or_whitespace(string=encoded_property_value, variable_name='encoded_property_value')
 
-        value_parser = CSSPropertyValueParser(property_name=property_name)
+        value_parser = CSSPropertyValueParser(property_name=property_name, config=self.config)
         value = value_parser.decode_property_value(value=encoded_property_value)
         return value
 
@@ -0,0 +1,128 @@
+"""
+Entry point of the ``blowdrycss`` console script.
+
+Only the modules that the current settings need are imported. A one-shot run (``auto_generate == False``) never
+loads watchdog or the watch mode machinery, and pandoc is only loaded when ``rst_docs == True``.
+
+**Usage Case:** ::
+
+    $ blowdrycss
+    $ blowdrycss --profile --profile-every 10
+    $ blowdrycss --memory-profile
+    $ blowdrycss --top 10
+    $ blowdrycss --batch projects.json --jobs 4
+    $ blowdrycss --check
+
+>>> from blowdrycss import cli
+>>> cli.main()
+
+"""
+# python 2
+from __future__ import absolute_import
+
+# builtins
+from argparse import ArgumentParser
+import sys
+
+# custom
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+def parse_arguments(argv=None):
+    """ Parse the command line options. Each option overrides the matching setting.
+
+    :type argv: list
+    :param argv: Command line arguments. ``None`` reads ``sys.argv``.
+
+    :return: (*Namespace*) -- Returns the parsed options.
+
+    """
+    parser = ArgumentParser(prog='blowdrycss', description='Generate DRY CSS from the encoded class selectors.')
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='Run each parse under cProfile and write a .pstats file with a cumulative time summary.'
+    )
+    parser.add_argument(
+        '--profile-every', type=int, default=None, metavar='N',
+        help='Only profile every Nth parse. Keeps watch mode overhead low.'
+    )
+    parser.add_argument(
+        '--memory-profile', action='store_true',
+        help='Report the peak and retained memory of each stage, and the growth between watch mode runs.'
+    )
+    parser.add_argument(
+        '--top', type=int, default=None, metavar='N',
+        help='After each run, list the N slowest files and the N costliest classes.'
+    )
+    parser.add_argument(
+        '--batch', default=None, metavar='FILE',
+        help='Build every project listed in the JSON file FILE in one process. See blowdrycss.batch.'
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=1, metavar='N',
+        help='With --batch, build the projects in N worker processes.'
+    )
+    parser.add_argument(
+        '--check', action='store_true',
+        help='Write nothing. Exit with status 1 if the output files are not what a full run would write.'
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ Apply the command line options to the settings.
+
+    If ``--check`` is given, run ``blowdry.check()`` and exit with status 1 if the output files are out of date.
+
+    If ``--batch`` is given, build the listed projects with ``batch.run_batch()`` and exit with status 1 if any of
+    them failed.
+
+    If ``settings.auto_generate == True`` hand over to ``watchdogwrapper.main()``, which loads watchdog.
+
+    Else, run ``blowdry.boilerplate()`` and a single comprehensive ``blowdry.parse()``. Both record into the same
+    ``RunReport``, so the report covers the documentation stage too. Then wait for the background documentation, so
+    a documentation failure exits with a non-zero status.
+
+    :type argv: list
+    :param argv: Command line arguments. ``None`` reads ``sys.argv``.
+
+    :return: None
+
+    """
+    arguments = parse_arguments(argv=argv)
+    if arguments.profile:
+        settings.profile_enabled = True
+    if arguments.profile_every is not None:
+        settings.profile_every = arguments.profile_every
+    if arguments.memory_profile:
+        settings.memory_profile_enabled = True
+    if arguments.top is not None:
+        settings.report_top = arguments.top
+
+    if arguments.check:
+        from blowdrycss import blowdry
+        if not blowdry.check().current:
+            sys.exit(1)
+    elif arguments.batch:
+        from blowdrycss import batch
+        summaries = batch.run_batch(projects=batch.load_projects(file_path=arguments.batch), jobs=arguments.jobs)
+        if any(summary.error is not None for summary in summaries):
+            sys.exit(1)
+    elif settings.auto_generate:
+        from blowdrycss import watchdogwrapper
+        watchdogwrapper.main()
+    else:
+        from blowdrycss import blowdry
+        from blowdrycss.timing import RunReport
+        report = RunReport()
+        docs_thread = blowdry.boilerplate(report=report)
+        blowdry.parse(recent=False, class_set=set(), report=report)
+        if docs_thread is not None:
+            docs_thread.join()                                                  # Re-raises a documentation failure.
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+In-memory programmatic API. Compiles template text to CSS without walking ``project_directory`` or writing to
+``css_directory``.
+
+Decoding is controlled by an explicit ``Config`` instead of the ``blowdrycss_settings`` module, so builds with
+different configurations can run concurrently in one process e.g. inside an asset server.
+
+**Usage Case:**
+
+>>> from blowdrycss.compiler import compile_css
+>>> from blowdrycss.config import Config
+>>> result = compile_css(
+>>>     sources=[('index.html', '<div class="padding-10 bold row">Hello</div>')],
+>>>     config=Config(use_em=False),
+>>> )
+>>> result.class_set
+{'padding-10', 'bold'}
+>>> result.removed_class_set
+{'row'}
+>>> print(result.minified_css)
+.bold{font-weight:bold}.padding-10{padding:10px}
+
+"""
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from collections import namedtuple
+from io import open
+
+# custom
+from blowdrycss.blowdry import build_css
+from blowdrycss.classparser import ClassExtractor
+from blowdrycss.config import Config
+from blowdrycss.filehandler import serialize_css
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+#: Output of ``compile_css()``.
+#:
+#: - ``css`` (*str*) -- Human readable CSS. Empty if ``config.human_readable`` is False.
+#: - ``minified_css`` (*str*) -- Minified CSS. Empty if ``config.minify`` is False.
+#: - ``class_set`` (*set*) -- Class selectors that were decoded into CSS.
+#: - ``removed_class_set`` (*set*) -- Class selectors found in the sources that do not match the encoding.
+#: - ``diagnostics`` (*list*) -- Messages about sources that could not be parsed.
+Result = namedtuple('Result', ('css', 'minified_css', 'class_set', 'removed_class_set', 'diagnostics'))
+
+
+def compile_css(sources=(), config=None):
+    """ Extract the class selectors from ``sources`` and compile them to CSS.
+
+    :type sources: iterable
+    :param sources: ``(name, text)`` pairs. The extension of ``name`` selects the parsing rules e.g. ``.html``,
+      ``.jinja2``, or ``.js``. ``name`` need not exist on disk.
+
+    :type config: Config
+    :param config: Decoding and output configuration. Defaults to ``Config()``, not the current settings.
+
+    :return: (*Result*) -- Returns the CSS along with the decoded and removed class selectors.
+
+    """
+    found_class_set, diagnostics = extract_classes(sources=sources)
+    return compile_classes(class_set=found_class_set, config=config, diagnostics=diagnostics)
+
+
+def extract_classes(sources=()):
+    """ Extract the class selectors from ``sources``. This is the first half of ``compile_css()``.
+
+    :type sources: iterable
+    :param sources: ``(name, text)`` pairs. See ``compile_css()``.
+
+    :return: (*tuple*) -- Returns ``(class_set, diagnostics)``.
+
+    """
+    found_class_set = set()
+    diagnostics = []
+    for name, text in sources:
+        try:
+            found_class_set.update(ClassExtractor(file_path=name, text=text).class_set)
+        except KeyError:
+            diagnostics.append(name + ': unsupported file extension.')
+    return found_class_set, diagnostics
+
+
+def compile_classes(class_set=set(), config=None, diagnostics=()):
+    """ Decode ``class_set`` and serialize the CSS. This is the second half of ``compile_css()``.
+
+    :type class_set: set
+    :param class_set: Class selectors e.g. from ``extract_classes()``. It is not modified.
+
+    :type config: Config
+    :param config: Decoding and output configuration. Defaults to ``Config()``.
+
+    :type diagnostics: iterable
+    :param diagnostics: Messages copied to ``Result.diagnostics``.
+
+    :return: (*Result*) -- Returns the CSS along with the decoded and removed class selectors.
+
+    """
+    config = Config() if config is None else config
+    valid_class_set, css_text = build_css(class_set=set(class_set), config=config, verbose=False)
+    removed_class_set = set(css_class.lower() for css_class in class_set).difference(valid_class_set)
+
+    return Result(
+        css=serialize_css(css_text=css_text) if config.human_readable else '',
+        minified_css=serialize_css(css_text=css_text, minified=True) if config.minify else '',
+        class_set=valid_class_set,
+        removed_class_set=removed_class_set,
+        diagnostics=list(diagnostics),
+    )
+
+
+def read_source(file_path=''):
+    """ Read a template file into the ``(name, text)`` form that ``compile_css()`` accepts.
+
+    :type file_path: str
+    :param file_path: Path of the file.
+
+    :return: (*tuple*) -- Returns ``(file_path, text)``.
+
+    """
+    with open(file_path, 'r', encoding='utf-8') as _file:
+        return file_path, _file.read()
@@ -0,0 +1,173 @@
+"""
+Explicit, immutable configuration of the blowdrycss pipeline.
+
+Most of blowdrycss used to read the global ``blowdrycss_settings`` module from its hot paths, and rebuilt derived
+data such as the breakpoint tables for every class selector. ``Config`` is built once per run with
+``Config.from_settings()``, precomputes the derived tables, and is passed explicitly through the pipeline. Callers
+such as ``compiler.compile_css()`` can also run many builds with different configurations in one process without
+mutating module globals.
+
+**Usage Case:**
+
+>>> from blowdrycss.config import Config
+>>> config = Config(use_em=False, media_queries_enabled=False)
+>>> config.px_to_em(pixels='24')
+'1.5em'
+>>> config = Config.from_settings(minify=False)     # The current settings with one override.
+>>> config.breakpoint_dict['-medium']['-up']
+'30.0625em'
+
+"""
+# python 2
+from __future__ import absolute_import, division, unicode_literals
+from builtins import round, str
+
+# builtins
+from collections import namedtuple, OrderedDict
+from fnmatch import translate
+from os import path
+from re import compile, IGNORECASE
+from string import digits
+
+try:                                                # Python 3.3+
+    from types import MappingProxyType
+except ImportError:                                 # Python 2.7 falls back to a plain (mutable) dict.
+    MappingProxyType = dict
+
+# custom
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+#: Default screen breakpoints in pixels. Same as the defaults in ``blowdrycss_settings.py``.
+breakpoint_pixels = OrderedDict((
+    ('xxsmall', (0, 120)),
+    ('xsmall', (121, 240)),
+    ('small', (241, 480)),
+    ('medium', (481, 720)),
+    ('large', (721, 1024)),
+    ('xlarge', (1025, 1366)),
+    ('xxlarge', (1367, 1920)),
+    ('giant', (1921, 2560)),
+    ('xgiant', (2561, 2800)),
+    ('xxgiant', (2801, 10 ** 6)),
+))
+
+#: Fields that are taken from the settings. The remaining fields are derived from them.
+setting_fields = (
+    'use_em', 'base', 'breakpoints', 'media_queries_enabled', 'human_readable', 'minify', 'file_types',
+)
+derived_fields = ('units', 'breakpoint_dict', 'file_extensions', 'file_type_pattern')
+
+
+class Config(namedtuple('Config', setting_fields + derived_fields)):
+    """ Settings that affect the pipeline. Each of ``setting_fields`` has the meaning of the setting with the same
+    name in ``blowdrycss_settings.py``. Instances are immutable. Use ``_replace()`` to derive a modified copy.
+
+    | **Members:**
+
+    | **breakpoints** (*mapping*) -- Maps each breakpoint name e.g. ``'medium'`` to its ``(lower, upper)`` limits.
+      Defaults to ``breakpoint_pixels`` converted to em with ``base``.
+
+    | **units** (*str*) -- ``'em'`` if ``use_em`` else ``'px'``.
+
+    | **breakpoint_dict** (*mapping*) -- Maps each breakpoint suffix e.g. ``'-medium'`` to the limits of its
+      ``'-only'``, ``'-down'``, and ``'-up'`` media queries. See ``BreakpointParser``.
+
+    | **file_extensions** (*tuple*) -- ``file_types`` without the ``*`` wildcard e.g. ``('.html', '.js')``.
+
+    | **file_type_pattern** (*regex*) -- Compiled pattern that matches a file name against any of ``file_types``.
+
+    :return: None
+
+    """
+    __slots__ = ()
+
+    def __new__(cls, use_em=True, base=16, breakpoints=None, media_queries_enabled=True, human_readable=True,
+                minify=True, file_types=('*.html', )):
+        if breakpoints is None:
+            breakpoints = OrderedDict(
+                (name, (px_to_em(lower, base=base), px_to_em(upper, base=base)))
+                for name, (lower, upper) in breakpoint_pixels.items()
+            )
+        breakpoints = MappingProxyType(OrderedDict(breakpoints))
+        breakpoint_dict = MappingProxyType(OrderedDict(
+            ('-' + name, MappingProxyType({'-only': tuple(limits), '-down': limits[1], '-up': limits[0], }))
+            for name, limits in breakpoints.items()
+        ))
+        file_types = tuple(file_types)
+        return super(Config, cls).__new__(
+            cls, use_em, base, breakpoints, media_queries_enabled, human_readable, minify, file_types,
+            'em' if use_em else 'px',
+            breakpoint_dict,
+            tuple(file_type.replace('*', '') for file_type in file_types),
+            compile(
+                '|'.join(translate(file_type) for file_type in file_types) or '(?!)',
+                IGNORECASE if path.normcase('A') == 'a' else 0,           # Like fnmatch() e.g. on Windows.
+            ),
+        )
+
+    @classmethod
+    def from_settings(cls, **overrides):
+        """ Build a ``Config`` from the current values in ``blowdrycss_settings``. Call it once per run.
+
+        :param overrides: Optional values of ``setting_fields`` that replace the settings e.g. ``use_em=False``.
+
+        :return: (*Config*) -- Returns the configuration.
+
+        """
+        values = dict(
+            use_em=settings.use_em,
+            base=settings.base,
+            breakpoints=OrderedDict((name, getattr(settings, name)) for name in breakpoint_pixels),
+            media_queries_enabled=settings.media_queries_enabled,
+            human_readable=settings.human_readable,
+            minify=settings.minify,
+            file_types=settings.file_types,
+        )
+        values.update(overrides)
+        return cls(**values)
+
+    def __reduce__(self):
+        """ Lets ``copy`` and ``pickle`` rebuild the instance from ``setting_fields`` alone e.g. to send it to a
+        process pool. """
+        values = [getattr(self, name) for name in setting_fields]
+        values[setting_fields.index('breakpoints')] = OrderedDict(self.breakpoints)
+        return type(self), tuple(values)
+
+    def _replace(self, **changes):
+        """ :return: (*Config*) -- Returns a copy with ``changes`` applied to ``setting_fields``, and every derived
+        field recomputed. """
+        values = dict((name, getattr(self, name)) for name in setting_fields)
+        values.update(changes)
+        return type(self)(**values)
+
+    def px_to_em(self, pixels):
+        """ Convert ``pixels`` to em using ``base``. See ``blowdrycss_settings.px_to_em()``.
+
+        :return: (*str*) -- Returns the converted value e.g. ``'1.5em'``, or ``pixels`` if it is not numeric.
+
+        """
+        return px_to_em(pixels, base=self.base)
+
+    def is_file_type(self, file_name=''):
+        """ :return: (*bool*) -- Returns True if ``file_name`` matches one of the ``file_types`` patterns. """
+        return self.file_type_pattern.match(file_name) is not None
+
+
+def px_to_em(pixels, base=16):
+    """ Convert a numeric value from px to em. Non-numeric values pass through unchanged.
+
+    :type pixels: str, int, float
+    :param pixels: A numeric value with the units stripped.
+
+    :type base: int
+    :param base: Pixels per em.
+
+    :return: (*str*) -- Returns the number of em rounded to 4 decimal places with ``em`` appended.
+
+    """
+    if set(str(pixels)) <= set(digits + '-.'):
+        return str(round(float(pixels) / float(base), 4)) + 'em'
+    return pixels
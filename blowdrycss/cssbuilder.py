@@ -8,6 +8,8 @@ from cssutils.css import Selector, Property, CSSStyleRule, CSSStyleSheet
 from xml.dom import SyntaxErr
 # custom
 from blowdrycss.classpropertyparser import ClassPropertyParser
+from blowdrycss.filehandler import serializer_lock
+from blowdrycss.timing import timed_items
 
 __author__ = 'chad nelson'
 __project__ = 'blowdrycss'
@@ -29,20 +31,24 @@ class CSSBuilder(object):
 
     | **Parameters: property_parser** (*ClassPropertyParser object*) -- Contains a class property parser with a
       populated class_set.
+    | **Parameters: verbose** (*bool*) -- Print a start message to stdout. In-memory builds pass False.
+    | **Members: class_costs** (*dict*) -- Maps each css_class to the seconds spent decoding and validating it.
     | **Returns:** None
 
     """
-    def __init__(self, property_parser=ClassPropertyParser()):
+    def __init__(self, property_parser=ClassPropertyParser(), verbose=True):
         message = 'CSSBuilder Running...'
-        print(message)
+        if verbose:
+            print(message)
         logging.debug(msg=message)
         self.property_parser = property_parser
         self.css_rules = set()
         self.css_stylesheet = CSSStyleSheet()
+        self.class_costs = {}
 
         invalid_css_classes = []
         reasons = []
-        for css_class in self.property_parser.class_set:
+        for css_class in timed_items(self.property_parser.class_set, costs=self.class_costs):
             name = self.property_parser.get_property_name(css_class=css_class)
 
             # 'name' can return an empty string '' if css_class does not match any patterns in the property_alias_dict.
@@ -125,8 +131,11 @@ class CSSBuilder(object):
             self.css_stylesheet.add(rule=css_rule)
 
     def get_css_text(self):
-        """
+        """ Holds ``filehandler.serializer_lock``, so a concurrent serialization cannot switch the global
+        ``cssutils.ser.prefs`` to minified midway.
+
         :return: str -- Returns CSS text.
         """
-        return self.css_stylesheet.cssText
+        with serializer_lock:
+            return self.css_stylesheet.cssText
 
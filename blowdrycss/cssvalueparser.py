@@ -16,13 +16,17 @@ __project__ = 'blowdrycss'
 
 class CSSPropertyValueParser(object):
     """
-    Accepts a ``property_name`` and ``use_em`` unit conversion flag.
+    Accepts a ``property_name`` and an optional ``config`` holding the ``use_em`` unit conversion flag.
 
     Contains multiple parsers and methods that decodes the CSS property_value.
 
     :type property_name: str
 
     :param property_name: A CSS property name.
+
+    :type config: Config
+    :param config: Optional. Defaults to ``Config.from_settings()``.
+
     :return: None
 
     **Attributes:**
@@ -39,10 +43,10 @@ class CSSPropertyValueParser(object):
 
     """
 
-    def __init__(self, property_name=''):
+    def __init__(self, property_name='', config=None):
         self.property_name = property_name
         self.color_parser = ColorParser(property_name=property_name)
-        self.unit_parser = UnitParser(property_name=property_name)
+        self.unit_parser = UnitParser(property_name=property_name, config=config)
 
     def is_built_in(self, value=''):
         """ Checks if the encoded ``value`` identically matches a value built-in to the CSS standard.
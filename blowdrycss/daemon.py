@@ -0,0 +1,385 @@
+"""
+Long-running blowdrycss daemon with a local HTTP/JSON API.
+
+Every ``blowdrycss`` run pays the start up cost again: the alias tables are rebuilt, every project file is
+re-read, and every class selector is decoded and validated by cssutils from scratch. The daemon pays that cost once
+and keeps the results warm in memory.
+
+- The alias tables in ``datalibrary`` are built once when the process starts.
+- ``file_classes`` remembers the class selectors found in each project file. A rebuild only re-reads the files
+  that changed.
+- ``decode_cache`` remembers the CSS generated for every class selector ever decoded, including the selectors that
+  turned out to be invalid. A rebuild only decodes the selectors it has never seen.
+
+**Endpoints:**
+
+- ``POST /rebuild`` -- JSON body ``{"files": [<path>, ...]}``. Re-extracts the listed files, drops the files that
+  no longer exist, and rewrites the output files if the set of class selectors changed. Omit ``files`` to rescan the
+  whole ``project_directory``. Files outside ``project_directory`` are rejected.
+- ``POST /css`` -- JSON body ``{"classes": [<class>, ...]}``. Returns the CSS for exactly these class selectors.
+  Nothing is written.
+- A malformed body returns ``400``. A failed rebuild returns ``500``. Both carry a JSON ``{"error": <message>}``.
+- POST requests must be sent as ``Content-Type: application/json``, else ``415``. A request whose ``Origin`` is not
+  the daemon itself returns ``403``. Together they stop web pages from posting to the daemon across origins.
+- ``GET /blowdry.css`` and ``GET /blowdry.min.css`` -- The current output files. Each response carries an ``ETag``.
+  ``If-None-Match`` with the current ``ETag`` returns ``304 Not Modified``.
+- ``GET /status`` -- JSON summary of the warm state.
+
+**Usage Case:**
+
+Run the daemon from the directory containing ``blowdrycss_settings.py``. ::
+
+    $ blowdrycss-daemon
+    $ curl -X POST -d '{"files": ["/project/index.html"]}' http://127.0.0.1:35731/rebuild
+
+>>> from blowdrycss.daemon import BlowdryDaemon, DaemonServer
+>>> blowdry_daemon = BlowdryDaemon()
+>>> blowdry_daemon.rebuild()            # Full scan.
+>>> server = DaemonServer(blowdry_daemon=blowdry_daemon, host='127.0.0.1', port=35731)
+>>> server.start()
+
+"""
+# python 2
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import bytes, str
+
+# builtins
+from hashlib import sha1
+from json import dumps, loads
+from os import path
+from threading import Thread, Lock
+import logging
+
+# custom
+from blowdrycss import blowdry
+from blowdrycss.classparser import ClassExtractor
+from blowdrycss.filehandler import FileFinder, FileManifest, CSSFile, split_css
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class BlowdryDaemon(object):
+    """ Warm, in-memory blowdrycss state shared by every request the daemon serves.
+
+    | **Members:**
+
+    | **file_classes** (*dict*) -- Maps each parsed file path to the set of class selectors it contains.
+
+    | **decode_cache** (*dict*) -- Maps each class selector ever decoded to its CSS text (*bytes*).
+      Invalid class selectors map to ``None``.
+
+    | **class_set** (*set*) -- Valid class selectors currently written to the output files.
+
+    | **css_text** (*bytes*) -- CSS text currently written to the output files.
+
+    | **output** (*dict*) -- Maps each output file name e.g. ``blowdry.css`` to a tuple ``(content, etag)``.
+
+    :return: None
+
+    """
+    def __init__(self):
+        self.file_classes = {}
+        self.decode_cache = {}
+        self.class_set = set()
+        self.css_text = b''
+        self.output = {}
+        self.lock = Lock()
+
+    def decode(self, class_set=set()):
+        """ Look up the CSS of each class selector. Only the selectors missing from ``decode_cache`` are decoded.
+
+        The missing selectors are decoded in one ``build_css()`` call. Its CSS is then split per selector, so that
+        each selector can be cached and reused independently of the other selectors.
+
+        :type class_set: set
+        :param class_set: The class selectors to decode.
+
+        :return: (*tuple*) -- Returns ``(valid_class_set, css_text)``. Rules appear in sorted selector order, so
+          the same set always produces the same ``css_text``.
+
+        """
+        missing_class_set = class_set.difference(self.decode_cache)
+        if missing_class_set:
+            valid_class_set, css_text = blowdry.build_css(class_set=missing_class_set, verbose=False)
+            pieces = split_css(css_text=css_text)
+            for css_class in missing_class_set:
+                lower_class = css_class.lower()                                     # The builders lower the case.
+                self.decode_cache[css_class] = pieces.get(lower_class, b'') if lower_class in valid_class_set else None
+
+        valid_classes = sorted(css_class for css_class in class_set if self.decode_cache[css_class] is not None)
+        css_text = b'\n'.join(self.decode_cache[css_class] for css_class in valid_classes)
+        return set(valid_classes), bytes(css_text)
+
+    def extract(self, file_path=''):
+        """ Re-read ``file_path`` into ``file_classes``. Drop it if it no longer exists or is not a parsable
+        ``settings.file_types`` file.
+
+        :type file_path: str
+        :param file_path: Path of a project file.
+
+        :return: None
+
+        """
+        if path.isfile(file_path) and FileManifest.is_file_type(path.basename(file_path)):
+            self.file_classes[file_path] = ClassExtractor(file_path=file_path).class_set
+        else:
+            self.file_classes.pop(file_path, None)
+
+    def rebuild(self, files=None):
+        """ Update the per-file class state, then rewrite the output files if the set of valid class selectors
+        changed.
+
+        :type files: list
+        :param files: Paths of the files that changed. ``None`` rescans every file in ``project_directory``.
+
+        :raises ValueError: If a path in ``files`` is outside ``settings.project_directory``. Nothing is read.
+
+        :return: (*dict*) -- Returns a summary with the ``added`` and ``removed`` class selectors, the total
+          number of ``classes`` and whether the output was ``written``.
+
+        """
+        with self.lock:
+            if files is None:
+                self.file_classes = {}
+                files = FileFinder(recent=False).files
+            else:
+                project_directory = path.join(path.realpath(settings.project_directory), '')
+                for file_path in files:
+                    if not path.realpath(file_path).startswith(project_directory):
+                        raise ValueError(str(file_path) + ' is outside project_directory.')
+            for file_path in files:
+                self.extract(file_path=path.abspath(file_path))
+
+            class_set = set()
+            for file_class_set in self.file_classes.values():
+                class_set.update(file_class_set)
+            valid_class_set, css_text = self.decode(class_set=class_set)
+
+            added = sorted(valid_class_set.difference(self.class_set))
+            removed = sorted(self.class_set.difference(valid_class_set))
+            written = css_text != self.css_text or not self.output
+            if written:
+                self.class_set, self.css_text = valid_class_set, css_text
+                self.write()
+
+            logging.info('daemon rebuild: %d added, %d removed, %d total', len(added), len(removed), len(class_set))
+            return {'added': added, 'removed': removed, 'classes': len(self.class_set), 'written': written}
+
+    def write(self):
+        """ Write the output files enabled in the settings, and remember their content and ``ETag``.
+
+        :return: None
+
+        """
+        self.output = {}
+        css_file = CSSFile()
+        file_name = css_file.file_name + css_file.extension
+        if settings.human_readable:
+            css_file.write(css_text=self.css_text)
+            self.remember(file_name=file_name, file_directory=css_file.file_directory)
+        if settings.minify:
+            css_file.minify(css_text=self.css_text)
+            self.remember(file_name=css_file.file_name + '.min' + css_file.extension,
+                          file_directory=css_file.file_directory)
+
+    def remember(self, file_name='', file_directory=''):
+        """ Keep the content of an output file that was just written, along with its ``ETag``.
+
+        :type file_name: str
+        :param file_name: Output file name e.g. ``blowdry.css``.
+
+        :type file_directory: str
+        :param file_directory: Directory the file was written to.
+
+        :return: None
+
+        """
+        with open(path.join(file_directory, file_name), 'rb') as css_file:
+            content = css_file.read()
+        self.output[file_name] = (content, '"' + sha1(content).hexdigest() + '"')
+
+    def css_for_classes(self, classes=()):
+        """ Return the CSS for exactly ``classes`` without touching the output files.
+
+        :type classes: list
+        :param classes: Class selectors.
+
+        :return: (*dict*) -- Returns the ``css`` text along with the ``valid`` and ``invalid`` class selectors.
+
+        """
+        with self.lock:
+            class_set = set(classes)
+            valid_class_set, css_text = self.decode(class_set=class_set)
+        return {
+            'css': css_text.decode('utf-8'),
+            'valid': sorted(valid_class_set),
+            'invalid': sorted(class_set.difference(valid_class_set)),
+        }
+
+    def status(self):
+        """ :return: (*dict*) -- Returns the size of the warm state and the current ``ETag`` of each output file. """
+        with self.lock:
+            return {
+                'files': len(self.file_classes),
+                'classes': len(self.class_set),
+                'decoded': len(self.decode_cache),
+                'output': dict((file_name, etag) for file_name, (content, etag) in self.output.items()),
+            }
+
+
+class DaemonServer(object):
+    """ A threaded HTTP server exposing a ``BlowdryDaemon`` through the JSON API described above.
+
+    | **Parameters:**
+
+    | **blowdry_daemon** (*BlowdryDaemon*) -- The warm state to serve.
+
+    | **host** (*str*) -- Interface to bind. Use ``127.0.0.1`` to stay local.
+
+    | **port** (*int*) -- Port to bind. ``0`` picks a free port.
+
+    :return: None
+
+    """
+    def __init__(self, blowdry_daemon=None, host='127.0.0.1', port=35731):
+        try:                                        # Python 3
+            from http.server import HTTPServer
+            from socketserver import ThreadingMixIn
+        except ImportError:                         # Python 2.7
+            from BaseHTTPServer import HTTPServer
+            from SocketServer import ThreadingMixIn
+
+        class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        self.blowdry_daemon = blowdry_daemon
+        self.httpd = ThreadingHTTPServer((host, port), self.build_handler())
+        self.host, self.port = self.httpd.server_address[:2]
+        self.thread = Thread(target=self.httpd.serve_forever)
+        self.thread.daemon = True
+
+    def build_handler(self):
+        """ Build the request handler class bound to this server.
+
+        :return: (*class*) -- Returns a ``BaseHTTPRequestHandler`` subclass.
+
+        """
+        try:                                        # Python 3
+            from http.server import BaseHTTPRequestHandler
+        except ImportError:                         # Python 2.7
+            from BaseHTTPServer import BaseHTTPRequestHandler
+
+        blowdry_daemon = self.blowdry_daemon
+        server = self
+
+        class DaemonRequestHandler(BaseHTTPRequestHandler):
+            def send_body(self, status=200, body=b'', content_type='application/json', etag=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                if etag is not None:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_json(self, data, status=200):
+                self.send_body(status=status, body=dumps(data, sort_keys=True).encode('utf-8'))
+
+            def do_GET(self):
+                resource = self.path.split('?')[0].lstrip('/')
+                if resource == 'status':
+                    self.send_json(blowdry_daemon.status())
+                elif resource in blowdry_daemon.output:
+                    content, etag = blowdry_daemon.output[resource]
+                    if self.headers.get('If-None-Match') == etag:
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.end_headers()
+                    else:
+                        self.send_body(body=content, content_type='text/css', etag=etag)
+                else:
+                    self.send_json({'error': 'not found'}, status=404)
+
+            def do_POST(self):
+                resource = self.path.split('?')[0].lstrip('/')
+                origin = self.headers.get('Origin')
+                if origin is not None and origin not in (
+                        'http://' + host + ':' + str(server.port) for host in ('127.0.0.1', 'localhost', server.host)):
+                    self.send_json({'error': 'foreign origin'}, status=403)
+                    return
+                content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+                if content_type != 'application/json':
+                    self.send_json({'error': 'Content-Type must be application/json.'}, status=415)
+                    return
+
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    request = loads(self.rfile.read(length).decode('utf-8') or '{}')
+                    if not isinstance(request, dict):
+                        raise ValueError('The request body must be a JSON object.')
+                    for key in ('files', 'classes'):
+                        if request.get(key) is not None and not isinstance(request[key], list):
+                            raise ValueError('"' + key + '" must be a JSON list.')
+                except ValueError as error:
+                    self.send_json({'error': str(error)}, status=400)
+                    return
+
+                try:
+                    if resource == 'rebuild':
+                        self.send_json(blowdry_daemon.rebuild(files=request.get('files')))
+                    elif resource == 'css':
+                        self.send_json(blowdry_daemon.css_for_classes(classes=request.get('classes') or []))
+                    else:
+                        self.send_json({'error': 'not found'}, status=404)
+                except ValueError as error:
+                    self.send_json({'error': str(error)}, status=400)
+                except Exception as error:
+                    logging.exception('daemon: POST /' + resource + ' failed.')
+                    self.send_json({'error': str(error)}, status=500)
+
+            def log_message(self, format, *args):
+                logging.debug('daemon: ' + format, *args)
+
+        return DaemonRequestHandler
+
+    def start(self):
+        """ Serve in a background daemon thread.
+
+        :return: None
+
+        """
+        self.thread.start()
+
+    def stop(self):
+        """ Shut the server down.
+
+        :return: None
+
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    """ Build the warm state with a full scan, then serve the API on ``settings.daemon_host:settings.daemon_port``
+    until Ctrl + C is pressed.
+
+    :return: None
+
+    """
+    blowdry.boilerplate()
+    blowdry_daemon = BlowdryDaemon()
+    blowdry_daemon.rebuild()
+    server = DaemonServer(blowdry_daemon=blowdry_daemon, host=settings.daemon_host, port=settings.daemon_port)
+    print('blowdrycss daemon listening on http://' + str(server.host) + ':' + str(server.port))
+    print('Pressing Ctrl + C stops the process.')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,18 @@ from __future__ import absolute_import, unicode_literals
 from builtins import str
 # builtins
 from collections import OrderedDict
-from copy import deepcopy
+from hashlib import sha1
+from glob import glob
+from os import makedirs, path, remove
+from tempfile import NamedTemporaryFile
 import logging
-# plugins
-from pypandoc import convert
+import pickle
+
+try:                                                # Python 3
+    from os import replace
+except ImportError:                                 # Python 2.7 (rename is atomic on POSIX)
+    from os import rename as replace
+
 # custom
 import blowdrycss_settings as settings
 
@@ -112,6 +120,9 @@ class DataLibrary(object):
         - The ``key`` is the official CSS property name.
         - The ``value`` is a ``set()`` of custom string aliases.
 
+    The following six documentation tables are properties. Each is generated the first time it is read, and then
+    kept in ``docs``. Building a ``DataLibrary`` renders none of them, and only the reStructuredText tables run pandoc.
+
     | **clashing_alias_markdown** (*str*) -- Auto-generated table of clashing aliases in markdown format.
 
     | **property_alias_markdown** (*str*) -- Auto-generated table of property names and aliases in markdown format.
@@ -135,6 +146,13 @@ class DataLibrary(object):
         - The ``key`` is the official CSS property name.
         - The ``value`` is a ``set()`` of custom string aliases.
 
+    **Alias Table Cache:**
+
+    If ``settings.alias_cache_enabled == True``, the tables listed in ``cached_tables`` are loaded from a pickle file
+    in ``settings.alias_cache_directory`` instead of being rebuilt. On a cache miss they are built as usual and the
+    file is written for the next process. See ``alias_cache_path()`` for the cache key. ``alias_cache_hit`` is True if
+    the tables were loaded from the cache file.
+
     """
     def __init__(self):
         self.property_regex_dict = {
@@ -255,59 +273,213 @@ class DataLibrary(object):
         self.clashing_alias_dict = {}
         self.property_alias_dict = {}
 
-        # Set clashing_alias_dict and property_alias_dict.
-        self.autogen_property_alias_dict()  # Initialize property_alias_dict
-        self.merge_dictionaries()           # Merge
-        self.set_clashing_aliases()         # Set clashing_aliases_dict
-        self.remove_clashing_aliases()      # Clean property_alias_dict by removing clashing aliases.
-
-        # Alphabetical Property Dictionaries
-        self.alphabetical_clashing_dict = OrderedDict(sorted(self.clashing_alias_dict.items(), key=lambda t: t[0]))
-        self.alphabetical_property_dict = OrderedDict(sorted(self.property_alias_dict.items(), key=lambda t: t[0]))
-
-        # Generate Markdown Files
-        self.clashing_alias_markdown = self.dict_to_markdown(
-            h1_text=str('Clashing Aliases'),
-            key_title=str('Property Name'),
-            value_title=str('Invalid Clashing Aliases'),
-            _dict=self.alphabetical_clashing_dict
-        )
-        self.property_alias_markdown = self.dict_to_markdown(
-            h1_text=str('Valid Property Aliases'),
-            key_title=str('Property Name'),
-            value_title=str('Valid Aliases'),
-            _dict=self.alphabetical_property_dict
-        )
+        self.alias_cache_hit = settings.alias_cache_enabled and self.load_alias_tables()
+        if not self.alias_cache_hit:
+            # Set clashing_alias_dict and property_alias_dict.
+            self.autogen_property_alias_dict()  # Initialize property_alias_dict
+            self.merge_dictionaries()           # Merge
+            self.set_clashing_aliases()         # Set clashing_aliases_dict
+            self.remove_clashing_aliases()      # Clean property_alias_dict by removing clashing aliases.
 
-        # Generate HTML Files
-        self.clashing_alias_html = self.dict_to_html(
-            h1_text=str('Invalid Clashing Aliases'),
-            key_title=str('Property Name'),
-            value_title=str('Clashing Aliases'),
-            _dict=self.alphabetical_clashing_dict
-        )
-        self.property_alias_html = self.dict_to_html(
-            h1_text=str('Valid Property Aliases'),
-            key_title=str('Property Name'),
-            value_title=str('Valid Aliases'),
-            _dict=self.alphabetical_property_dict
-        )
+            # Alphabetical Property Dictionaries
+            self.alphabetical_clashing_dict = OrderedDict(sorted(self.clashing_alias_dict.items(), key=lambda t: t[0]))
+            self.alphabetical_property_dict = OrderedDict(sorted(self.property_alias_dict.items(), key=lambda t: t[0]))
+
+            self.ordered_property_dict = OrderedDict(
+                sorted(self.property_alias_dict.items(), key=lambda t: len(t[0]), reverse=True)
+            )
+
+            if settings.alias_cache_enabled:
+                self.save_alias_tables()
 
-        # Generate reStructuredText
-        clashing_html = self.clashing_alias_html.replace('&emsp;', '   ')                   # Remove 'tab'
-        property_html = self.property_alias_html.replace('&emsp;', '   ')                   # Remove 'tab'
-        self.clashing_alias_rst = convert(source=clashing_html, to=str('rst'), format=str('html'))
-        self.property_alias_rst = convert(source=property_html, to=str('rst'), format=str('html'))
+        self.docs = {}                      # Lazy documentation tables. See ``alias_docs()``.
 
         # Debug
-        logging.debug('\nproperty_alias_dict:\n' + str(self.property_alias_dict))
-        logging.debug('\nclashing_alias_markdown:\n' + str(self.clashing_alias_markdown))
-        logging.debug('\nclashing_alias_html:\n' + str(self.clashing_alias_html))
-        logging.debug('\nproperty_alias_markdown:\n' + str(self.property_alias_markdown))
+        logging.debug('\nproperty_alias_dict:\n%s', self.property_alias_dict)
 
-        self.ordered_property_dict = OrderedDict(
-            sorted(self.property_alias_dict.items(), key=lambda t: len(t[0]), reverse=True)
-        )
+    cached_tables = (
+        'property_alias_dict', 'clashing_alias_dict', 'alphabetical_clashing_dict', 'alphabetical_property_dict',
+        'ordered_property_dict',
+    )
+
+    @staticmethod
+    def code_version():
+        """ Identify the code that builds and renders the alias tables.
+
+        The blowdrycss version is read from ``version.py`` in a source checkout e.g. a tox ``setup.py test`` run,
+        else from the installed package metadata.
+
+        :return: (*tuple*) -- Returns ``(blowdrycss_version, cssutils_version, source_hash)`` where ``source_hash``
+          is the SHA-1 of this module's source. The property tables are derived from cssutils.
+
+        """
+        import cssutils                                                         # Deferred. Only a cache key needs it.
+
+        def installed_version(name):
+            try:                                                                # Python 3.8+
+                from importlib.metadata import version as metadata_version
+                return metadata_version(name)
+            except Exception:                                                   # Not installed or Python 2.7
+                return 'unknown'
+
+        cssutils_version = getattr(cssutils, 'VERSION', None) or installed_version('cssutils')    # VERSION < 2.0
+
+        version = {}
+        version_path = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'version.py')
+        try:
+            with open(version_path, 'rb') as version_file:
+                exec(version_file.read(), version)
+        except IOError:
+            pass
+        if version.get('__project__') == 'blowdrycss':                         # Not another project's version.py.
+            blowdrycss_version = version['__version__']
+        else:
+            blowdrycss_version = installed_version('blowdrycss')
+
+        with open(path.splitext(__file__)[0] + '.py', 'rb') as source_file:     # Same key for .py and .pyc.
+            source_hash = sha1(source_file.read()).hexdigest()
+        return str(blowdrycss_version), str(cssutils_version), source_hash
+
+    def alias_cache_path(self):
+        """ Build the path of the alias table cache file for the current code and ``custom_property_alias_dict``.
+
+        The file name contains a key derived from the blowdrycss version, the cssutils version, the source of this
+        module, and a canonical hash of ``custom_property_alias_dict``. Changing any one of them selects a different
+        file, so a stale table is never loaded.
+
+        :return: (*str*) -- Returns the absolute path of the cache file.
+
+        """
+        blowdrycss_version, cssutils_version, source_hash = self.code_version()
+
+        custom_items = sorted((key, sorted(value)) for key, value in self.custom_property_alias_dict.items())
+        custom_hash = sha1(repr(custom_items).encode('utf-8')).hexdigest()
+
+        key = sha1((blowdrycss_version + cssutils_version + source_hash + custom_hash).encode('utf-8')).hexdigest()[:16]
+        file_name = 'alias_tables-' + blowdrycss_version + '-' + key + '.pickle'
+        return path.join(settings.alias_cache_directory, file_name)
+
+    def alias_fingerprint(self):
+        """ Fingerprint everything the documentation tables are rendered from: the final ``clashing_alias_dict``,
+        the final ``property_alias_dict``, and the rendering code itself.
+
+        :return: (*str*) -- Returns a SHA-1 hex digest. Equal fingerprints produce identical documentation.
+
+        """
+        tables = [
+            sorted((key, sorted(value)) for key, value in alias_dict.items())
+            for alias_dict in (self.clashing_alias_dict, self.property_alias_dict)
+        ]
+        return sha1((''.join(self.code_version()) + repr(tables)).encode('utf-8')).hexdigest()
+
+    def load_alias_tables(self):
+        """ Load the finished alias tables from the cache file if one exists for the current key.
+
+        :return: (*bool*) -- Returns True if every table in ``cached_tables`` was loaded.
+
+        """
+        cache_path = self.alias_cache_path()
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                tables = pickle.load(cache_file)
+            for name in self.cached_tables:
+                setattr(self, name, tables[name])
+        except Exception as error:                                              # Missing, corrupt, or incompatible.
+            logging.debug('Alias table cache not loaded %s: %s', cache_path, error)
+            return False
+        logging.debug('Alias tables loaded from %s', cache_path)
+        return True
+
+    def save_alias_tables(self):
+        """ Atomically write the finished alias tables to the cache file, and delete the cache files of other keys
+        i.e. of older code or an older ``custom_property_alias_dict``. A failure to write is logged and ignored since
+        the cache is only an optimization.
+
+        :return: None
+
+        """
+        cache_path = self.alias_cache_path()
+        tables = dict((name, getattr(self, name)) for name in self.cached_tables)
+        try:
+            if not path.isdir(settings.alias_cache_directory):
+                makedirs(settings.alias_cache_directory)
+            temporary_file = NamedTemporaryFile(dir=settings.alias_cache_directory, delete=False)
+            with temporary_file:
+                pickle.dump(tables, temporary_file, protocol=2)                 # Protocol 2 is readable by Python 2.7
+            replace(temporary_file.name, cache_path)
+        except (IOError, OSError) as error:
+            logging.warning('Alias table cache not written %s: %s', cache_path, error)
+            return
+        logging.debug('Alias tables cached in %s', cache_path)
+
+        for stale_path in glob(path.join(settings.alias_cache_directory, 'alias_tables-*.pickle')):
+            if stale_path != cache_path:
+                try:
+                    remove(stale_path)
+                except OSError:                                                 # Removed by another process.
+                    pass
+
+    def alias_docs(self, doc_format='markdown'):
+        """ Render the clashing alias and property alias tables in ``doc_format`` on first use, then reuse them.
+
+        :type doc_format: str
+        :param doc_format: One of ``'markdown'``, ``'html'``, or ``'rst'``.
+
+        :return: (*tuple*) -- Returns ``(clashing_alias_table, property_alias_table)`` as strings.
+
+        """
+        if doc_format not in self.docs:
+            if doc_format == 'rst':
+                from pypandoc import convert                                        # Spawns pandoc. Only load here.
+                clashing_html, property_html = self.alias_docs(doc_format='html')
+                clashing_html = clashing_html.replace('&emsp;', '   ')                  # Remove 'tab'
+                property_html = property_html.replace('&emsp;', '   ')                  # Remove 'tab'
+                self.docs[doc_format] = (
+                    convert(source=clashing_html, to=str('rst'), format=str('html')),
+                    convert(source=property_html, to=str('rst'), format=str('html')),
+                )
+            else:
+                to_table = {'markdown': self.dict_to_markdown, 'html': self.dict_to_html}[doc_format]
+                self.docs[doc_format] = (
+                    to_table(
+                        h1_text=str('Clashing Aliases' if doc_format == 'markdown' else 'Invalid Clashing Aliases'),
+                        key_title=str('Property Name'),
+                        value_title=str('Invalid Clashing Aliases' if doc_format == 'markdown' else 'Clashing Aliases'),
+                        _dict=self.alphabetical_clashing_dict
+                    ),
+                    to_table(
+                        h1_text=str('Valid Property Aliases'),
+                        key_title=str('Property Name'),
+                        value_title=str('Valid Aliases'),
+                        _dict=self.alphabetical_property_dict
+                    ),
+                )
+            logging.debug('\n%s alias tables generated.', doc_format)
+        return self.docs[doc_format]
+
+    @property
+    def clashing_alias_markdown(self):
+        return self.alias_docs(doc_format='markdown')[0]
+
+    @property
+    def property_alias_markdown(self):
+        return self.alias_docs(doc_format='markdown')[1]
+
+    @property
+    def clashing_alias_html(self):
+        return self.alias_docs(doc_format='html')[0]
+
+    @property
+    def property_alias_html(self):
+        return self.alias_docs(doc_format='html')[1]
+
+    @property
+    def clashing_alias_rst(self):
+        return self.alias_docs(doc_format='rst')[0]
+
+    @property
+    def property_alias_rst(self):
+        return self.alias_docs(doc_format='rst')[1]
 
     @staticmethod
     def get_property_aliases(property_name=''):
@@ -409,35 +581,33 @@ class DataLibrary(object):
 
     def set_clashing_aliases(self):
         """ Searches ``property_alias_dict`` for duplicate / clashing aliases and adds them to ``clashing_alias_dict``.
+
+        A single pass builds an inverted index that maps each alias to the set of property names using it. Every
+        alias used by more than one property clashes for each of those properties.
+
         """
-        clone_dict = self.property_alias_dict
+        alias_index = {}
+        for property_name, alias_set in self.property_alias_dict.items():
+            for alias in alias_set:
+                alias_index.setdefault(alias, set()).add(property_name)
+
         self.clashing_alias_dict = {}
-        for key1, alias_set1 in self.property_alias_dict.items():
-            for key2, alias_set2 in clone_dict.items():
-                intersection = alias_set1.intersection(alias_set2)
-                if len(intersection) > 0 and key1 != key2:                  # prevent direct comparison of the same key.
-                    try:
-                        self.clashing_alias_dict[key1] = self.clashing_alias_dict[key1].union(intersection)
-                    except KeyError:
-                        self.clashing_alias_dict[key1] = intersection
-        logging.debug(msg='\ndatalibrary.clashing_aliases_dict:\n' + str(self.clashing_alias_dict))
+        for alias, property_names in alias_index.items():
+            if len(property_names) > 1:
+                for property_name in property_names:
+                    self.clashing_alias_dict.setdefault(property_name, set()).add(alias)
+        logging.debug('\ndatalibrary.clashing_aliases_dict:\n%s', self.clashing_alias_dict)
 
     def remove_clashing_aliases(self):
-        """ Removes clashing aliases stored in ``clashing_alias_dict`` from ``property_alias_dict`` and
-        deep copies the clean dictionary to ``property_alias_dict``.
+        """ Removes clashing aliases stored in ``clashing_alias_dict`` from ``property_alias_dict``. Each property
+        receives a new alias set, so the result shares no sets with the previous ``property_alias_dict``.
 
         """
-        clean_dict = deepcopy(self.property_alias_dict)
-        for property_name in self.property_alias_dict:
-            try:
-                clashing_aliases = self.clashing_alias_dict[property_name]
-                for clashing_alias in clashing_aliases:
-                    if clashing_alias in self.property_alias_dict[property_name]:    # If clashing_alias found.
-                        clean_dict[property_name].remove(clashing_alias)             # Remove it.
-            except KeyError:
-                pass
-        logging.debug(msg='Clashing aliases removed: datalibrary clean_dict\n' + str(clean_dict))
-        self.property_alias_dict = deepcopy(clean_dict)
+        clean_dict = {}
+        for property_name, alias_set in self.property_alias_dict.items():
+            clean_dict[property_name] = alias_set.difference(self.clashing_alias_dict.get(property_name, ()))
+        logging.debug('Clashing aliases removed: datalibrary clean_dict\n%s', clean_dict)
+        self.property_alias_dict = clean_dict
 
     @staticmethod
     def dict_to_markdown(h1_text='', key_title='', value_title='', _dict=None):
@@ -579,6 +749,7 @@ __data_library = DataLibrary()
 property_regex_dict = __data_library.property_regex_dict
 property_alias_dict = __data_library.property_alias_dict
 ordered_property_dict = __data_library.ordered_property_dict
+alias_cache_hit = __data_library.alias_cache_hit
 
 # Pseudo Sets - reference: http://www.w3schools.com/css/css_pseudo_classes.asp
 
@@ -593,15 +764,27 @@ pseudo_classes = {
 }
 pseudo_elements = {'after', 'before', 'first-letter', 'first-line', 'selection', }
 
-# Markdown
-clashing_alias_markdown = __data_library.clashing_alias_markdown
-property_alias_markdown = __data_library.property_alias_markdown
+# Documentation tables are generated on demand. Use alias_docs('markdown'), alias_docs('html'), or alias_docs('rst').
+alias_docs = __data_library.alias_docs
+alias_fingerprint = __data_library.alias_fingerprint
+
+# The former module level documentation tables. Rendered on first access.
+doc_table_names = (
+    'clashing_alias_markdown', 'property_alias_markdown', 'clashing_alias_html', 'property_alias_html',
+    'clashing_alias_rst', 'property_alias_rst',
+)
 
-# HTML
-clashing_alias_html = __data_library.clashing_alias_html
-property_alias_html = __data_library.property_alias_html
 
-# reStructuredTest
-clashing_alias_rst = __data_library.clashing_alias_rst
-property_alias_rst = __data_library.property_alias_rst
+def __getattr__(name):
+    """ Keep ``datalibrary.clashing_alias_markdown`` and the other names in ``doc_table_names`` importable. The table
+    is rendered by ``alias_docs()`` the first time it is accessed. Module level ``__getattr__`` requires Python 3.7+.
+    Older versions must call ``alias_docs()``.
 
+    :raises AttributeError: If ``name`` is not defined in this module.
+
+    :return: (*str*) -- Returns the documentation table called ``name``.
+
+    """
+    if name in doc_table_names:
+        return getattr(__data_library, name)
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
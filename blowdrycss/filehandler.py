@@ -4,20 +4,131 @@ from builtins import str
 from io import open
 
 # builtins
-from os import path, walk, getcwd
+from os import path, walk, getcwd, stat
 from glob import glob
+from hashlib import sha1
+from json import dumps, loads
+from re import findall
+from tempfile import NamedTemporaryFile
+from threading import Lock
 import logging
 
-# plugins
-from cssutils import parseString, ser
+try:                                                # Python 3.5+
+    from os import scandir
+except ImportError:                                 # Python 2.7 falls back to os.walk().
+    scandir = None
+
+try:                                                # Python 3
+    from os import replace
+except ImportError:                                 # Python 2.7 (rename is atomic on POSIX)
+    from os import rename as replace
 
 # custom
+from blowdrycss.config import Config
 from blowdrycss.utilities import get_file_path, make_directory
+from blowdrycss.tracing import tracer
+from blowdrycss import livereload
 import blowdrycss_settings as settings
 
 __author__ = 'chad nelson'
 __project__ = 'blowdrycss'
 
+# ``cssutils.ser.prefs`` is global. Serializations hold this lock so concurrent builds cannot switch it midway.
+serializer_lock = Lock()
+
+
+def serialize_css(css_text=b'', minified=False):
+    """ Serialize ``css_text`` with cssutils in the human readable or the minified format.
+
+    :type css_text: bytes
+    :param css_text: Text containing the CSS rules.
+
+    :type minified: bool
+    :param minified: If True, use the cssutils minification preferences.
+
+    :return: (*str*) -- Returns the serialized CSS.
+
+    """
+    from cssutils import parseString, ser                          # Deferred. Only serialization needs cssutils.
+    with serializer_lock:
+        parse_string = parseString(css_text)
+        if minified:
+            ser.prefs.useMinified()                                 # Enable minification.
+        else:
+            ser.prefs.useDefaults()                                 # Enables Default / Verbose Mode
+        try:
+            return parse_string.cssText.decode('utf-8')
+        finally:
+            ser.prefs.useDefaults()                                 # Disable minification.
+
+
+def canonical_css(css_text=b''):
+    """ Reduce CSS text to a form that does not depend on formatting or rule order. The rules of an output file are
+    emitted in arbitrary order, so two builds of the same classes are rarely byte identical.
+
+    Each top level rule is serialized in the minified format, and the inner rules of each media rule are sorted.
+    The digest covers the sorted rules.
+
+    :type css_text: bytes
+    :param css_text: Human readable or minified CSS.
+
+    :return: (*tuple*) -- Returns ``(digest, class_set)`` where ``digest`` is the SHA-1 hex digest of the sorted
+      rules, and ``class_set`` holds the class selectors that the rules define.
+
+    """
+    from cssutils import parseString, ser                          # Deferred. Only serialization needs cssutils.
+    rules = []
+    selectors = []
+    with serializer_lock:
+        stylesheet = parseString(css_text)
+        ser.prefs.useMinified()
+        try:
+            for rule in stylesheet.cssRules:
+                if rule.type == rule.MEDIA_RULE:
+                    inner_rules = sorted(inner_rule.cssText for inner_rule in rule.cssRules)
+                    rules.append('@media ' + rule.media.mediaText + '{' + ''.join(inner_rules) + '}')
+                    selectors += [getattr(inner_rule, 'selectorText', '') for inner_rule in rule.cssRules]
+                else:
+                    rules.append(rule.cssText)
+                    selectors.append(getattr(rule, 'selectorText', ''))
+        finally:
+            ser.prefs.useDefaults()
+
+    digest = sha1('\n'.join(sorted(rules)).encode('utf-8')).hexdigest()
+    return digest, set(findall(r'\.([-\w]+)', ' '.join(selectors)))
+
+
+def split_css(css_text=b''):
+    """ Split the CSS of many class selectors into the CSS of each class selector. Media rules are split too, so
+    each piece only holds the inner rules of its own class selector.
+
+    Lets a build of many classes fill a per-class cache, while each piece can still be reused on its own.
+
+    :type css_text: bytes
+    :param css_text: CSS built by ``blowdry.build_css()``.
+
+    :return: (*dict*) -- Maps each class selector to the CSS text (*bytes*) of the rules that define it.
+
+    """
+    from cssutils import parseString                               # Deferred. Only serialization needs cssutils.
+    pieces = {}
+
+    def add(css_class, rule_text):
+        pieces.setdefault(css_class, []).append(rule_text)
+
+    with serializer_lock:
+        stylesheet = parseString(css_text)
+        for rule in stylesheet.cssRules:
+            if rule.type == rule.MEDIA_RULE:
+                for inner_rule in rule.cssRules:
+                    for css_class in set(findall(r'\.([-\w]+)', getattr(inner_rule, 'selectorText', ''))):
+                        add(css_class, '@media ' + rule.media.mediaText + ' {\n' + inner_rule.cssText + '\n}')
+            else:
+                for css_class in set(findall(r'\.([-\w]+)', getattr(rule, 'selectorText', ''))):
+                    add(css_class, rule.cssText)
+
+    return dict((css_class, '\n'.join(rule_texts).encode('utf-8')) for css_class, rule_texts in pieces.items())
+
 
 class FileFinder(object):
     """
@@ -29,6 +140,11 @@ class FileFinder(object):
     | **recent** (*str*) -- Flag that indicates whether to gather the most recently modified files (True Case)
       or all eligible files (False Case).
 
+    | **since** (*float*) -- Optional epoch time. In the recent case, gather files modified at or after ``since``
+      instead of files newer than blowdry.css.
+
+    | **config** (*Config*) -- Optional. Provides ``file_types``. Defaults to ``Config.from_settings()``.
+
     | **Members:**
 
     | **project_directory** (*str*) -- Set to settings.project_directory.
@@ -44,10 +160,12 @@ class FileFinder(object):
     >>> files = file_finder.files
 
     """
-    def __init__(self, recent=True):
+    def __init__(self, recent=True, since=None, config=None):
         self.project_directory = settings.project_directory
+        self.config = Config.from_settings() if config is None else config
         if path.isdir(self.project_directory):
             self.recent = recent
+            self.since = since
 
             self.files = []
             self.set_files()
@@ -58,8 +176,8 @@ class FileFinder(object):
             else:
                 self.set_file_dict()
 
-            logging.debug(msg='File Types:' + ', '.join(settings.file_types))
-            logging.debug(msg='Project Directory:' + str(self.project_directory))
+            logging.debug('File Types:%s', ', '.join(self.config.file_types))
+            logging.debug('Project Directory:%s', self.project_directory)
             logging.debug('\nProject Files Found:')
             self.print_collection(self.files)
         else:
@@ -79,6 +197,8 @@ class FileFinder(object):
         :return: None
 
         """
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):        # Skip the loop entirely.
+            return
         for item in collection:
             logging.debug(str(item))        # Python 2 requires str().
         logging.debug(' ')                  # Add a blank line
@@ -96,7 +216,7 @@ class FileFinder(object):
 
         """
         for directory, _, _ in walk(self.project_directory):
-            for file_type in settings.file_types:
+            for file_type in self.config.file_types:
                 self.files.extend(glob(path.join(directory, file_type)))
 
     def set_file_dict(self):
@@ -111,14 +231,16 @@ class FileFinder(object):
                 '.file_type': {'filepath_1.file_type', 'filepath_2.file_type', ..., 'filepath_n.file_type'},
             }
 
-        Automatically removes the * wildcard from ``file_type``.
+        The keys come from ``config.file_extensions``, which have the * wildcard removed. Each file is visited once.
 
         :return: None
 
         """
-        for file_type in settings.file_types:
-            file_type = file_type.replace('*', '')  # Remove the * wildcard.
-            self.file_dict[file_type] = {_file for _file in self.files if path.splitext(_file)[1] == file_type}
+        self.file_dict = dict((file_extension, set()) for file_extension in self.config.file_extensions)
+        for _file in self.files:
+            file_extension = path.splitext(_file)[1]
+            if file_extension in self.file_dict:
+                self.file_dict[file_extension].add(_file)
 
     def set_recent_file_dict(self):
         """ Filter and organize recent files by type in ``file_dict``. Meaning only files that are newer than
@@ -133,17 +255,17 @@ class FileFinder(object):
                 '.file_type': {'filepath_1.file_type', 'filepath_2.file_type', ..., 'filepath_n.file_type'},
             }
 
-        Automatically removes the * wildcard from ``file_type``.
+        The keys come from ``config.file_extensions``, which have the * wildcard removed. Each file is visited once.
 
         :return: None
 
         """
-        comparator = FileModificationComparator()
-        for file_type in settings.file_types:
-            file_type = file_type.replace('*', '')  # Remove the * wildcard.
-            self.file_dict[file_type] = {
-                _file for _file in self.files if path.splitext(_file)[1] == file_type and comparator.is_newer(_file)
-            }
+        comparator = FileModificationComparator(reference_time=self.since)
+        self.file_dict = dict((file_extension, set()) for file_extension in self.config.file_extensions)
+        for _file in self.files:
+            file_extension = path.splitext(_file)[1]
+            if file_extension in self.file_dict and comparator.is_newer(_file):
+                self.file_dict[file_extension].add(_file)
 
 
 class FileConverter(object):
@@ -202,13 +324,12 @@ class CSSFile(object):
 
     | **Parameters:**
 
-    | **css_directory** (*str*) -- File directory where the .css and .min.css output files are stored.
-
-    | **Members:**
+    | **file_directory** (*str*) -- File directory where the .css and .min.css output files are stored.
+      Defaults to ``css_directory`` in blowdrycss_settings.py.
 
-    | **file_name** (*str*) -- Defined in blowdrycss_settings.py as ``output_file_name``. Default is 'blowdry'.
+    | **file_name** (*str*) -- Defaults to ``output_file_name`` in blowdrycss_settings.py i.e. 'blowdry'.
 
-    | **extension** (*str*) -- Defined in blowdrycss_settings.py as ``output_extension``. Default is '.css'.
+    | **extension** (*str*) -- Defaults to ``output_extension`` in blowdrycss_settings.py i.e. '.css'.
 
     | *Note:* The output file is named ``file_name + extension`` or ``file_name + .min + extension``.
       ex1: blowdry.css or blowdry.min.css
@@ -230,10 +351,10 @@ class CSSFile(object):
     >>> css_file.minify(css_text=css_text)
 
     """
-    def __init__(self):
-        self.file_directory = settings.css_directory
-        self.file_name = settings.output_file_name
-        self.extension = settings.output_extension
+    def __init__(self, file_directory=None, file_name=None, extension=None):
+        self.file_directory = settings.css_directory if file_directory is None else file_directory
+        self.file_name = settings.output_file_name if file_name is None else file_name
+        self.extension = settings.output_extension if extension is None else extension
         make_directory(self.file_directory)
 
     def write(self, css_text=''):
@@ -256,15 +377,15 @@ class CSSFile(object):
         >>> css_file.write(css_text=css_text)
 
         """
-        parse_string = parseString(css_text)
-        ser.prefs.useDefaults()                # Enables Default / Verbose Mode
         file_path = get_file_path(
             file_directory=self.file_directory,
             file_name=self.file_name,
             extension=self.extension
         )
-        with open(file_path, 'w') as css_file:
-            css_file.write(parse_string.cssText.decode('utf-8'))
+        with tracer.span('write', category='output', file=file_path):
+            with open(file_path, 'w') as css_file:
+                css_file.write(serialize_css(css_text=css_text))
+        livereload.css_updated(file_path=file_path)
 
     def minify(self, css_text=''):
         """ Output a minified version of the css file in utf-8 format.
@@ -290,9 +411,8 @@ class CSSFile(object):
 
         **Important:**
 
-        - ``ser.prefs.useMinified()`` is a global setting. It must be reset to ``ser.prefs.useDefaults()``. Otherwise,
-          minification will continue to occur. This can result in strange behavior especially during unit testing or
-          in code called after this method is called.
+        - ``ser.prefs.useMinified()`` is a global setting. ``serialize_css()`` resets it to ``ser.prefs.useDefaults()``
+          under ``serializer_lock``. Otherwise, minification would continue to occur in code called afterwards.
 
         :type css_text: str
 
@@ -306,16 +426,82 @@ class CSSFile(object):
         >>> css_file.minify(css_text=css_text)
 
         """
-        parse_string = parseString(css_text)
-        ser.prefs.useMinified()                                     # Enable minification.
         file_path = get_file_path(
             file_directory=self.file_directory,
             file_name=self.file_name,
             extension=str('.min' + self.extension)                  # prepend '.min'
         )
-        with open(file_path, 'w') as css_file:
-            css_file.write(parse_string.cssText.decode('utf-8'))
-        ser.prefs.useDefaults()                                     # Disable minification.
+        with tracer.span('write', category='output', file=file_path):
+            with open(file_path, 'w') as css_file:
+                css_file.write(serialize_css(css_text=css_text, minified=True))
+        livereload.css_updated(file_path=file_path)
+
+    def write_serialized(self, text='', minified=False):
+        """ Output CSS that was already serialized e.g. ``compiler.Result.css`` or ``compiler.Result.minified_css``.
+
+        :type text: str
+        :param text: Serialized CSS.
+
+        :type minified: bool
+        :param minified: If True, write the ``.min`` file.
+
+        :return: (*str*) -- Returns the path of the file written.
+
+        """
+        file_path = get_file_path(
+            file_directory=self.file_directory,
+            file_name=self.file_name,
+            extension=str('.min' + self.extension) if minified else self.extension
+        )
+        with tracer.span('write', category='output', file=file_path):
+            with open(file_path, 'w', encoding='utf-8') as css_file:
+                css_file.write(text)
+        livereload.css_updated(file_path=file_path)
+        return file_path
+
+    def append(self, css_text=b''):
+        """ Append a human readable version of ``css_text`` to the end of the css file in utf-8 format.
+        Only ``css_text`` is serialized. The rules already in the file are not reparsed.
+
+        Used by the watch mode fast path. The next ``write()`` replaces the file with a fully serialized version.
+
+        :type css_text: str
+
+        :param css_text: Text containing the new CSS rules.
+        :return: None
+
+        """
+        file_path = get_file_path(
+            file_directory=self.file_directory,
+            file_name=self.file_name,
+            extension=self.extension
+        )
+        with tracer.span('append', category='output', file=file_path):
+            with open(file_path, 'a') as css_file:
+                css_file.write('\n' + serialize_css(css_text=css_text))
+        livereload.css_updated(file_path=file_path)
+
+    def append_minified(self, css_text=b''):
+        """ Append a minified version of ``css_text`` to the end of the minified css file in utf-8 format.
+        Only ``css_text`` is serialized. The rules already in the file are not reparsed.
+
+        Used by the watch mode fast path. The next ``minify()`` replaces the file with a fully serialized version.
+
+        :type css_text: str
+
+        :param css_text: Text containing the new CSS rules.
+        :return: None
+
+        """
+        file_path = get_file_path(
+            file_directory=self.file_directory,
+            file_name=self.file_name,
+            extension=str('.min' + self.extension)                  # prepend '.min'
+        )
+        with tracer.span('append', category='output', file=file_path):
+            with open(file_path, 'a') as css_file:
+                css_file.write(serialize_css(css_text=css_text, minified=True))
+        livereload.css_updated(file_path=file_path)
 
 
 class GenericFile(object):
@@ -384,6 +570,11 @@ class GenericFile(object):
 class FileModificationComparator(object):
     """ A Comparator that compares the last modified time of blowdry.css with the last modified time of another file.
 
+    | **Parameters:**
+
+    | **reference_time** (*float*) -- Optional epoch time to compare against instead of the modification time of
+      blowdry.css or blowdry.min.css.
+
     :return: None
 
     **Example**
@@ -394,9 +585,10 @@ class FileModificationComparator(object):
     >>> print(file_age_comparator.is_newer(file_path=path.join(settings.project_directory, '/index.html'))
 
     """
-    def __init__(self):
+    def __init__(self, reference_time=None):
         self.blowdrycss_file = path.join(settings.css_directory, 'blowdry.css')
         self.blowdrymincss_file = path.join(settings.css_directory, 'blowdry.min.css')
+        self.reference_time = reference_time
 
     def is_newer(self, file_path):
         """ Detects if ``self.file_path`` was modified more recently than blowdry.css.  If ``self.file_path`` is
@@ -409,7 +601,9 @@ class FileModificationComparator(object):
         :return: (*bool*) Returns True if modification time of blowdry.css or blowdry.min.css do not exist, or are older
             i.e. less than the ``self.file_path`` under consideration.
         """
-        if settings.human_readable:
+        if self.reference_time is not None:
+            a = self.reference_time
+        elif settings.human_readable:
             try:
                 a = path.getmtime(self.blowdrycss_file)
             except OSError:                                                                     # file doesn't exist
@@ -430,3 +624,314 @@ class FileModificationComparator(object):
             raise OSError('"' + file_path + '" does not exist.')
 
         return a <= b
+
+
+def stat_signature(stat_result):
+    """ Reduce an ``os.stat()`` result to the ``(size, mtime_ns, inode)`` tuple used to detect file changes.
+
+    ``st_mtime_ns`` is not available in Python 2 so it is derived from ``st_mtime`` in that case.
+
+    :type stat_result: os.stat_result
+    :param stat_result: The result of ``os.stat()`` or ``DirEntry.stat()``.
+    :return: (*tuple*) -- Returns ``(size, mtime_ns, inode)``.
+
+    """
+    try:
+        mtime_ns = stat_result.st_mtime_ns
+    except AttributeError:                                                                      # Python 2
+        mtime_ns = int(stat_result.st_mtime * 10**9)
+    return stat_result.st_size, mtime_ns, stat_result.st_ino
+
+
+class FileManifest(object):
+    """ A cheap stat-only snapshot of every file in ``project_directory`` that matches ``settings.file_types``.
+    No file is opened or read. Comparing a fresh snapshot to a previous one reveals whether anything was created,
+    deleted, or modified in between.
+
+    Directories are listed with ``os.scandir()`` when available, which avoids a separate ``stat()`` call per
+    directory entry to tell files from directories.
+
+    | **Parameters:**
+
+    | **project_directory** (*str*) -- Directory to snapshot. Defaults to settings.project_directory.
+
+    | **config** (*Config*) -- Optional. Provides the compiled ``file_types`` pattern. Defaults to
+      ``Config.from_settings()``.
+
+    | **Members:**
+
+    | **entries** (*dict*) -- Maps each file path to its ``(size, mtime_ns, inode)`` stat signature.
+
+    **Example:**
+
+    >>> from blowdrycss.filehandler import FileManifest
+    >>> file_manifest = FileManifest()
+    >>> # ...time passes...
+    >>> if file_manifest.has_drifted():
+    >>>     print('Something changed. A comprehensive run is required.')
+    >>> # Incremental polling: stat at most 1000 files per call and yield the paths that changed.
+    >>> for file_path in file_manifest.poll(budget=1000):
+    >>>     print(file_path)
+
+    """
+    def __init__(self, project_directory=None, config=None):
+        self.project_directory = settings.project_directory if project_directory is None else project_directory
+        self.config = Config.from_settings() if config is None else config
+        self.entries = self.snapshot()
+        self._pass = None
+        self._seen = set()
+
+    @staticmethod
+    def is_file_type(file_name='', config=None):
+        """ Returns True if ``file_name`` matches one of the ``settings.file_types`` patterns.
+
+        :type file_name: str
+        :param file_name: The base name of a file.
+
+        :type config: Config
+        :param config: Optional. Defaults to ``Config.from_settings()``.
+
+        :return: (*bool*) -- Returns True if ``file_name`` matches a file type. Otherwise, returns False.
+
+        """
+        config = Config.from_settings() if config is None else config
+        return config.is_file_type(file_name)
+
+    def iterate_files(self):
+        """ Recursively yields the path and stat signature of every file in ``project_directory`` that matches
+        ``settings.file_types``. Files deleted while iterating are silently skipped.
+
+        :return: (*generator*) -- Yields ``(file_path, (size, mtime_ns, inode))`` tuples.
+
+        """
+        if scandir is None:
+            for directory, _, file_names in walk(self.project_directory):
+                for file_name in file_names:
+                    if self.config.is_file_type(file_name):
+                        file_path = path.join(directory, file_name)
+                        try:
+                            yield file_path, stat_signature(stat(file_path))
+                        except OSError:                                     # Deleted between walk() and stat().
+                            pass
+            return
+
+        directories = [self.project_directory]
+        while directories:
+            directory = directories.pop()
+            try:
+                dir_entries = list(scandir(directory))
+            except OSError:                                                 # Deleted or not readable.
+                continue
+            for dir_entry in dir_entries:
+                try:
+                    if dir_entry.is_dir(follow_symlinks=False):
+                        directories.append(dir_entry.path)
+                    elif self.config.is_file_type(dir_entry.name) and dir_entry.is_file():
+                        yield dir_entry.path, stat_signature(dir_entry.stat())
+                except OSError:                                             # Deleted between scandir() and stat().
+                    pass
+
+    def snapshot(self):
+        """ Walk ``project_directory`` and stat every file matching ``settings.file_types``.
+
+        :return: (*dict*) -- Returns a dictionary mapping each file path to its stat signature.
+
+        """
+        return dict(self.iterate_files())
+
+    def has_drifted(self):
+        """ Compares a fresh snapshot to ``entries``. Returns True if any file was created, deleted, or modified.
+
+        :return: (*bool*) -- Returns True if the project files differ from ``entries``. Otherwise, returns False.
+
+        """
+        drifted = self.snapshot() != self.entries
+        logging.debug('filehandler.FileManifest drift detected: %s', drifted)
+        return drifted
+
+    def refresh(self):
+        """ Replace ``entries`` with a fresh snapshot.
+
+        :return: None
+
+        """
+        self.entries = self.snapshot()
+        self._pass = None
+
+    def poll(self, budget=0):
+        """ Incrementally compares the project files to ``entries``, updates ``entries``, and yields the path of
+        every file that was created, modified, or deleted.
+
+        At most ``budget`` files are stat'd per call. The next call resumes where the previous one stopped.
+        Deleted files can only be detected once a complete pass over the project is finished. A deleted path is
+        removed from ``entries`` before it is yielded.
+
+        **Note:** Exhaust the generator on every call. Otherwise, the stopped pass resumes on the next call.
+
+        :type budget: int
+        :param budget: Maximum number of files to stat during this call. ``0`` means no limit.
+
+        :return: (*generator*) -- Yields changed file paths.
+
+        """
+        if self._pass is None:
+            self._pass = self.iterate_files()
+            self._seen = set()
+
+        count = 0
+        for file_path, signature in self._pass:
+            self._seen.add(file_path)
+            if self.entries.get(file_path) != signature:
+                self.entries[file_path] = signature
+                yield file_path
+            count += 1
+            if budget and count >= budget:
+                return
+
+        for file_path in set(self.entries).difference(self._seen):          # Pass complete. Find deleted files.
+            del self.entries[file_path]
+            yield file_path
+        self._pass = None
+
+
+class FingerprintRecord(object):
+    """ Remembers which fingerprint of the source data produced each generated file, along with the file's stat
+    signature at the time it was written. A generated file is current only if it still exists, it was not touched
+    since, and it was generated from the same fingerprint.
+
+    | **Parameters:**
+
+    | **record_path** (*str*) -- Path of the JSON file storing the record.
+
+    | **Members:**
+
+    | **entries** (*dict*) -- Maps each generated file path to ``[fingerprint, size, mtime_ns, inode]``.
+
+    :return: None
+
+    **Example:**
+
+    >>> record = FingerprintRecord(record_path='/home/user/.cache/blowdrycss/docs_fingerprints.json')
+    >>> if not record.is_current(file_path=doc_path, fingerprint=fingerprint):
+    >>>     # ...regenerate and write doc_path...
+    >>>     record.update(file_path=doc_path, fingerprint=fingerprint)
+    >>>     record.save()
+
+    """
+    def __init__(self, record_path=''):
+        self.record_path = record_path
+        try:
+            with open(record_path, 'r', encoding='utf-8') as record_file:
+                self.entries = loads(record_file.read())
+        except (IOError, OSError, ValueError):                                  # Missing or corrupt.
+            self.entries = {}
+
+    def is_current(self, file_path='', fingerprint=''):
+        """
+        :type file_path: str
+        :param file_path: Path of a generated file.
+
+        :type fingerprint: str
+        :param fingerprint: Fingerprint of the data the file would be generated from now.
+
+        :return: (*bool*) -- Returns True if ``file_path`` was generated from ``fingerprint`` and is unchanged.
+
+        """
+        try:
+            signature = list(stat_signature(stat(file_path)))
+        except OSError:
+            return False
+        return self.entries.get(path.abspath(file_path)) == [fingerprint] + signature
+
+    def update(self, file_path='', fingerprint=''):
+        """ Record that ``file_path`` was just generated from ``fingerprint``.
+
+        :return: None
+
+        """
+        self.entries[path.abspath(file_path)] = [fingerprint] + list(stat_signature(stat(file_path)))
+
+    def save(self):
+        """ Atomically write the record. Failures are logged and ignored since the record is only an optimization.
+
+        :return: None
+
+        """
+        try:
+            make_directory(path.dirname(self.record_path))
+            temporary_file = NamedTemporaryFile(dir=path.dirname(self.record_path), delete=False)
+            with temporary_file:
+                temporary_file.write(dumps(self.entries, sort_keys=True).encode('utf-8'))
+            replace(temporary_file.name, self.record_path)
+        except (IOError, OSError) as error:
+            logging.warning('%s not written %s: %s', type(self).__name__, self.record_path, error)
+
+
+class ExtractionCache(FingerprintRecord):
+    """ Persistent record of the class selectors found in each project file. A file is only read again if its stat
+    signature changed since it was extracted. Used by ``blowdry.parse()``, which saves it, and ``blowdry.check()``,
+    which only reads it.
+
+    | **Parameters:**
+
+    | **record_path** (*str*) -- Path of the JSON file storing the record. See ``classparser.extraction_cache_path()``.
+
+    | **Members:**
+
+    | **entries** (*dict*) -- Maps each file path to ``[size, mtime_ns, inode, [class selector, ...]]``.
+
+    | **changed** (*bool*) -- True if ``entries`` changed since the record was loaded.
+
+    :return: None
+
+    **Example:**
+
+    >>> extraction_cache = ExtractionCache(record_path=extraction_cache_path())
+    >>> signature, class_set = extraction_cache.lookup(file_path=file_path)
+    >>> if class_set is None:
+    >>>     class_set = ClassExtractor(file_path=file_path).class_set
+    >>>     extraction_cache.update(file_path=file_path, signature=signature, class_set=class_set)
+    >>> extraction_cache.save()
+
+    """
+    def __init__(self, record_path=''):
+        super(ExtractionCache, self).__init__(record_path=record_path)
+        self.changed = False
+
+    def lookup(self, file_path=''):
+        """ Stat ``file_path`` before it is read, and look up its class selectors.
+
+        :type file_path: str
+        :param file_path: Path of a project file.
+
+        :return: (*tuple*) -- Returns ``(signature, class_set)``. ``class_set`` is None if the file changed since it
+          was recorded. Pass ``signature`` to ``update()`` after extracting the file.
+
+        """
+        signature = list(stat_signature(stat(file_path)))
+        entry = self.entries.get(path.abspath(file_path))
+        if entry is not None and entry[:-1] == signature:
+            return signature, set(entry[-1])
+        return signature, None
+
+    def update(self, file_path='', signature=(), class_set=set()):
+        """ Record the class selectors extracted from ``file_path`` when it had ``signature``.
+
+        :return: None
+
+        """
+        self.entries[path.abspath(file_path)] = list(signature) + [sorted(class_set)]
+        self.changed = True
+
+    def prune(self, project_directory='', file_paths=()):
+        """ Forget the files in ``project_directory`` other than ``file_paths`` e.g. deleted files.
+
+        :return: None
+
+        """
+        prefix = path.join(path.abspath(project_directory), '')
+        keep = set(path.abspath(file_path) for file_path in file_paths)
+        for file_path in [file_path for file_path in self.entries if file_path.startswith(prefix)]:
+            if file_path not in keep:
+                del self.entries[file_path]
+                self.changed = True
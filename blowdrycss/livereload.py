@@ -0,0 +1,253 @@
+"""
+Optional local live-reload channel for watch mode.
+
+When ``settings.live_reload_enabled == True`` a small standard library HTTP server publishes a Server-Sent Events
+(SSE) stream. Right after ``CSSFile`` finishes writing blowdry.css or blowdry.min.css a ``css-updated`` event
+carrying the file name and the SHA-1 hash of its new content is pushed to every connected browser.
+The browser swaps the stylesheet in place. No page reload and no file watching round trip is required.
+
+**Endpoints:**
+
+- ``/events`` -- ``text/event-stream`` of ``css-updated`` events.
+- ``/livereload.js`` -- Client script that listens to ``/events`` and hot-swaps matching ``<link>`` elements.
+
+**Usage Case:**
+
+Add the client script to the page while developing. ::
+
+    <script src="http://127.0.0.1:35730/livereload.js"></script>
+
+>>> from blowdrycss import livereload
+>>> livereload.start(host='127.0.0.1', port=35730)
+>>> # CSSFile.write() and CSSFile.minify() call livereload.css_updated(file_path=...)
+>>> livereload.stop()
+
+"""
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from hashlib import sha1
+from json import dumps
+from os import path
+from threading import Thread, Lock
+import logging
+
+try:                                                # Python 3
+    from queue import Queue, Empty
+except ImportError:                                 # Python 2.7
+    from Queue import Queue, Empty
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+client_script = """(function () {
+    var source = new EventSource('http://%(host)s:%(port)s/events');
+    source.addEventListener('css-updated', function (event) {
+        var data = JSON.parse(event.data);
+        var links = document.querySelectorAll('link[rel="stylesheet"]');
+        for (var i = 0; i < links.length; i++) {
+            var href = links[i].href.split('?')[0];
+            if (href.slice(-data.file.length - 1) === '/' + data.file) {
+                links[i].href = href + '?v=' + data.hash;
+            }
+        }
+    });
+})();
+"""
+
+_server = None
+
+
+class LiveReloadServer(object):
+    """ A threaded HTTP server that streams ``css-updated`` Server-Sent Events to every connected client.
+
+    | **Parameters:**
+
+    | **host** (*str*) -- Interface to bind. Use ``127.0.0.1`` to stay local.
+
+    | **port** (*int*) -- Port to bind. ``0`` picks a free port.
+
+    | **Members:**
+
+    | **subscribers** (*list*) -- One message ``Queue`` per connected ``/events`` client.
+
+    :return: None
+
+    """
+    keep_alive = 15                                 # Seconds between SSE comments that keep idle connections open.
+
+    def __init__(self, host='127.0.0.1', port=35730):
+        try:                                        # Python 3
+            from http.server import HTTPServer
+            from socketserver import ThreadingMixIn
+        except ImportError:                         # Python 2.7
+            from BaseHTTPServer import HTTPServer
+            from SocketServer import ThreadingMixIn
+
+        class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        self.subscribers = []
+        self.lock = Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self.build_handler())
+        self.host, self.port = self.httpd.server_address[:2]
+        self.thread = Thread(target=self.httpd.serve_forever)
+        self.thread.daemon = True
+
+    def build_handler(self):
+        """ Build the request handler class bound to this server.
+
+        :return: (*class*) -- Returns a ``BaseHTTPRequestHandler`` subclass.
+
+        """
+        try:                                        # Python 3
+            from http.server import BaseHTTPRequestHandler
+        except ImportError:                         # Python 2.7
+            from BaseHTTPServer import BaseHTTPRequestHandler
+
+        server = self
+
+        class LiveReloadRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] == '/events':
+                    server.stream(self)
+                elif self.path.split('?')[0] == '/livereload.js':
+                    body = (client_script % {'host': server.host, 'port': server.port}).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/javascript')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self.send_error(404)
+
+            def log_message(self, format, *args):
+                logging.debug('livereload: ' + format, *args)
+
+        return LiveReloadRequestHandler
+
+    def stream(self, request_handler):
+        """ Hold an ``/events`` connection open and write every broadcast message to it as an SSE event.
+
+        :type request_handler: BaseHTTPRequestHandler
+        :param request_handler: The handler of the ``/events`` request.
+
+        :return: None
+
+        """
+        request_handler.send_response(200)
+        request_handler.send_header('Content-Type', 'text/event-stream')
+        request_handler.send_header('Cache-Control', 'no-cache')
+        request_handler.send_header('Access-Control-Allow-Origin', '*')        # Pages are served by another server.
+        request_handler.end_headers()
+
+        messages = Queue()
+        with self.lock:
+            self.subscribers.append(messages)
+        try:
+            request_handler.wfile.write(b': connected\n\n')
+            request_handler.wfile.flush()
+            while True:
+                try:
+                    message = messages.get(timeout=self.keep_alive)
+                except Empty:
+                    message = ': keep-alive'
+                if message is None:                                             # stop() was called.
+                    break
+                request_handler.wfile.write((message + '\n\n').encode('utf-8'))
+                request_handler.wfile.flush()
+        except (IOError, OSError):                                              # Client went away.
+            pass
+        finally:
+            with self.lock:
+                self.subscribers.remove(messages)
+
+    def broadcast(self, file_name='', content_hash=''):
+        """ Push a ``css-updated`` event to every connected client.
+
+        :type file_name: str
+        :param file_name: Base name of the CSS file that was written e.g. ``blowdry.min.css``.
+
+        :type content_hash: str
+        :param content_hash: SHA-1 hash of the new file content.
+
+        :return: None
+
+        """
+        data = dumps({'file': file_name, 'hash': content_hash})
+        message = 'event: css-updated\ndata: ' + data
+        with self.lock:
+            for messages in self.subscribers:
+                messages.put(message)
+        logging.debug('livereload broadcast: %s', data)
+
+    def start(self):
+        """ Serve in a background daemon thread.
+
+        :return: None
+
+        """
+        self.thread.start()
+
+    def stop(self):
+        """ Close every ``/events`` stream and shut the server down.
+
+        :return: None
+
+        """
+        with self.lock:
+            for messages in self.subscribers:
+                messages.put(None)
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def start(host='127.0.0.1', port=35730):
+    """ Start the module level live-reload server. ``css_updated()`` publishes to it.
+
+    :type host: str
+    :param host: Interface to bind.
+
+    :type port: int
+    :param port: Port to bind. ``0`` picks a free port.
+
+    :return: (*LiveReloadServer*) -- Returns the running server.
+
+    """
+    global _server
+    stop()
+    _server = LiveReloadServer(host=host, port=port)
+    _server.start()
+    script_url = 'http://' + str(_server.host) + ':' + str(_server.port) + '/livereload.js'
+    print('Live reload: <script src="' + script_url + '"></script>')
+    return _server
+
+
+def stop():
+    """ Stop the module level live-reload server if it is running.
+
+    :return: None
+
+    """
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
+
+
+def css_updated(file_path=''):
+    """ Called by ``CSSFile`` right after a CSS file is written. Hashes the new content and broadcasts it.
+    Does nothing if the live-reload server is not running.
+
+    :type file_path: str
+    :param file_path: Full path of the CSS file that was written.
+
+    :return: None
+
+    """
+    if _server is None:
+        return
+    with open(file_path, 'rb') as css_file:
+        content_hash = sha1(css_file.read()).hexdigest()
+    _server.broadcast(file_name=path.basename(file_path), content_hash=content_hash)
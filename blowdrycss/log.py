@@ -2,17 +2,28 @@
 
 Allows logging to std.stdout at the console and logging to a file.
 
+If ``settings.log_queue_enabled == True`` the console and file handlers are moved behind a ``QueueHandler``.
+Logging calls on the parsing thread only enqueue the record. A ``QueueListener`` thread formats the records and
+performs the console and file I/O. Call ``stop_queue()`` to flush the queue, which also happens at exit.
+
 """
 
 # python 2.7
 from __future__ import absolute_import, unicode_literals, print_function
 
 # builtins
+import atexit
 import logging
 import sys
 from logging.handlers import RotatingFileHandler
 from os import path
 
+try:                                            # Python 3.2+
+    from logging.handlers import QueueHandler, QueueListener
+    from queue import Queue
+except ImportError:                             # Python 2.7 logs synchronously.
+    QueueHandler = QueueListener = None
+
 # custom
 from blowdrycss.utilities import make_directory
 import blowdrycss_settings as settings
@@ -26,6 +37,10 @@ except ImportError:                             # Python 3.3+ log.py
             pass
 
 
+_queue_listener = None
+_queue_handler = None                           # (logger, QueueHandler) attached by start_queue().
+
+
 def enable():
     """ Enable logging in accordance with the settings defined in ``blowdrycss_settings.py``.
 
@@ -36,12 +51,14 @@ def enable():
         logger = logging.getLogger('')
         logger.setLevel(settings.logging_level)
         formatter = logging.Formatter('%(asctime)s %(levelname)s: %(message)s')
+        handlers = []
+        messages = []
 
         if settings.log_to_console:
             stream_handler = logging.StreamHandler(sys.stdout)
             stream_handler.setFormatter(formatter)
-            logger.addHandler(stream_handler)
-            logging.info('Console logging enabled.')
+            handlers.append(stream_handler)
+            messages.append('Console logging enabled.')
         # else:
         #     logger.propagate = False        # Prevent printing to stderr.
 
@@ -54,7 +71,58 @@ def enable():
                 backupCount=settings.log_backup_count
             )
             rotating_file_handler.setFormatter(formatter)
-            logger.addHandler(rotating_file_handler)
-            logging.info('Rotating file logging enabled.' + '\nLog file location: ' + log_file_path)
+            handlers.append(rotating_file_handler)
+            messages.append('Rotating file logging enabled.' + '\nLog file location: ' + log_file_path)
+
+        if settings.log_queue_enabled and QueueHandler is not None and handlers:
+            start_queue(logger=logger, handlers=handlers)
+        else:
+            for handler in handlers:
+                logger.addHandler(handler)
+
+        for message in messages:
+            logging.info(message)
     else:
         print('Logging disabled because settings.logging_enabled is False.')
+
+
+def start_queue(logger=None, handlers=()):
+    """ Attach a ``QueueHandler`` to ``logger`` and serve ``handlers`` from a ``QueueListener`` thread. A queue
+    started earlier is stopped and its ``QueueHandler`` removed first.
+
+    :type logger: logging.Logger
+    :param logger: The logger that receives the ``QueueHandler``.
+
+    :type handlers: list
+    :param handlers: The handlers that perform the actual I/O.
+
+    :return: None
+
+    """
+    global _queue_listener, _queue_handler
+    stop_queue()
+    record_queue = Queue(-1)                                                    # Unbounded. Never blocks the caller.
+    _queue_listener = QueueListener(record_queue, *handlers, respect_handler_level=True)
+    _queue_handler = (logger, QueueHandler(record_queue))
+    logger.addHandler(_queue_handler[1])
+    _queue_listener.start()
+
+
+def stop_queue():
+    """ Detach the ``QueueHandler``, then flush every queued record to its handlers and stop the ``QueueListener``
+    thread if one is running.
+
+    :return: None
+
+    """
+    global _queue_listener, _queue_handler
+    if _queue_handler is not None:
+        logger, queue_handler = _queue_handler
+        logger.removeHandler(queue_handler)                                     # Stop queueing before the flush.
+        _queue_handler = None
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(stop_queue)
@@ -12,6 +12,7 @@ from xml.dom import SyntaxErr
 from blowdrycss.classpropertyparser import ClassPropertyParser
 from blowdrycss.breakpointparser import BreakpointParser
 from blowdrycss.scalingparser import ScalingParser
+from blowdrycss.timing import timed_items
 
 __author__ = 'chad nelson'
 __project__ = 'blowdrycss'
@@ -27,8 +28,14 @@ class MediaQueryBuilder(object):
     :type property_parser: ClassPropertyParser
 
     :param property_parser: ClassPropertyParser object containing ``class_set``.
+
+    :type verbose: bool
+
+    :param verbose: Print a start message to stdout. In-memory builds pass False.
     :return: None
 
+    **Members:** ``class_costs`` (*dict*) -- Maps each css_class to the seconds spent decoding and validating it.
+
     **Example Usage:**
 
     >>> import blowdrycss_settings as settings
@@ -50,16 +57,18 @@ class MediaQueryBuilder(object):
 
     """
 
-    def __init__(self, property_parser=ClassPropertyParser()):
+    def __init__(self, property_parser=ClassPropertyParser(), verbose=True):
         message = 'MediaQueryBuilder Running...'
-        print(message)
+        if verbose:
+            print(message)
         logging.debug(msg=message)
         self.property_parser = property_parser
         self.css_media_queries = set()
         self.media_query_text = ''
+        self.class_costs = {}
 
         not_media_classes = dict()
-        for css_class in self.property_parser.class_set:
+        for css_class in timed_items(self.property_parser.class_set, costs=self.class_costs):
             name = self.property_parser.get_property_name(css_class=css_class)
             priority = self.property_parser.get_property_priority(css_class=css_class)
             clean_css_class = ''    # Prevents css_class from being modified.
@@ -68,12 +77,16 @@ class MediaQueryBuilder(object):
                 # value='inherit' since we do not know if the class is valid yet.
                 inherit_property = Property(name=name, value='inherit', priority=priority)
 
-                scaling_parser = ScalingParser(css_class=css_class, css_property=inherit_property)
+                scaling_parser = ScalingParser(
+                    css_class=css_class, css_property=inherit_property, config=self.property_parser.config
+                )
                 is_scaling = scaling_parser.is_scaling
                 if is_scaling:
                     clean_css_class = scaling_parser.strip_scaling_flag()
 
-                breakpoint_parser = BreakpointParser(css_class=css_class, css_property=inherit_property)
+                breakpoint_parser = BreakpointParser(
+                    css_class=css_class, css_property=inherit_property, config=self.property_parser.config
+                )
                 is_breakpoint = breakpoint_parser.is_breakpoint
                 if is_breakpoint:
                     clean_css_class = breakpoint_parser.strip_breakpoint_limit()
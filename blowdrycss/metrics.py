@@ -0,0 +1,141 @@
+"""
+Counters and gauges of a long-running blowdrycss process in the Prometheus text exposition format.
+
+If ``settings.metrics_path`` is set, the metrics are rewritten after every ``blowdry.parse()`` and watch mode fast
+path. The file is replaced atomically, so it can be picked up by the node exporter textfile collector without a
+network listener. Name the file ``*.prom`` and place it in the directory given to
+``--collector.textfile.directory``.
+
+**Usage Case:**
+
+>>> from blowdrycss.metrics import metrics
+>>> metrics.observe(report=report, class_set=class_set)
+>>> metrics.flush()
+
+"""
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from collections import OrderedDict
+from os import chmod, path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import time
+
+try:                                                # Python 3
+    from os import replace
+except ImportError:                                 # Python 2.7 (rename is atomic on POSIX)
+    from os import rename as replace
+
+# custom
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class Metrics(object):
+    """ Holds the current value of every metric in ``definitions``.
+
+    | **Members:**
+
+    | **values** (*OrderedDict*) -- Maps each metric name to its current value.
+
+    :return: None
+
+    """
+    #: ``(name, type, help)`` of every metric. Counters only ever increase.
+    definitions = (
+        ('blowdrycss_parses_total', 'counter', 'Parses run, including watch mode fast paths.'),
+        ('blowdrycss_files_scanned_total', 'counter', 'Project files read.'),
+        ('blowdrycss_bytes_read_total', 'counter', 'Bytes of project files read.'),
+        ('blowdrycss_class_cache_hits_total', 'counter', 'Class selectors found that were already decoded.'),
+        ('blowdrycss_class_cache_misses_total', 'counter', 'Class selectors found that had to be decoded.'),
+        ('blowdrycss_rules_emitted_total', 'counter', 'CSS rules and media queries built.'),
+        ('blowdrycss_alias_cache_hit', 'gauge', '1 if the alias tables were loaded from the cache file, else 0.'),
+        ('blowdrycss_classes_live', 'gauge', 'Valid class selectors currently in the output.'),
+        ('blowdrycss_output_bytes', 'gauge', 'Bytes of the output files written by the last parse.'),
+        ('blowdrycss_last_parse_duration_seconds', 'gauge', 'Wall clock duration of the last parse.'),
+        ('blowdrycss_last_parse_timestamp_seconds', 'gauge', 'Unix time the last parse finished.'),
+        ('blowdrycss_event_queue_depth', 'gauge', 'Watch mode file events waiting to be handled.'),
+    )
+
+    def __init__(self):
+        self.values = OrderedDict((name, 0) for name, _, _ in self.definitions)
+        self.lock = Lock()
+
+    def increment(self, name='', value=0):
+        """ Add ``value`` to counter ``name``.
+
+        :return: None
+
+        """
+        with self.lock:
+            self.values[name] += value
+
+    def set(self, name='', value=0):
+        """ Set gauge ``name`` to ``value``.
+
+        :return: None
+
+        """
+        with self.lock:
+            self.values[name] = value
+
+    def observe(self, report=None, class_set=None):
+        """ Update the metrics with a finished run.
+
+        :type report: RunReport
+        :param report: Stages and counts of the run.
+
+        :type class_set: set
+        :param class_set: Valid class selectors after the run.
+
+        :return: None
+
+        """
+        from blowdrycss.datalibrary import alias_cache_hit
+
+        counts = report.counts
+        self.increment('blowdrycss_parses_total', 1)
+        self.increment('blowdrycss_files_scanned_total', counts.get('files', 0))
+        self.increment('blowdrycss_bytes_read_total', counts.get('bytes_read', 0))
+        self.increment('blowdrycss_class_cache_hits_total', counts.get('cache_hits', 0))
+        self.increment('blowdrycss_class_cache_misses_total', counts.get('cache_misses', 0))
+        self.increment('blowdrycss_rules_emitted_total', counts.get('rules', 0))
+        self.set('blowdrycss_alias_cache_hit', int(alias_cache_hit))
+        self.set('blowdrycss_classes_live', len(class_set))
+        if 'output_bytes' in counts:
+            self.set('blowdrycss_output_bytes', counts['output_bytes'])
+        self.set('blowdrycss_last_parse_duration_seconds', sum(report.stages.values()))
+        self.set('blowdrycss_last_parse_timestamp_seconds', time())
+
+    def text(self):
+        """ :return: (*str*) -- Returns every metric in the Prometheus text exposition format. """
+        lines = []
+        with self.lock:
+            for name, metric_type, help_text in self.definitions:
+                lines.append('# HELP ' + name + ' ' + help_text)
+                lines.append('# TYPE ' + name + ' ' + metric_type)
+                lines.append(name + ' ' + repr(self.values[name]))
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        """ Atomically rewrite ``settings.metrics_path`` if it is set.
+
+        :return: None
+
+        """
+        if not settings.metrics_path:
+            return
+
+        directory = path.dirname(path.abspath(settings.metrics_path))
+        temporary_file = NamedTemporaryFile(dir=directory, delete=False)
+        with temporary_file:
+            temporary_file.write(self.text().encode('utf-8'))
+        chmod(temporary_file.name, 0o644)               # NamedTemporaryFile is 0600. Collectors run as other users.
+        replace(temporary_file.name, settings.metrics_path)
+
+
+metrics = Metrics()
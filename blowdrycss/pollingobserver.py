@@ -0,0 +1,112 @@
+"""
+Stat polling replacement for the watchdog ``Observer``.
+
+Inside of Docker bind mounts, NFS home directories, and some virtual machine shares file system events (inotify,
+FSEvents, ReadDirectoryChangesW) are often never delivered. Watchdog's generic ``PollingObserver`` re-stats every
+file in the tree on every tick. ``ManifestPollingObserver`` instead only looks at files matching
+``settings.file_types``, compares ``(size, mtime_ns, inode)`` against the cached ``FileManifest`` table, and
+caps the number of files stat'd per tick.
+
+**Usage Case:**
+
+>>> # blowdrycss_settings.polling_enabled = True
+>>> from blowdrycss.pollingobserver import ManifestPollingObserver
+>>> observer = ManifestPollingObserver()
+>>> observer.schedule(event_handler, settings.project_directory, recursive=True)
+>>> observer.start()
+>>> # ...
+>>> observer.stop()
+>>> observer.join()
+
+"""
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from threading import Thread, Event
+import logging
+
+# plugins
+from watchdog.events import FileModifiedEvent, FileDeletedEvent
+
+# custom
+from blowdrycss.filehandler import FileManifest
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class ManifestPollingObserver(Thread):
+    """ A daemon thread that polls the project files every ``interval`` seconds, and dispatches a
+    ``FileModifiedEvent`` for every created or modified file and a ``FileDeletedEvent`` for every deleted file.
+    It exposes the subset of the watchdog ``Observer`` interface used by ``watchdogwrapper.main()``.
+
+    | **Parameters:**
+
+    | **interval** (*float*) -- Seconds between polling ticks. Default is settings.polling_interval.
+
+    | **budget** (*int*) -- Maximum number of files stat'd per tick. ``0`` means no limit.
+      Default is settings.polling_budget.
+
+    :return: None
+
+    """
+    def __init__(self, interval=None, budget=None):
+        super(ManifestPollingObserver, self).__init__()
+        self.daemon = True
+        self.interval = settings.polling_interval if interval is None else interval
+        self.budget = settings.polling_budget if budget is None else budget
+        self.watches = []
+        self._stopped_event = Event()
+
+    def schedule(self, event_handler, path, recursive=True):
+        """ Watch ``path`` and dispatch its file events to ``event_handler``.
+
+        **Note:** Watching is always recursive. ``recursive`` is only accepted for watchdog compatibility.
+
+        :type event_handler: watchdog.events.FileSystemEventHandler
+        :param event_handler: Receives the dispatched events.
+
+        :type path: str
+        :param path: Directory to watch.
+
+        :type recursive: bool
+        :param recursive: Ignored.
+
+        :return: None
+
+        """
+        self.watches.append((event_handler, FileManifest(project_directory=path)))
+
+    def tick(self):
+        """ Run one polling pass (limited by ``budget``) over every watch and dispatch the resulting events.
+
+        :return: None
+
+        """
+        for event_handler, file_manifest in self.watches:
+            for file_path in file_manifest.poll(budget=self.budget):
+                if file_path in file_manifest.entries:
+                    event = FileModifiedEvent(file_path)
+                else:
+                    event = FileDeletedEvent(file_path)
+                logging.debug('pollingobserver event: %s', event)
+                event_handler.dispatch(event)
+
+    def run(self):
+        """ Call ``tick()`` every ``interval`` seconds until ``stop()`` is called.
+
+        :return: None
+
+        """
+        while not self._stopped_event.wait(self.interval):
+            self.tick()
+
+    def stop(self):
+        """ Signal the polling thread to stop. Call ``join()`` afterwards to wait for it.
+
+        :return: None
+
+        """
+        self._stopped_event.set()
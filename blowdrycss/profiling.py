@@ -0,0 +1,282 @@
+"""
+Optional cProfile hook for ``blowdry.parse()`` and ``blowdry.fast_parse()``, and a tracemalloc based memory profiler.
+
+When ``settings.profile_enabled == True`` every ``profile_every``-th call of a decorated function runs under
+cProfile. Each profiled call writes two files to ``settings.profile_directory``:
+
+- ``<name>.pstats`` -- Raw statistics. Open them with ``python -m pstats <file>`` or a viewer such as snakeviz.
+- ``<name>.txt`` -- The top ``settings.profile_top`` functions sorted by cumulative time.
+
+In watch mode each event-triggered parse is profiled separately. Sampling only every Nth call keeps the overhead
+low while watching.
+
+**Usage Case:** ::
+
+    $ blowdrycss --profile
+    $ blowdrycss --profile --profile-every 10
+
+>>> from blowdrycss import profiling
+>>> @profiling.profiled
+>>> def parse():
+>>>     pass
+
+**Memory Profiling:**
+
+When ``settings.memory_profile_enabled == True`` each stage timed by ``timing.RunReport`` is also measured with
+tracemalloc. After each ``blowdry.parse()`` a report lists per stage the ``peak`` and ``retained`` allocations and
+the top allocation sites. In watch mode the growth of the traced memory since the previous parse, and the sites
+responsible, are listed as well. This makes leaks and bloat visible e.g. a growing ``css_text`` or class set copies.
+
+Tracing slows blowdrycss down considerably. Only enable it while investigating. ::
+
+    $ blowdrycss --memory-profile
+
+"""
+# python 2
+from __future__ import absolute_import, print_function, division, unicode_literals
+from builtins import str
+
+# builtins
+from datetime import datetime
+from contextlib import contextmanager
+from functools import wraps
+from io import open
+from os import path, makedirs
+from threading import Lock
+import logging
+
+# custom
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class Profiler(object):
+    """ Runs every ``every``-th call under cProfile and writes its statistics.
+
+    | **Members:**
+
+    | **call_count** (*int*) -- Number of calls seen so far, profiled or not.
+
+    | **active** (*bool*) -- True while a profiled call is running. Nested and concurrent calls are not profiled
+      separately.
+
+    | **lock** (*Lock*) -- Guards ``call_count`` and ``active``. In watch mode ``parse`` runs in the observer thread
+      and the main loop at the same time.
+
+    :return: None
+
+    """
+    def __init__(self):
+        self.call_count = 0
+        self.active = False
+        self.lock = Lock()
+
+    def should_profile(self):
+        """ Count the call and decide whether it is sampled. A sampled call sets ``active`` before the lock is
+        released, so two threads never start two collectors.
+
+        :return: (*bool*) -- Returns True if profiling is enabled, no profiled call is already running, and this is
+          the ``settings.profile_every``-th call.
+
+        """
+        with self.lock:
+            if not settings.profile_enabled or self.active:
+                return False
+            self.call_count += 1
+            self.active = (self.call_count - 1) % max(1, settings.profile_every) == 0
+            return self.active
+
+    def run(self, function, *args, **kwargs):
+        """ Call ``function(*args, **kwargs)`` under cProfile if the call is sampled, else call it directly.
+
+        :type function: function
+        :param function: The function to call.
+
+        :return: Returns the result of ``function``.
+
+        """
+        if not self.should_profile():
+            return function(*args, **kwargs)
+
+        import cProfile
+
+        profile = cProfile.Profile()                                # should_profile() set active.
+        try:
+            return profile.runcall(function, *args, **kwargs)
+        finally:
+            with self.lock:
+                self.active = False
+            self.write(profile=profile, name=function.__name__)
+
+    def write(self, profile=None, name=''):
+        """ Write ``profile`` to a ``.pstats`` file and its top ``settings.profile_top`` cumulative summary to a
+        ``.txt`` file in ``settings.profile_directory``.
+
+        :type profile: cProfile.Profile
+        :param profile: A finished profile.
+
+        :type name: str
+        :param name: Name of the profiled function. It is part of the file names.
+
+        :return: (*str*) -- Returns the path of the ``.pstats`` file.
+
+        """
+        import pstats
+        try:                                        # Python 2.7 (pstats writes byte strings)
+            from StringIO import StringIO
+        except ImportError:                         # Python 3
+            from io import StringIO
+
+        stream = StringIO()
+
+        if not path.isdir(settings.profile_directory):
+            makedirs(settings.profile_directory)
+
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        base_path = path.join(settings.profile_directory, name + '-' + timestamp + '-' + str(self.call_count))
+        stats_path = base_path + '.pstats'
+        profile.dump_stats(stats_path)
+
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats('cumulative').print_stats(settings.profile_top)
+        with open(base_path + '.txt', 'w', encoding='utf-8') as summary_file:
+            summary_file.write(str(stream.getvalue()))
+
+        print('\nProfile:', stats_path)
+        logging.info('Profile of %s written to %s', name, stats_path)
+        return stats_path
+
+
+profiler = Profiler()
+
+
+def profiled(function):
+    """ Decorator. Route each call of ``function`` through the module level ``profiler``.
+
+    :type function: function
+    :param function: The function to profile.
+
+    :return: (*function*) -- Returns the wrapped function.
+
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        return profiler.run(function, *args, **kwargs)
+    return wrapper
+
+
+class MemoryProfiler(object):
+    """ Measures the tracemalloc allocations of each stage, and the growth between consecutive runs.
+
+    | **Members:**
+
+    | **previous** (*tracemalloc.Snapshot*) -- Snapshot taken at the end of the previous run, or None.
+
+    :return: None
+
+    """
+    def __init__(self):
+        self.previous = None
+
+    @property
+    def enabled(self):
+        """ :return: (*bool*) -- Returns ``settings.memory_profile_enabled``. """
+        return settings.memory_profile_enabled
+
+    @staticmethod
+    def snapshot():
+        """ Start tracing if needed, and take a snapshot without the allocations of tracemalloc and this module.
+
+        :return: (*tracemalloc.Snapshot*) -- Returns the snapshot.
+
+        """
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.memory_profile_frames)
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    @staticmethod
+    def top_sites(snapshot=None, previous=None):
+        """ :return: (*list*) -- Returns the ``settings.memory_profile_top`` allocation sites that grew the most
+          from ``previous`` to ``snapshot`` as ``[site, size_diff, count_diff]`` lists.
+        """
+        statistics = snapshot.compare_to(previous, 'lineno')
+        statistics.sort(key=lambda statistic: statistic.size_diff, reverse=True)
+        return [
+            [str(statistic.traceback[0]), statistic.size_diff, statistic.count_diff]
+            for statistic in statistics[:settings.memory_profile_top] if statistic.size_diff > 0
+        ]
+
+    @contextmanager
+    def stage(self, name='', memory=None):
+        """ Context manager that records the allocations of the ``with`` block in ``memory[name]``. It does nothing
+        unless ``enabled``.
+
+        ``peak`` is the highest traced memory above the level at the start of the block. ``retained`` is the traced
+        memory still allocated at the end of the block. ``top`` lists the sites of the retained allocations.
+
+        :type name: str
+        :param name: Stage name.
+
+        :type memory: dict
+        :param memory: Receives ``{name: {'peak': bytes, 'retained': bytes, 'top': [...]}}``.
+
+        """
+        if not self.enabled:
+            yield
+            return
+
+        import tracemalloc
+
+        before = self.snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):      # Python 3.9+. Otherwise the peak is measured since tracing began.
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            measured = memory.setdefault(name, {'peak': 0, 'retained': 0, 'top': []})
+            measured['peak'] = max(measured['peak'], peak - start)
+            measured['retained'] += current - start
+            measured['top'] = self.top_sites(snapshot=self.snapshot(), previous=before)
+
+    def growth(self):
+        """ Compare the traced memory now with the end of the previous run. The first run only takes the snapshot.
+
+        :return: (*dict*) -- Returns ``{'bytes': growth, 'top': [...]}``, or None for the first run.
+
+        """
+        snapshot = self.snapshot()
+        previous, self.previous = self.previous, snapshot
+        if previous is None:
+            return None
+
+        total = sum(statistic.size for statistic in snapshot.statistics('filename'))
+        previous_total = sum(statistic.size for statistic in previous.statistics('filename'))
+        return {'bytes': total - previous_total, 'top': self.top_sites(snapshot=snapshot, previous=previous)}
+
+    @staticmethod
+    def table(memory=None, growth=None):
+        """ :return: (*str*) -- Returns the memory of each stage, its top allocation sites, and the growth since the
+          previous run as plain text.
+        """
+        lines = ['', 'Memory (KiB)         peak   retained', '-' * 36]
+        for name, measured in memory.items():
+            lines.append('%-14s %10.1f %10.1f' % (name, measured['peak'] / 1024, measured['retained'] / 1024))
+            for site, size_diff, count_diff in measured['top']:
+                lines.append('    %+10.1f KiB %+7d  %s' % (size_diff / 1024, count_diff, site))
+        if growth is not None:
+            lines.append('Growth since the previous run: %+.1f KiB' % (growth['bytes'] / 1024))
+            for site, size_diff, count_diff in growth['top']:
+                lines.append('    %+10.1f KiB %+7d  %s' % (size_diff / 1024, count_diff, site))
+        return '\n'.join(lines)
+
+
+memory_profiler = MemoryProfiler()
@@ -7,7 +7,7 @@ from cssutils.css import Property
 # custom
 from blowdrycss.utilities import deny_empty_or_whitespace
 from blowdrycss.unitparser import UnitParser
-from blowdrycss_settings import small, medium, large
+from blowdrycss.config import Config
 
 __author__ = 'chad nelson'
 __project__ = 'blowdrycss'
@@ -56,9 +56,12 @@ class ScalingParser(object):
 
     :type css_class: str
     :type css_property: Property()
+    :type config: Config
 
     :param css_class: Potentially encoded css class that may or may not be parsable. May not be empty or None.
     :param css_property: Valid CSS Property as defined by ``cssutils.css.Property``.
+    :param config: Optional. Provides the ``small``, ``medium``, and ``large`` breakpoints and unit conversion.
+      Defaults to ``Config.from_settings()``.
     :return: None
 
     **Examples:**
@@ -66,12 +69,13 @@ class ScalingParser(object):
     >>> scaling_parser = ScalingParser(css_class='font-weight-24-s')
 
     """
-    def __init__(self, css_class='', css_property=Property()):
+    def __init__(self, css_class='', css_property=Property(), config=None):
         deny_empty_or_whitespace(css_class, variable_name='css_class')
         deny_empty_or_whitespace(css_property.cssText, variable_name='css_property')
 
         self.css_class = css_class
         self.css_property = css_property
+        self.config = Config.from_settings() if config is None else config
         self.scale_dict = {
             'large': 1.043,
             'medium': 1.125,
@@ -106,7 +110,7 @@ class ScalingParser(object):
         False
 
         """
-        unit_parser = UnitParser(property_name=self.css_property.name)
+        unit_parser = UnitParser(property_name=self.css_property.name, config=self.config)
         if unit_parser.default_units() != 'px':
             return False
         else:
@@ -202,6 +206,7 @@ class ScalingParser(object):
         float_value = float(value.replace(units, ''))                           # Remove units.
 
         _max = 1
+        large, medium, small = (self.config.breakpoints[size] for size in ('large', 'medium', 'small'))
 
         large_property = Property(name=name, value=value, priority=priority)
         medium_property = Property(name=name, value=value, priority=priority)
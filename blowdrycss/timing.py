@@ -1,6 +1,12 @@
 """
 Simple code performance timer that allows for the execution time to be recorded
 
+``RunReport`` records a per-stage breakdown of a run. See ``settings.run_report_path`` and
+``settings.run_report_table``.
+
+``LatencyHistogram`` keeps rolling percentiles of the watch mode edit-to-CSS latency. See
+``settings.latency_stats_path``.
+
 **Credit:**
 
 - This is a modified version of Paul's and Nicojo's answers on stackoverflow.
@@ -24,15 +30,69 @@ from builtins import str
 
 # builtins
 from time import time
+from timeit import default_timer
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from json import dumps
+from math import ceil
+from os import path
+from tempfile import NamedTemporaryFile
+import logging
 from datetime import timedelta, datetime
 
+try:                                                # Python 3
+    from os import replace
+except ImportError:                                 # Python 2.7 (rename is atomic on POSIX)
+    from os import rename as replace
+
 # custom
+from blowdrycss.profiling import memory_profiler
+from blowdrycss.tracing import tracer
 import blowdrycss_settings as settings
 
 __author__ = 'chad nelson'
 __project__ = 'blowdrycss'
 
 
+def write_json(file_path='', data=None):
+    """ Write ``data`` as JSON to ``file_path``. The file is replaced atomically, so a reader never sees a
+    partially written file.
+
+    :type file_path: str
+    :param file_path: Destination of the JSON file.
+
+    :type data: dict
+    :param data: JSON serializable data.
+
+    :return: None
+
+    """
+    directory = path.dirname(path.abspath(file_path))
+    temporary_file = NamedTemporaryFile(dir=directory, delete=False)
+    with temporary_file:
+        temporary_file.write(dumps(data, indent=4).encode('utf-8'))
+    replace(temporary_file.name, file_path)
+
+
+def timed_items(iterable=(), costs=None):
+    """ Yield every item of ``iterable``, and add the time the caller spends on each item to ``costs[item]``.
+
+    The time is measured from yielding an item until the next item is requested, so every ``continue`` in the
+    caller's loop is covered without restructuring the loop body.
+
+    :type iterable: iterable
+    :param iterable: Hashable items e.g. a class set.
+
+    :type costs: dict
+    :param costs: Receives ``{item: seconds}``.
+
+    """
+    for item in iterable:
+        start = default_timer()
+        yield item
+        costs[item] = costs.get(item, 0.0) + default_timer() - start
+
+
 class Timer(object):
     """ A performance Timer that reports the amount of time it took to run a block of code.
 
@@ -212,3 +272,319 @@ class LimitTimer(object):
 
         """
         self.start_time = time()
+
+
+class AdaptiveLimitTimer(LimitTimer):
+    """ A LimitTimer whose ``time_limit`` is rescheduled after every comprehensive run based on how long that run
+    took and how much file activity was observed since the previous run.
+
+    **Scheduling Rules:**
+
+    - The interval is never shorter than ``rescan_cost_ratio`` times the duration of the last comprehensive run.
+      e.g. A 30 second run with a ratio of 100 waits at least 3000 seconds. This caps the CPU spent on
+      comprehensive runs at roughly 1%.
+    - If file events were observed the interval returns to ``settings.time_limit`` (or the cost floor).
+    - If no file events were observed, then the interval doubles up to ``settings.max_time_limit``.
+
+    | **Members:**
+
+    | **reason** (*str*) -- Human readable explanation of the most recently chosen interval.
+
+    :return: None
+
+    **Example**
+
+    >>> from blowdrycss.timing import AdaptiveLimitTimer
+    >>> limit_timer = AdaptiveLimitTimer()
+    >>> limit_timer.adapt(scan_duration=30.0, event_count=0)
+    >>> limit_timer.time_limit
+    3600
+    >>> limit_timer.reset()
+
+    """
+    def __init__(self):
+        super(AdaptiveLimitTimer, self).__init__()
+        self.reason = 'initial settings.time_limit'
+
+    def adapt(self, scan_duration=0.0, event_count=0):
+        """ Choose the next ``time_limit`` and log the interval along with the reason it was chosen.
+
+        :type scan_duration: float
+        :param scan_duration: Duration in seconds of the last comprehensive run.
+
+        :type event_count: int
+        :param event_count: Number of file events observed since the previous comprehensive run.
+
+        :return: None
+
+        """
+        cost_floor = scan_duration * settings.rescan_cost_ratio
+        ceiling = max(settings.max_time_limit, settings.time_limit)
+
+        if event_count > 0:
+            interval = settings.time_limit
+            reason = str(event_count) + ' file event(s) observed'
+        else:
+            interval = min(self.time_limit * 2, ceiling)
+            reason = 'no file events observed, backing off'
+
+        if cost_floor > interval:
+            interval = cost_floor
+            reason += ', raised to ' + str(settings.rescan_cost_ratio) + 'x the last scan duration of ' + \
+                Timer.seconds_to_string(scan_duration) + ' seconds'
+
+        self.time_limit = interval
+        self.reason = reason
+        logging.info('Next comprehensive run in %s seconds (%s).', Timer.seconds_to_string(interval), reason)
+
+
+class RunReport(object):
+    """ Machine readable breakdown of a single ``blowdry.parse()`` run. Records the wall clock time spent in each
+    stage, along with counts describing the amount of work done.
+
+    **Stages:** ``discovery``, ``extraction``, ``filtering``, ``build``, ``media_queries``, ``write``, ``minify``,
+    and ``docs``. A stage that was skipped is absent. Timing the same stage twice adds up.
+
+    **Counts:** ``files``, ``bytes_read``, ``raw_classes``, ``valid_classes``, ``removed_classes``, and ``rules``.
+
+    | **Members:**
+
+    | **stages** (*OrderedDict*) -- Maps each stage name to its duration in seconds, in the order first timed.
+
+    | **counts** (*OrderedDict*) -- Maps each count name to its value.
+
+    | **memory** (*OrderedDict*) -- Maps each stage name to its tracemalloc ``peak``, ``retained`` and ``top``
+      allocation sites. Only filled if ``settings.memory_profile_enabled == True``.
+
+    | **memory_growth** (*dict*) -- Growth of the traced memory since the previous run, or None.
+
+    | **file_costs** (*dict*) -- Maps each parsed file path to ``[extraction seconds, bytes, class count]``.
+
+    | **class_costs** (*dict*) -- Maps each css_class to the seconds spent decoding and validating it.
+
+    :return: None
+
+    **Example**
+
+    >>> from blowdrycss.timing import RunReport
+    >>> report = RunReport()
+    >>> with report.stage('discovery'):
+    >>>     file_finder = FileFinder(recent=False)
+    >>> report.count('files', len(file_finder.files))
+    >>> report.write(file_path='blowdrycss_report.json')
+    >>> print(report.table())
+
+    """
+    def __init__(self):
+        self.started = time()
+        self.stages = OrderedDict()
+        self.counts = OrderedDict()
+        self.memory = OrderedDict()
+        self.memory_growth = None
+        self.file_costs = {}
+        self.class_costs = {}
+
+    @contextmanager
+    def stage(self, name=''):
+        """ Context manager that adds the wall clock time spent inside the ``with`` block to stage ``name``. The
+        block is also recorded as a span by ``tracing.tracer``, and measured by ``profiling.memory_profiler``.
+
+        :type name: str
+        :param name: Stage name.
+
+        """
+        start = default_timer()
+        try:
+            with tracer.span(name, category='stage'), memory_profiler.stage(name, memory=self.memory):
+                yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + default_timer() - start
+
+    def count(self, name='', value=0):
+        """ Add ``value`` to count ``name``.
+
+        :return: None
+
+        """
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def add_class_costs(self, class_costs=None):
+        """ Add the seconds of each css_class in ``class_costs`` to ``class_costs`` of this report.
+
+        :return: None
+
+        """
+        for css_class, seconds in class_costs.items():
+            self.class_costs[css_class] = self.class_costs.get(css_class, 0.0) + seconds
+
+    def slowest_files(self, top=10):
+        """ :return: (*list*) -- Returns the ``top`` files that took longest to extract as
+          ``[file_path, seconds, bytes, class count]`` lists.
+        """
+        ordered = sorted(self.file_costs.items(), key=lambda item: item[1][0], reverse=True)
+        return [[file_path] + list(cost) for file_path, cost in ordered[:top]]
+
+    def costliest_classes(self, top=10):
+        """ :return: (*list*) -- Returns the ``top`` css classes that took longest to decode and validate as
+          ``[css_class, seconds]`` lists.
+        """
+        ordered = sorted(self.class_costs.items(), key=lambda item: item[1], reverse=True)
+        return [[css_class, seconds] for css_class, seconds in ordered[:top]]
+
+    def top_table(self, top=10):
+        """ List the ``top`` slowest files and costliest classes as plain text. If the slowest file dominates the
+        extraction, suggest excluding it or capping its size.
+
+        :return: (*str*) -- Returns the report.
+
+        """
+        lines = ['', '      ms        KiB  classes  Slowest files', '-' * 48]
+        for file_path, seconds, file_size, class_count in self.slowest_files(top=top):
+            lines.append('%8.1f %10.1f %8d  %s' % (1000 * seconds, file_size / 1024, class_count, file_path))
+
+        lines.extend(['', '      ms  Costliest classes', '-' * 48])
+        for css_class, seconds in self.costliest_classes(top=top):
+            lines.append('%8.2f  %s' % (1000 * seconds, css_class))
+
+        total = sum(cost[0] for cost in self.file_costs.values())
+        slowest = self.slowest_files(top=1)
+        if slowest and total and slowest[0][1] / total > 0.25 and len(self.file_costs) > 1:
+            lines.extend([
+                '',
+                'Suggestion: ' + slowest[0][0] + ' took ' + '%.0f' % (100 * slowest[0][1] / total) +
+                '% of the extraction time. If it is a vendored or minified file, move it out of project_directory '
+                'or remove its extension from file_types. Otherwise split it or cap its size.',
+            ])
+        return '\n'.join(lines)
+
+    def as_dict(self):
+        """ :return: (*dict*) -- Returns the report as a JSON serializable dictionary. """
+        return OrderedDict((
+            ('started', datetime.fromtimestamp(self.started).isoformat()),
+            ('total_seconds', time() - self.started),
+            ('stages', self.stages),
+            ('counts', self.counts),
+            ('memory', self.memory),
+            ('memory_growth', self.memory_growth),
+            ('slowest_files', self.slowest_files(top=settings.report_top)),
+            ('costliest_classes', self.costliest_classes(top=settings.report_top)),
+        ))
+
+    def write(self, file_path=''):
+        """ Write the report as JSON to ``file_path``. The file is replaced atomically, so a reader never sees a
+        partially written report.
+
+        :type file_path: str
+        :param file_path: Destination of the JSON report.
+
+        :return: None
+
+        """
+        write_json(file_path=file_path, data=self.as_dict())
+
+    def table(self):
+        """ :return: (*str*) -- Returns the stages and counts as a plain text table. """
+        report = self.as_dict()
+        total = report['total_seconds']
+        lines = ['', 'Stage            Seconds       %', '-' * 32]
+        for name, seconds in self.stages.items():
+            share = 100 * seconds / total if total else 0.0
+            lines.append('%-14s %9.4f %7.1f' % (name, seconds, share))
+        lines.append('%-14s %9.4f' % ('total', total))
+        lines.extend(['', 'Count                     Value', '-' * 32])
+        for name, value in self.counts.items():
+            lines.append('%-20s %11d' % (name, value))
+        return '\n'.join(lines)
+
+
+class LatencyHistogram(object):
+    """ Rolling edit-to-CSS latency of the watch mode. Each sample is split into phases:
+
+    - ``queueing`` -- From the file modification time until the file event reached the event handler.
+    - ``debounce`` -- From the file event until processing started e.g. waiting for a reconciliation to finish.
+    - ``parse`` -- Extracting, decoding and building the CSS.
+    - ``write`` -- Writing the output files.
+    - ``total`` -- From the file modification time until the output files were written.
+
+    Only the latest ``window`` samples are kept, so the percentiles follow recent behaviour.
+
+    | **Parameters:**
+
+    | **window** (*int*) -- Number of samples kept per phase.
+
+    :return: None
+
+    **Example**
+
+    >>> from blowdrycss.timing import LatencyHistogram
+    >>> latency = LatencyHistogram(window=1000)
+    >>> latency.record(queueing=0.02, debounce=0.0, parse=0.05, write=0.01)
+    >>> latency.percentiles('total')
+    {'p50': 0.08, 'p95': 0.08, 'p99': 0.08}
+
+    """
+    phases = ('queueing', 'debounce', 'parse', 'write', 'total')
+
+    def __init__(self, window=1000):
+        self.count = 0
+        self.samples = OrderedDict((phase, deque(maxlen=window)) for phase in self.phases)
+
+    def record(self, queueing=0.0, debounce=0.0, parse=0.0, write=0.0):
+        """ Add one sample. Its ``total`` is the sum of the phases. All values are in seconds.
+
+        :return: None
+
+        """
+        self.count += 1
+        for phase, seconds in zip(self.phases, (queueing, debounce, parse, write)):
+            self.samples[phase].append(max(0.0, seconds))
+        self.samples['total'].append(max(0.0, queueing) + max(0.0, debounce) + max(0.0, parse) + max(0.0, write))
+
+    def percentiles(self, phase='total'):
+        """ Nearest rank percentiles of the samples kept for ``phase``.
+
+        :type phase: str
+        :param phase: One of ``phases``.
+
+        :return: (*dict*) -- Returns ``{'p50': seconds, 'p95': seconds, 'p99': seconds}``. Empty if there are no
+          samples.
+
+        """
+        ordered = sorted(self.samples[phase])
+        if not ordered:
+            return {}
+        return dict(
+            (name, ordered[max(0, int(ceil(len(ordered) * rank / 100)) - 1)])
+            for name, rank in (('p50', 50), ('p95', 95), ('p99', 99))
+        )
+
+    def as_dict(self):
+        """ :return: (*dict*) -- Returns the percentiles of every phase as a JSON serializable dictionary. """
+        return OrderedDict((
+            ('samples', len(self.samples['total'])),
+            ('events', self.count),
+            ('phases', OrderedDict((phase, self.percentiles(phase)) for phase in self.phases)),
+        ))
+
+    def write(self, file_path=''):
+        """ Write the percentiles of every phase as JSON to ``file_path``.
+
+        :type file_path: str
+        :param file_path: Destination of the JSON stats file.
+
+        :return: None
+
+        """
+        write_json(file_path=file_path, data=self.as_dict())
+
+    def table(self):
+        """ :return: (*str*) -- Returns the percentiles of every phase in milliseconds as a plain text table. """
+        lines = ['', 'Latency (ms)      p50      p95      p99', '-' * 40]
+        for phase in self.phases:
+            percentiles = self.percentiles(phase)
+            if percentiles:
+                lines.append('%-12s %8.1f %8.1f %8.1f' % (
+                    phase, 1000 * percentiles['p50'], 1000 * percentiles['p95'], 1000 * percentiles['p99']
+                ))
+        lines.append('(' + str(len(self.samples['total'])) + ' of ' + str(self.count) + ' edits)')
+        return '\n'.join(lines)
@@ -0,0 +1,165 @@
+"""
+Timeline of a blowdrycss run in the Chrome Trace Event format.
+
+A flat total does not show which files or stages dominate latency, or how the watch mode events overlap. If
+``settings.trace_path`` is set, spans are recorded for:
+
+- Every stage timed by ``timing.RunReport`` e.g. ``discovery``, ``extraction``, ``build``, ``write``.
+- The extraction of each project file.
+- Each output file written.
+- Each watch mode event, fast path and reconciliation.
+
+The trace is rewritten after every ``blowdry.parse()`` and ``blowdry.fast_parse()``. Open it in
+``chrome://tracing`` or https://ui.perfetto.dev.
+
+Only the most recent ``settings.trace_max_events`` events are kept, so a long watch session does not grow without
+bound.
+
+**Usage Case:**
+
+>>> from blowdrycss.tracing import tracer
+>>> with tracer.span('extract', category='file', file='index.html'):
+>>>     class_set = ClassExtractor(file_path='index.html').class_set
+>>> tracer.flush()
+
+"""
+# python 2
+from __future__ import absolute_import, division, unicode_literals
+
+# builtins
+from collections import deque
+from contextlib import contextmanager
+from json import dumps
+from os import getpid, path
+from tempfile import NamedTemporaryFile
+from threading import Lock, current_thread
+from timeit import default_timer
+
+try:                                                # Python 3
+    from os import replace
+except ImportError:                                 # Python 2.7 (rename is atomic on POSIX)
+    from os import rename as replace
+
+# custom
+import blowdrycss_settings as settings
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class Tracer(object):
+    """ Records spans and instant events in the Chrome Trace Event format.
+
+    Recording is a no-op unless ``settings.trace_path`` is set.
+
+    | **Members:**
+
+    | **events** (*deque*) -- Recorded trace events, oldest first.
+
+    | **thread_names** (*dict*) -- Maps each thread id seen so far to its name.
+
+    :return: None
+
+    """
+    def __init__(self, max_events=100000):
+        self.events = deque(maxlen=max_events)
+        self.thread_names = {}
+        self.origin = default_timer()
+        self.lock = Lock()
+
+    @property
+    def enabled(self):
+        """ :return: (*bool*) -- Returns True if ``settings.trace_path`` is set. """
+        return bool(settings.trace_path)
+
+    def timestamp(self):
+        """ :return: (*float*) -- Returns the microseconds elapsed since the tracer was created. """
+        return (default_timer() - self.origin) * 1e6
+
+    def record(self, event=None):
+        """ Append ``event`` along with the process and thread ids. Remember the name of the thread.
+
+        :type event: dict
+        :param event: Trace event without ``pid`` and ``tid``.
+
+        :return: None
+
+        """
+        thread = current_thread()
+        event['pid'], event['tid'] = getpid(), thread.ident
+        with self.lock:
+            self.thread_names.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name='', category='blowdrycss', **args):
+        """ Context manager that records the ``with`` block as a complete event (``ph == 'X'``).
+
+        :type name: str
+        :param name: Event name shown on the timeline.
+
+        :type category: str
+        :param category: Event category e.g. ``stage``, ``file``, ``output``, or ``watch``.
+
+        :param args: Optional details shown when the event is selected e.g. ``file='index.html'``.
+
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = self.timestamp()
+        try:
+            yield
+        finally:
+            self.record(event={
+                'name': name, 'cat': category, 'ph': 'X', 'ts': start, 'dur': self.timestamp() - start, 'args': args,
+            })
+
+    def instant(self, name='', category='blowdrycss', **args):
+        """ Record a point in time (``ph == 'i'``) e.g. the arrival of a watch mode event.
+
+        :type name: str
+        :param name: Event name shown on the timeline.
+
+        :type category: str
+        :param category: Event category.
+
+        :param args: Optional details shown when the event is selected.
+
+        :return: None
+
+        """
+        if self.enabled:
+            self.record(event={
+                'name': name, 'cat': category, 'ph': 'i', 's': 't', 'ts': self.timestamp(), 'args': args,
+            })
+
+    def as_dict(self):
+        """ :return: (*dict*) -- Returns the trace as a JSON serializable dictionary, including the thread names. """
+        with self.lock:
+            metadata = [
+                {'name': 'thread_name', 'ph': 'M', 'pid': getpid(), 'tid': thread_id, 'args': {'name': thread_name}}
+                for thread_id, thread_name in sorted(self.thread_names.items())
+            ]
+            return {'traceEvents': metadata + list(self.events), 'displayTimeUnit': 'ms'}
+
+    def flush(self):
+        """ Rewrite ``settings.trace_path`` with every event recorded so far. The file is replaced atomically, so
+        the viewer never loads a partially written trace.
+
+        :return: None
+
+        """
+        if not self.enabled:
+            return
+
+        trace = dumps(self.as_dict()).encode('utf-8')
+        directory = path.dirname(path.abspath(settings.trace_path))
+        temporary_file = NamedTemporaryFile(dir=directory, delete=False)
+        with temporary_file:
+            temporary_file.write(trace)
+        replace(temporary_file.name, settings.trace_path)
+
+
+tracer = Tracer(max_events=settings.trace_max_events)
@@ -0,0 +1,5 @@
+# Runs before any test module is imported. ``datalibrary`` saves its alias table cache on import, so the cache
+# directory has to be redirected first.
+from blowdrycss.utilities import change_settings_for_testing
+
+change_settings_for_testing()
@@ -109,5 +109,24 @@ class TestCSSStyleBuilder(TestCase):
 
         settings.use_em = True
 
+    def test_get_css_text_holds_serializer_lock(self):
+        from threading import Thread
+        from cssutils import ser
+        from blowdrycss.filehandler import serializer_lock
+
+        css_builder = CSSBuilder(property_parser=ClassPropertyParser(class_set={'bold'}), verbose=False)
+        results = []
+        thread = Thread(target=lambda: results.append(css_builder.get_css_text()))
+        with serializer_lock:                                           # A concurrent minified serialization.
+            ser.prefs.useMinified()
+            try:
+                thread.start()
+                thread.join(0.2)
+                self.assertTrue(thread.is_alive())                      # Waits for the lock.
+            finally:
+                ser.prefs.useDefaults()
+        thread.join()
+        self.assertEqual(results, [b'.bold {\n    font-weight: bold\n    }'])
+
 if __name__ == '__main__':
     main()
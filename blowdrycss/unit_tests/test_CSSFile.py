@@ -149,5 +149,33 @@ class TestCSSFile(TestCase):
         settings.output_extension = output_extension
 
 
+    def test_append_and_append_minified(self):
+        # Save original values.
+        css_directory = settings.css_directory
+
+        # Change settings
+        settings.css_directory = unittest_file_path(folder='test_css')
+
+        css_file = CSSFile()
+        file_path = path.join(settings.css_directory, css_file.file_name + '.css')
+        min_file_path = path.join(settings.css_directory, css_file.file_name + '.min.css')
+
+        css_file.write(css_text=b'.bold {\n    font-weight: bold\n    }')
+        css_file.minify(css_text=b'.bold {\n    font-weight: bold\n    }')
+        css_file.append(css_text=b'.c-blue {\n    color: blue\n    }')
+        css_file.append_minified(css_text=b'.c-blue {\n    color: blue\n    }')
+
+        with open(file_path, 'r') as _file:
+            self.assertEqual(_file.read(), '.bold {\n    font-weight: bold\n    }\n.c-blue {\n    color: blue\n    }')
+        with open(min_file_path, 'r') as _file:
+            self.assertEqual(_file.read(), '.bold{font-weight:bold}.c-blue{color:blue}')
+
+        remove(file_path)
+        remove(min_file_path)
+
+        # Reset settings values.
+        settings.css_directory = css_directory
+
+
 if __name__ == '__main__':
     main()
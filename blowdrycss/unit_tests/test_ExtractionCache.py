@@ -0,0 +1,79 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtin
+from unittest import TestCase, main
+from io import open
+from shutil import rmtree
+from tempfile import mkdtemp
+import os
+
+# custom
+from blowdrycss.classparser import ClassParser, extraction_cache_path
+from blowdrycss.filehandler import ExtractionCache, canonical_css
+from blowdrycss.utilities import change_settings_for_testing
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestExtractionCache(TestCase):
+    def setUp(self):
+        self.alias_cache_directory = settings.alias_cache_directory
+        self.temporary_directory = mkdtemp()
+        settings.alias_cache_directory = os.path.join(self.temporary_directory, 'cache')
+        self.html_file = os.path.join(self.temporary_directory, 'index.html')
+        with open(self.html_file, 'w') as _file:
+            _file.write('<html><div class="bold padding-10"></div></html>')
+
+    def tearDown(self):
+        rmtree(self.temporary_directory)
+        settings.alias_cache_directory = self.alias_cache_directory
+
+    def test_unchanged_files_are_not_read(self):
+        extraction_cache = ExtractionCache(record_path=extraction_cache_path())
+        class_parser = ClassParser(file_dict={'.html': [self.html_file]}, extraction_cache=extraction_cache)
+        self.assertEqual(class_parser.class_set, {'bold', 'padding-10'})
+        self.assertTrue(extraction_cache.changed)
+        extraction_cache.save()
+
+        extraction_cache = ExtractionCache(record_path=extraction_cache_path())      # Next run.
+        class_parser = ClassParser(file_dict={'.html': [self.html_file]}, extraction_cache=extraction_cache)
+        self.assertEqual(class_parser.class_set, {'bold', 'padding-10'})
+        self.assertEqual(class_parser.bytes_read, 0)
+        self.assertFalse(extraction_cache.changed)
+
+        with open(self.html_file, 'w') as _file:                                    # Changed file. Read again.
+            _file.write('<html><div class="italic"></div></html>')
+        class_parser = ClassParser(file_dict={'.html': [self.html_file]}, extraction_cache=extraction_cache)
+        self.assertEqual(class_parser.class_set, {'italic'})
+        self.assertTrue(class_parser.bytes_read > 0)
+
+    def test_prune(self):
+        extraction_cache = ExtractionCache(record_path=extraction_cache_path())
+        signature, _ = extraction_cache.lookup(file_path=self.html_file)
+        extraction_cache.update(file_path=self.html_file, signature=signature, class_set={'bold'})
+        extraction_cache.prune(project_directory=os.path.dirname(self.temporary_directory), file_paths=[])
+        self.assertEqual(extraction_cache.entries, {})
+
+
+class TestCanonicalCSS(TestCase):
+    def test_order_and_format_independent(self):
+        human_readable = b'.bold {\n    font-weight: bold\n    }\n.padding-10 {\n    padding: 10px\n    }'
+        minified = b'.padding-10{padding:10px}.bold{font-weight:bold}'
+        self.assertEqual(canonical_css(css_text=human_readable), canonical_css(css_text=minified))
+
+        digest, class_set = canonical_css(
+            css_text=b'@media only screen and (max-width: 30em) {.c-red-small-down {color: red}}'
+                     b'.c-blue-hover:hover {color: blue}'
+        )
+        self.assertEqual(class_set, {'c-red-small-down', 'c-blue-hover'})
+        self.assertNotEqual(digest, canonical_css(css_text=minified)[0])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtin
+from unittest import TestCase, main
+from io import open
+import os
+
+# custom
+from blowdrycss.filehandler import FileManifest
+from blowdrycss.utilities import unittest_file_path, change_settings_for_testing, delete_file_paths, make_directory
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestFileManifest(TestCase):
+    def setUp(self):
+        self.project_directory = settings.project_directory
+        self.file_types = settings.file_types
+        settings.project_directory = unittest_file_path(folder='test_manifest')
+        settings.file_types = ('*.html', )
+        make_directory(settings.project_directory)
+        self.html_file = unittest_file_path(folder='test_manifest', filename='manifest.html')
+        self.txt_file = unittest_file_path(folder='test_manifest', filename='manifest.txt')
+        for file_path in (self.html_file, self.txt_file):
+            with open(file_path, 'w') as _file:
+                _file.write('<html><div class="bold"></div></html>')
+
+    def tearDown(self):
+        delete_file_paths((self.html_file, self.txt_file, self.html_file + '.new.html'))
+        os.rmdir(settings.project_directory)
+        settings.project_directory = self.project_directory
+        settings.file_types = self.file_types
+
+    def test_entries_only_contain_file_types(self):
+        file_manifest = FileManifest()
+        self.assertEqual(set(file_manifest.entries), {self.html_file})
+        size, mtime_ns, inode = file_manifest.entries[self.html_file]
+        self.assertEqual(size, os.stat(self.html_file).st_size)
+
+    def test_has_drifted_false(self):
+        file_manifest = FileManifest()
+        with open(self.txt_file, 'w') as _file:                     # Not a file_type.
+            _file.write('changed')
+        self.assertFalse(file_manifest.has_drifted())
+
+    def test_has_drifted_modified(self):
+        file_manifest = FileManifest()
+        with open(self.html_file, 'w') as _file:
+            _file.write('<html><div class="bold italic"></div></html>')
+        self.assertTrue(file_manifest.has_drifted())
+        file_manifest.refresh()
+        self.assertFalse(file_manifest.has_drifted())
+
+    def test_has_drifted_created_and_deleted(self):
+        file_manifest = FileManifest()
+        with open(self.html_file + '.new.html', 'w') as _file:
+            _file.write('<html></html>')
+        self.assertTrue(file_manifest.has_drifted())
+        file_manifest.refresh()
+        os.remove(self.html_file + '.new.html')
+        self.assertTrue(file_manifest.has_drifted())
+
+    def test_poll_no_changes(self):
+        file_manifest = FileManifest()
+        self.assertEqual(list(file_manifest.poll()), [])
+
+    def test_poll_yields_changed_paths(self):
+        file_manifest = FileManifest()
+        new_html_file = self.html_file + '.new.html'
+        with open(new_html_file, 'w') as _file:
+            _file.write('<html></html>')
+        self.assertEqual(list(file_manifest.poll()), [new_html_file])
+        self.assertEqual(list(file_manifest.poll()), [])
+        os.remove(new_html_file)
+        self.assertEqual(list(file_manifest.poll()), [new_html_file])
+        self.assertFalse(new_html_file in file_manifest.entries)
+
+    def test_poll_budget_resumes(self):
+        file_manifest = FileManifest()
+        new_html_file = self.html_file + '.new.html'
+        with open(new_html_file, 'w') as _file:
+            _file.write('<html></html>')
+        with open(self.html_file, 'w') as _file:
+            _file.write('<html><div class="bold italic"></div></html>')
+        changed_paths = []
+        for _ in range(2):                                          # Two files stat'd one per call.
+            changed_paths += list(file_manifest.poll(budget=1))
+        self.assertEqual(set(changed_paths), {self.html_file, new_html_file})
+        self.assertEqual(list(file_manifest.poll(budget=1)), [])
+
+
+if __name__ == '__main__':
+    main()
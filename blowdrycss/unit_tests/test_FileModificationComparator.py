@@ -187,5 +187,18 @@ class TestFileModificationComparator(TestCase):
         settings.css_directory = css_directory                                      # Reset Settings
 
 
+    def test_is_newer_reference_time(self):
+        make_directory(unittest_file_path(folder='test_recent'))
+        temp_file = unittest_file_path('test_recent', 'temp.html')                  # Create a temporary file
+        with open(temp_file, 'w') as generic_file:
+            generic_file.write('.bold {font-weight: bold}')
+        modified_time = os.path.getmtime(temp_file)
+
+        self.assertTrue(FileModificationComparator(reference_time=modified_time - 1).is_newer(temp_file))
+        self.assertFalse(FileModificationComparator(reference_time=modified_time + 1).is_newer(temp_file))
+
+        delete_file_paths((temp_file, ))
+
+
 if __name__ == '__main__':
     main()
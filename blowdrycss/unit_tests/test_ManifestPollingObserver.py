@@ -0,0 +1,92 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtin
+from unittest import TestCase, main
+from tempfile import mkdtemp
+from shutil import rmtree
+from time import sleep
+from io import open
+import os
+
+# plugins
+from watchdog.events import FileSystemEventHandler, FileModifiedEvent, FileDeletedEvent
+
+# custom
+from blowdrycss.pollingobserver import ManifestPollingObserver
+from blowdrycss.utilities import change_settings_for_testing
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class RecordingEventHandler(FileSystemEventHandler):
+    def __init__(self):
+        super(RecordingEventHandler, self).__init__()
+        self.events = []
+
+    def on_any_event(self, event):
+        self.events.append(event)
+
+
+class TestManifestPollingObserver(TestCase):
+    def setUp(self):
+        self.file_types = settings.file_types
+        settings.file_types = ('*.html', )
+        self.temp_directory = mkdtemp()
+        os.mkdir(os.path.join(self.temp_directory, 'nested'))
+        self.html_file = os.path.join(self.temp_directory, 'nested', 'poll.html')
+        with open(self.html_file, 'w') as _file:
+            _file.write('<html></html>')
+
+    def tearDown(self):
+        rmtree(self.temp_directory)
+        settings.file_types = self.file_types
+
+    def test_tick_dispatches_modified_and_deleted(self):
+        event_handler = RecordingEventHandler()
+        observer = ManifestPollingObserver(interval=1, budget=0)
+        observer.schedule(event_handler, self.temp_directory, recursive=True)
+
+        observer.tick()
+        self.assertEqual(event_handler.events, [])
+
+        with open(self.html_file, 'w') as _file:
+            _file.write('<html><div class="bold"></div></html>')
+        with open(os.path.join(self.temp_directory, 'ignored.txt'), 'w') as _file:
+            _file.write('not a file_type')
+        observer.tick()
+        self.assertEqual(len(event_handler.events), 1)
+        self.assertTrue(isinstance(event_handler.events[0], FileModifiedEvent))
+        self.assertEqual(event_handler.events[0].src_path, self.html_file)
+
+        os.remove(self.html_file)
+        observer.tick()
+        self.assertEqual(len(event_handler.events), 2)
+        self.assertTrue(isinstance(event_handler.events[1], FileDeletedEvent))
+
+    def test_start_stop(self):
+        event_handler = RecordingEventHandler()
+        observer = ManifestPollingObserver(interval=0.01, budget=1)
+        observer.schedule(event_handler, self.temp_directory, recursive=True)
+        observer.start()
+        with open(self.html_file, 'w') as _file:
+            _file.write('<html><div class="italic"></div></html>')
+
+        count = 0
+        while not event_handler.events and count < 100:             # Max wait is 1 second.
+            sleep(0.01)
+            count += 1
+
+        observer.stop()
+        observer.join()
+        self.assertFalse(observer.is_alive())
+        self.assertEqual(event_handler.events[0].src_path, self.html_file)
+
+
+if __name__ == '__main__':
+    main()
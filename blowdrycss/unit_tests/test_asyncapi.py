@@ -0,0 +1,104 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main, skipIf
+from io import StringIO
+from os import listdir
+from shutil import rmtree
+from tempfile import mkdtemp
+import sys
+
+if sys.version_info >= (3, 7):                      # asyncapi uses async generators and get_running_loop().
+    from asyncio import CancelledError, new_event_loop, set_event_loop
+    from concurrent.futures import ThreadPoolExecutor
+
+# custom
+if sys.version_info >= (3, 7):
+    from blowdrycss.asyncapi import parse_async
+from blowdrycss.blowdry import parse
+from blowdrycss.config import Config
+from blowdrycss.utilities import change_settings_for_testing, unittest_file_path
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+@skipIf(sys.version_info < (3, 7), 'blowdrycss.asyncapi requires Python 3.7+')
+class TestParseAsync(TestCase):
+    def setUp(self):
+        self.css_directory = settings.css_directory
+        settings.css_directory = mkdtemp()
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        set_event_loop(None)
+        rmtree(settings.css_directory)
+        settings.css_directory = self.css_directory
+
+    def test_progress_and_result(self):
+        updates = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = self.loop.run_until_complete(parse_async(
+                project_directory=unittest_file_path(),
+                config=Config.from_settings(),
+                executor=executor,
+                read_concurrency=2,
+                progress=updates.append,
+            ))
+
+        stages = [update.stage for update in updates]
+        self.assertEqual(stages[0], 'discover')
+        self.assertEqual(stages[-3:], ['build', 'write', 'done'])
+        self.assertTrue(len(stages) > 5, msg=stages)                            # More than one read batch.
+        reads = [update for update in updates if update.stage == 'read']
+        self.assertEqual(reads[-1].done, updates[0].total)
+        self.assertTrue(result.class_set)
+        self.assertEqual(updates[-1].result, result)
+        self.assertEqual(
+            sorted(listdir(settings.css_directory)),
+            sorted([settings.output_file_name + settings.output_extension,
+                    settings.output_file_name + '.min' + settings.output_extension]),
+        )
+
+    def test_matches_parse(self):
+        project_directory = settings.project_directory
+        saved_stdout = sys.stdout
+        try:
+            settings.project_directory = unittest_file_path()
+            sys.stdout = StringIO()
+            class_set, _ = parse(recent=False, class_set=set(), css_text=b'')
+        finally:
+            sys.stdout = saved_stdout
+            settings.project_directory = project_directory
+
+        result = self.loop.run_until_complete(parse_async(project_directory=unittest_file_path(), write=False))
+        self.assertEqual(result.class_set, class_set)
+
+    def test_cancellation(self):
+        seen = []
+
+        def progress(update):
+            seen.append(update.stage)
+            task.cancel()                                                       # Stops at the next await.
+
+        task = self.loop.create_task(
+            parse_async(project_directory=unittest_file_path(), read_concurrency=1, progress=progress)
+        )
+        with self.assertRaises(CancelledError):
+            self.loop.run_until_complete(task)
+        self.assertEqual(seen, ['discover'])
+        self.assertEqual(listdir(settings.css_directory), [])                   # Nothing was written.
+
+    def test_not_a_directory(self):
+        with self.assertRaises(NotADirectoryError):
+            self.loop.run_until_complete(parse_async(project_directory=unittest_file_path('does_not_exist')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+from io import StringIO
+from json import dump
+from os import listdir, makedirs, path
+from shutil import rmtree
+from tempfile import mkdtemp
+import sys
+
+# custom
+from blowdrycss.batch import Project, config_key, decode_cache, load_projects, run_batch
+from blowdrycss.config import Config
+from blowdrycss.utilities import change_settings_for_testing, unittest_file_path
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestBatch(TestCase):
+    def setUp(self):
+        self.temporary_directory = mkdtemp()
+        self.saved_stdout = sys.stdout
+        sys.stdout = StringIO()                                                 # Silence the summary lines.
+        decode_cache.clear()
+
+    def tearDown(self):
+        sys.stdout = self.saved_stdout
+        rmtree(self.temporary_directory)
+
+    def write_projects(self, entries):
+        file_path = path.join(self.temporary_directory, 'projects.json')
+        with open(file_path, 'w') as projects_file:
+            dump(entries, projects_file)
+        return file_path
+
+    def test_load_projects(self):
+        file_path = self.write_projects([
+            {'project_directory': unittest_file_path(), 'css_directory': 'site1'},
+            {'project_directory': '.', 'output_file_name': 'site', 'overrides': {'use_em': False}},
+        ])
+        first, second = load_projects(file_path=file_path)
+        self.assertEqual(first.css_directory, path.join(self.temporary_directory, 'site1'))    # Relative path.
+        self.assertEqual(first.output_file_name, settings.output_file_name)
+        self.assertEqual(first.overrides, {})
+        self.assertEqual(second.project_directory, path.join(self.temporary_directory, '.'))
+        self.assertEqual(second.css_directory, path.join(self.temporary_directory, '.', 'css'))   # Not shared.
+        self.assertEqual(second.output_extension, settings.output_extension)
+        self.assertEqual(second.overrides, {'use_em': False})
+
+    def test_invalid_projects(self):
+        for entries, error in (
+                ([{'project_directory': '.', 'output_directory': 'css'}], ValueError),
+                ([{'project_directory': '.', 'overrides': {'project_directory': 'x'}}], ValueError),
+                ([{'project_directory': 'does_not_exist'}], OSError),
+                ([{'project_directory': '.', 'css_directory': 'css'}, {'project_directory': '.'}], ValueError),
+        ):
+            with self.assertRaises(error):
+                load_projects(file_path=self.write_projects(entries))
+
+    def build(self, jobs=1):
+        projects = [
+            Project.from_dict(values={
+                'project_directory': unittest_file_path(),
+                'css_directory': path.join(self.temporary_directory, name),
+                'output_file_name': name,
+                'overrides': overrides,
+            })
+            for name, overrides in (
+                ('em', {}), ('em_copy', {}), ('px', {'use_em': False, 'human_readable': False}),
+            )
+        ]
+        return run_batch(projects=projects, jobs=jobs)
+
+    def test_run_batch(self):
+        em, em_copy, px = self.build(jobs=1)
+        self.assertFalse(em.cached)
+        self.assertTrue(em_copy.cached)                                         # Same classes and config.
+        self.assertTrue((config_key(Config.from_settings()), 'bold') in decode_cache)     # Cached per class.
+        self.assertFalse(px.cached)
+        self.assertEqual(em.result.css, em_copy.result.css)
+        self.assertTrue(em.result.class_set)
+        self.assertNotEqual(px.result.minified_css, em.result.minified_css)     # Per-project override.
+
+        self.assertEqual(sorted(listdir(path.join(self.temporary_directory, 'em'))), ['em.css', 'em.min.css'])
+        self.assertEqual(listdir(path.join(self.temporary_directory, 'px')), ['px.min.css'])
+        self.assertEqual(px.written, [path.join(self.temporary_directory, 'px', 'px.min.css')])
+
+    def test_shared_classes_are_decoded_once(self):
+        html = {'one': '<div class="bold padding-10">', 'two': '<div class="bold margin-5">'}
+        projects = []
+        for name, text in sorted(html.items()):
+            project_directory = path.join(self.temporary_directory, name)
+            makedirs(project_directory)
+            with open(path.join(project_directory, 'index.html'), 'w') as html_file:
+                html_file.write(text)
+            projects.append(Project.from_dict(values={'project_directory': project_directory}))
+
+        one, two = run_batch(projects=projects)
+        self.assertFalse(two.cached)                                            # margin-5 is new.
+        self.assertEqual(two.result.class_set, {'bold', 'margin-5'})
+        self.assertFalse('padding' in two.result.minified_css)
+        self.assertEqual(two.written[-1], path.join(self.temporary_directory, 'two', 'css', 'blowdry.min.css'))
+
+        one, two = run_batch(projects=projects)
+        self.assertTrue(one.cached and two.cached)
+
+    def test_failed_project(self):
+        broken_directory = path.join(self.temporary_directory, 'broken')
+        makedirs(broken_directory)
+        with open(path.join(broken_directory, 'index.html'), 'wb') as html_file:
+            html_file.write(b'<div class="bold">\xff</div>')                   # Not UTF-8.
+        projects = [
+            Project.from_dict(values={'project_directory': broken_directory}),
+            Project.from_dict(values={
+                'project_directory': unittest_file_path(), 'css_directory': self.temporary_directory,
+            }),
+        ]
+        with self.assertLogs(level='ERROR'):
+            broken, built = run_batch(projects=projects)
+        self.assertTrue(broken.error.startswith('UnicodeDecodeError'), msg=broken.error)
+        self.assertEqual((broken.result, broken.written), (None, []))
+        self.assertEqual(built.error, None)
+        self.assertTrue(built.result.class_set)
+        self.assertTrue('failed, UnicodeDecodeError' in sys.stdout.getvalue())
+
+    def test_run_batch_in_worker_pool(self):
+        serial = [summary.result.minified_css for summary in self.build(jobs=1)]
+        parallel = self.build(jobs=2)
+        self.assertEqual([summary.result.minified_css for summary in parallel], serial)    # Order is kept.
+
+
+if __name__ == '__main__':
+    main()
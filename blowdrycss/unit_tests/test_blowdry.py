@@ -5,10 +5,14 @@ from builtins import bytes
 from unittest import TestCase, main
 import sys
 from io import StringIO
+from json import loads
+from shutil import rmtree
+from tempfile import mkdtemp
 import os
 
 # custom
 from blowdrycss.utilities import unittest_file_path, delete_file_paths
+from blowdrycss.timing import RunReport
 import blowdrycss.blowdry as blowdry
 import blowdrycss_settings as settings
 
@@ -37,7 +41,7 @@ class TestMain(TestCase):
             if os.path.isfile(expected_file):
                 os.remove(expected_file)
 
-        blowdry.boilerplate()                                                       # Run It
+        blowdry.boilerplate().join()                                                # Run It. Wait for the docs.
 
         for expected_file in expected_files:
             self.assertTrue(os.path.isfile(expected_file), msg=expected_file)
@@ -68,7 +72,7 @@ class TestMain(TestCase):
             if os.path.isfile(expected_file):
                 os.remove(expected_file)
 
-        blowdry.boilerplate()
+        blowdry.boilerplate().join()
 
         for expected_file in expected_files:
             self.assertTrue(os.path.isfile(expected_file), msg=expected_file)
@@ -79,6 +83,54 @@ class TestMain(TestCase):
         settings.docs_directory = docs_directory
         settings.rst_docs = rst_docs
 
+    def test_write_alias_docs_skips_unchanged(self):
+        markdown_directory = settings.markdown_directory
+        alias_cache_directory = settings.alias_cache_directory
+        settings.markdown_directory = mkdtemp()
+        settings.alias_cache_directory = mkdtemp()
+        clashing_path = os.path.join(settings.markdown_directory, 'clashing_aliases.md')
+        property_path = os.path.join(settings.markdown_directory, 'property_aliases.md')
+        try:
+            blowdry.write_alias_docs(doc_formats=('markdown', ))
+            first_stat = os.stat(property_path)
+
+            blowdry.write_alias_docs(doc_formats=('markdown', ))                 # Unchanged. Not rewritten.
+            self.assertEqual(os.stat(property_path).st_mtime_ns, first_stat.st_mtime_ns)
+            self.assertEqual(os.stat(property_path).st_ino, first_stat.st_ino)
+
+            os.remove(clashing_path)                                            # Missing file. Regenerate.
+            blowdry.write_alias_docs(doc_formats=('markdown', ))
+            self.assertTrue(os.path.isfile(clashing_path))
+
+            with open(property_path, 'w') as property_file:                    # Edited file. Regenerate.
+                property_file.write('edited')
+            blowdry.write_alias_docs(doc_formats=('markdown', ))
+            with open(property_path, 'r') as property_file:
+                self.assertTrue(property_file.read().startswith('# Valid Property Aliases'))
+        finally:
+            rmtree(settings.markdown_directory)
+            rmtree(settings.alias_cache_directory)
+            settings.markdown_directory = markdown_directory
+            settings.alias_cache_directory = alias_cache_directory
+
+    def test_docs_thread_reraises(self):
+        markdown_directory = settings.markdown_directory
+        alias_cache_directory = settings.alias_cache_directory
+        settings.alias_cache_directory = mkdtemp()
+        not_a_directory = os.path.join(settings.alias_cache_directory, 'file')
+        open(not_a_directory, 'w').close()
+        settings.markdown_directory = os.path.join(not_a_directory, 'markdown')  # IO failure in the thread.
+        try:
+            docs_thread = blowdry.DocsThread(doc_formats=('markdown', ))
+            with self.assertLogs(level='ERROR'):
+                docs_thread.start()
+                with self.assertRaises(OSError):
+                    docs_thread.join()
+        finally:
+            rmtree(settings.alias_cache_directory)
+            settings.markdown_directory = markdown_directory
+            settings.alias_cache_directory = alias_cache_directory
+
     def test_parse(self):
         expected_class_set = {
             u'medium-up', u'border-1px-solid-gray', u'padding-5', u'margin-top-10', u'display-none',
@@ -115,6 +167,33 @@ class TestMain(TestCase):
             sys.stdout = saved_stdout
             settings.project_directory = project_directory
 
+    def test_parse_run_report(self):
+        project_directory, run_report_path = settings.project_directory, settings.run_report_path
+        settings.project_directory = unittest_file_path()
+        temporary_directory = mkdtemp()
+        settings.run_report_path = os.path.join(temporary_directory, 'report.json')
+
+        saved_stdout = sys.stdout
+        try:
+            sys.stdout = StringIO()
+            report = RunReport()
+            class_set, css_text = blowdry.parse(recent=False, class_set=set(), css_text=b'', report=report)
+
+            for stage in ('discovery', 'extraction', 'filtering', 'build', 'write'):
+                self.assertTrue(stage in report.stages, msg=report.stages)
+            self.assertEqual(report.counts['valid_classes'], len(class_set))
+            self.assertEqual(report.counts['raw_classes'] - report.counts['removed_classes'], len(class_set))
+            self.assertTrue(report.counts['files'] > 0 and report.counts['bytes_read'] > 0, msg=report.counts)
+            self.assertEqual(len(report.file_costs), report.counts['files'])
+            self.assertTrue(set(class_set) <= set(report.class_costs), msg=report.class_costs)
+
+            with open(settings.run_report_path) as report_file:
+                self.assertEqual(loads(report_file.read())['counts']['valid_classes'], len(class_set))
+        finally:
+            sys.stdout = saved_stdout
+            settings.project_directory, settings.run_report_path = project_directory, run_report_path
+            rmtree(temporary_directory)
+
     def test_parse_on_modify_class_set(self):
         expected_class_set = {
             'green', 'purple-medium-up', 'bgc-h454545',                                     # Pre-existing
@@ -216,6 +295,127 @@ class TestMain(TestCase):
             settings.css_directory = css_directory
             delete_file_paths((css_file, css_min_file, modify_file, ))
 
+    def test_fast_parse_appends_new_classes(self):
+        expected_css_text = '.green {\n    color: green\n    }\n.pink-hover:hover {\n    color: pink\n    }'
+        expected_min_css_text = '.green{color:green}.pink-hover:hover{color:pink}'
+
+        css_directory = settings.css_directory
+        settings.css_directory = unittest_file_path()
+
+        css_file = unittest_file_path(filename='blowdry.css')                                       # CSS file
+        css_min_file = unittest_file_path(filename='blowdry.min.css')                               # CSS.min file
+        with open(css_file, 'w') as generic_file:
+            generic_file.write('.green {\n    color: green\n    }')
+        with open(css_min_file, 'w') as generic_file:
+            generic_file.write('.green{color:green}')
+
+        modify_file = unittest_file_path(filename='modify.html')                                    # Modify file
+        with open(modify_file, 'w') as generic_file:
+            generic_file.write('<html><div class="GREEN pink-hover not-valid">Modified</div></html>')
+
+        saved_stdout = sys.stdout
+        try:
+            out = StringIO()
+            sys.stdout = out
+
+            class_set, css_text = blowdry.fast_parse(
+                file_path=modify_file, class_set={'green', }, css_text=b'.green{color:green}'
+            )
+            self.assertEqual(class_set, {'green', 'pink-hover', })
+            self.assertTrue(css_text.startswith(b'.green{color:green}'), msg=css_text)
+            self.assertTrue(b'pink' in css_text, msg=css_text)
+            self.assertTrue('Fast path: 1 class selector(s) added' in out.getvalue(), msg=out.getvalue())
+
+            with open(css_file, 'r') as generic_file:
+                self.assertEqual(generic_file.read(), expected_css_text)
+            with open(css_min_file, 'r') as generic_file:
+                self.assertEqual(generic_file.read(), expected_min_css_text)
+
+            # Nothing new. Nothing is written.
+            same_class_set, same_css_text = blowdry.fast_parse(
+                file_path=modify_file, class_set=class_set, css_text=css_text
+            )
+            self.assertEqual(same_class_set, class_set)
+            self.assertEqual(same_css_text, css_text)
+            with open(css_file, 'r') as generic_file:
+                self.assertEqual(generic_file.read(), expected_css_text)
+        finally:
+            sys.stdout = saved_stdout
+            settings.css_directory = css_directory
+            delete_file_paths((css_file, css_min_file, modify_file, ))
+
+
+class TestCheck(TestCase):
+    def setUp(self):
+        self.saved = dict(
+            (name, getattr(settings, name))
+            for name in ('project_directory', 'css_directory', 'alias_cache_directory', 'extraction_cache_enabled')
+        )
+        self.temporary_directory = mkdtemp()
+        settings.project_directory = unittest_file_path()
+        settings.css_directory = os.path.join(self.temporary_directory, 'css')
+        settings.alias_cache_directory = os.path.join(self.temporary_directory, 'cache')
+        self.css_path = os.path.join(settings.css_directory, settings.output_file_name + settings.output_extension)
+        self.min_path = os.path.join(
+            settings.css_directory, settings.output_file_name + '.min' + settings.output_extension
+        )
+        self.saved_stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.saved_stdout
+        for name, value in self.saved.items():
+            setattr(settings, name, value)
+        rmtree(self.temporary_directory)
+
+    def snapshot(self):
+        """ :return: (*dict*) -- Returns ``{path: stat signature}`` of every file in the temporary directory. """
+        file_paths = [
+            os.path.join(directory, file_name)
+            for directory, _, file_names in os.walk(self.temporary_directory) for file_name in file_names
+        ]
+        return dict((file_path, (os.stat(file_path).st_size, os.stat(file_path).st_mtime)) for file_path in file_paths)
+
+    def test_check_current(self):
+        for extraction_cache_enabled in (False, True):
+            settings.extraction_cache_enabled = extraction_cache_enabled
+            class_set, _ = blowdry.parse(recent=False, class_set=set(), css_text=b'')
+            before = self.snapshot()
+
+            check_result = blowdry.check()
+            self.assertTrue(check_result.current, msg=check_result)
+            self.assertEqual(check_result.missing_class_set, set())
+            self.assertEqual(self.snapshot(), before)                           # Nothing was written.
+            self.assertTrue(class_set)
+
+    def test_check_missing_file(self):
+        check_result = blowdry.check()
+        self.assertFalse(check_result.current)
+        self.assertEqual(check_result.stale_files, [self.css_path, self.min_path])
+        self.assertFalse(os.path.isdir(settings.css_directory))
+
+    def test_check_extra_class(self):
+        blowdry.parse(recent=False, class_set=set(), css_text=b'')
+        with open(self.min_path, 'a') as css_file:
+            css_file.write('.margin-top-999{margin-top:999px}')
+
+        check_result = blowdry.check()
+        self.assertFalse(check_result.current)
+        self.assertEqual(check_result.extra_class_set, {'margin-top-999'})      # Proven before decoding.
+
+    def test_check_missing_class(self):
+        class_set, _ = blowdry.parse(recent=False, class_set=set(), css_text=b'')
+        removed_class = sorted(class_set)[0]
+        with open(self.css_path, 'w') as css_file:                              # Rebuild without one class.
+            css_file.write(blowdry.build_css(class_set=class_set.difference({removed_class}))[1].decode('utf-8'))
+
+        check_result = blowdry.check()
+        self.assertFalse(check_result.current)
+        self.assertEqual(check_result.missing_class_set, {removed_class}, msg=check_result)
+        self.assertEqual(check_result.stale_files, [self.css_path])
+        self.assertTrue('Missing class selectors (1): ' + removed_class in sys.stdout.getvalue())
+
+
 if __name__ == '__main__':
     main()
 
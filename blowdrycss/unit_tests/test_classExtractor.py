@@ -298,6 +298,19 @@ class TestClassExtractor(TestCase):
         actual_class_set = class_extractor.class_set
         self.assertEqual(actual_class_set, expected_class_set)
 
+    def test_class_set_reads_the_file_once(self):
+        class CountingExtractor(ClassExtractor):
+            reads = 0
+
+            @property
+            def raw_class_list(self):
+                CountingExtractor.reads += 1
+                return super(CountingExtractor, self).raw_class_list
+
+        class_extractor = CountingExtractor(file_path=unittest_file_path('test_erb', 'test.erb'))
+        self.assertTrue(class_extractor.class_set)
+        self.assertEqual(CountingExtractor.reads, 1)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,84 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main, skipIf
+from os import environ, getcwd, path
+from tempfile import gettempdir
+import subprocess
+import sys
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+@skipIf(sys.version_info < (3, 7), '-X importtime requires Python 3.7+')
+class TestCLIImportTime(TestCase):
+    """ Regression check of what a one-shot ``blowdrycss`` run imports, and how long that takes. """
+    import_time_budget = 3.0                        # Seconds. Generous on purpose. Catches regressions, not noise.
+
+    def import_times(self):
+        """ :return: (*dict*) -- Returns ``{module name: cumulative import time in seconds}`` for a fresh
+        interpreter importing the modules needed by a one-shot run.
+        """
+        package_parent = path.dirname(path.dirname(path.dirname(path.abspath(__file__))))
+        process = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c', 'import blowdrycss.cli, blowdrycss.blowdry'],
+            cwd=getcwd(),                           # blowdrycss_settings.py was written here by the test run.
+            env=dict(environ, PYTHONPATH=package_parent, HOME=gettempdir()),    # Not the real ~/.cache.
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        _, stderr = process.communicate()
+        self.assertEqual(process.returncode, 0, msg=stderr)
+
+        import_times = {}
+        for line in stderr.decode('utf-8').splitlines():
+            if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+                _, cumulative, module_name = line[len('import time:'):].split('|')
+                import_times[module_name.strip()] = int(cumulative) / 1e6
+        return import_times
+
+    def test_one_shot_imports(self):
+        import_times = self.import_times()
+        self.assertTrue('blowdrycss.blowdry' in import_times, msg=sorted(import_times))
+        for deferred in ('watchdog', 'pypandoc', 'blowdrycss.watchdogwrapper', 'blowdrycss.pollingobserver'):
+            self.assertFalse(deferred in import_times, msg=deferred + ' must not be imported by a one-shot run.')
+
+        total = import_times['blowdrycss.cli'] + import_times['blowdrycss.blowdry']
+        self.assertLess(total, self.import_time_budget, msg=str(total) + ' seconds')
+
+
+class TestCLIArguments(TestCase):
+    def test_parse_arguments(self):
+        from blowdrycss.cli import parse_arguments
+        arguments = parse_arguments(argv=[])
+        self.assertFalse(arguments.profile)
+        self.assertEqual(arguments.profile_every, None)
+        self.assertFalse(arguments.memory_profile)
+        self.assertEqual(arguments.top, None)
+
+        arguments = parse_arguments(argv=['--profile', '--profile-every', '10', '--memory-profile', '--top', '5'])
+        self.assertTrue(arguments.profile)
+        self.assertEqual(arguments.profile_every, 10)
+        self.assertTrue(arguments.memory_profile)
+        self.assertEqual(arguments.top, 5)
+
+    def test_parse_batch_arguments(self):
+        from blowdrycss.cli import parse_arguments
+        arguments = parse_arguments(argv=[])
+        self.assertEqual(arguments.batch, None)
+        self.assertEqual(arguments.jobs, 1)
+
+        arguments = parse_arguments(argv=['--batch', 'projects.json', '--jobs', '4'])
+        self.assertEqual(arguments.batch, 'projects.json')
+        self.assertEqual(arguments.jobs, 4)
+
+    def test_parse_check_argument(self):
+        from blowdrycss.cli import parse_arguments
+        self.assertFalse(parse_arguments(argv=[]).check)
+        self.assertTrue(parse_arguments(argv=['--check']).check)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+from io import StringIO
+from threading import Thread
+import sys
+
+# custom
+from blowdrycss.compiler import compile_css
+from blowdrycss.config import Config
+from blowdrycss.utilities import change_settings_for_testing
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestCompileCSS(TestCase):
+    def setUp(self):
+        self.saved_stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.saved_stdout
+
+    def test_compile_css_in_memory(self):
+        sources = [
+            ('templates/index.html', '<div class="padding-10 Bold row"><!-- class="margin-5" --></div>'),
+            ('static/app.js', 'element.classList.add("margin-top-20");'),
+            ('notes.txt', 'class="display-none"'),
+        ]
+        result = compile_css(sources=sources, config=Config(use_em=False, minify=False))
+        self.assertEqual(result.class_set, {'padding-10', 'bold', 'margin-top-20'})
+        self.assertEqual(result.removed_class_set, {'row'})
+        self.assertEqual(result.diagnostics, ['notes.txt: unsupported file extension.'])
+        self.assertTrue('padding: 10px' in result.css, msg=result.css)
+        self.assertTrue('margin-top: 20px' in result.css, msg=result.css)
+        self.assertEqual(result.minified_css, '')
+
+    def test_builders_are_quiet(self):
+        compile_css(sources=[('index.html', '<div class="padding-10-medium-up">')], config=Config())
+        self.assertEqual(sys.stdout.getvalue(), '')                             # No "CSSBuilder Running..."
+
+    def test_config_is_explicit(self):
+        use_em = settings.use_em
+        try:
+            settings.use_em = False                                             # Ignored by compile_css.
+            result = compile_css(sources=[('a.html', '<b class="padding-16">')], config=Config(use_em=True))
+        finally:
+            settings.use_em = use_em
+        self.assertEqual(result.minified_css, '.padding-16{padding:1em}')
+
+    def test_concurrent_builds(self):
+        sources = [('index.html', '<div class="padding-32 margin-8-medium-up">x</div>')]
+        configs = [Config(use_em=True), Config(use_em=False), Config(base=32), Config(media_queries_enabled=False)]
+        expected = [compile_css(sources=sources, config=config).minified_css for config in configs]
+        self.assertEqual(len(set(expected)), len(configs))
+
+        results = {}
+
+        def build(index):
+            results[index] = compile_css(sources=sources, config=configs[index % len(configs)]).minified_css
+
+        threads = [Thread(target=build, args=(index, )) for index in range(4 * len(configs))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for index, minified_css in results.items():
+            self.assertEqual(minified_css, expected[index % len(configs)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+from copy import copy
+
+# custom
+from blowdrycss.config import Config
+from blowdrycss.utilities import change_settings_for_testing
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestConfig(TestCase):
+    def test_defaults_match_settings(self):
+        self.assertEqual(Config().breakpoints, Config.from_settings().breakpoints)
+        self.assertEqual(Config(base=10).breakpoints['medium'], ('48.1em', '72.0em'))
+
+    def test_from_settings_overrides(self):
+        config = Config.from_settings(use_em=not settings.use_em)
+        self.assertEqual(config.use_em, not settings.use_em)
+        self.assertEqual(config.base, settings.base)
+        self.assertEqual(config.file_types, tuple(settings.file_types))
+        self.assertEqual(config.px_to_em(pixels='-24'), settings.px_to_em(pixels='-24'))
+        self.assertEqual(config.px_to_em(pixels='24px'), '24px')
+
+    def test_derived_tables(self):
+        config = Config(use_em=False, file_types=('*.html', '*.jinja2'))
+        self.assertEqual(config.units, 'px')
+        self.assertEqual(config.file_extensions, ('.html', '.jinja2'))
+        self.assertEqual(config.breakpoint_dict['-medium']['-only'], settings.medium)
+        self.assertEqual(config.breakpoint_dict['-medium']['-down'], settings.medium[1])
+        self.assertEqual(config.breakpoint_dict['-medium']['-up'], settings.medium[0])
+        self.assertTrue(config.is_file_type('index.jinja2'))
+        self.assertFalse(config.is_file_type('index.jinja'))
+        self.assertFalse(Config(file_types=()).is_file_type('index.html'))
+
+    def test_immutable(self):
+        config = Config()
+        with self.assertRaises(AttributeError):
+            config.use_em = False
+        with self.assertRaises(TypeError):
+            config.breakpoint_dict['-custom'] = {}
+
+    def test_replace_recomputes_derived_fields(self):
+        config = Config()._replace(use_em=False, base=10)
+        self.assertEqual(config.units, 'px')
+        self.assertEqual(config.breakpoint_dict['-medium']['-up'], Config(base=16).breakpoints['medium'][0])
+        self.assertEqual(Config(base=10)._replace(breakpoints=None).breakpoints['medium'], ('48.1em', '72.0em'))
+        self.assertEqual(copy(config), config)
+
+
+if __name__ == '__main__':
+    main()
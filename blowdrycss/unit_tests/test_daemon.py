@@ -0,0 +1,209 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+from json import dumps, loads
+from io import StringIO
+from os import path, remove
+from shutil import rmtree
+from tempfile import mkdtemp
+import sys
+
+try:                                                # Python 3
+    from http.client import HTTPConnection
+except ImportError:                                 # Python 2.7
+    from httplib import HTTPConnection
+
+# custom
+from blowdrycss.daemon import BlowdryDaemon, DaemonServer
+from blowdrycss.utilities import change_settings_for_testing
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestDaemon(TestCase):
+    def setUp(self):
+        self.saved = settings.project_directory, settings.css_directory, settings.human_readable, settings.minify
+        self.project_directory = mkdtemp()
+        settings.project_directory = self.project_directory
+        settings.css_directory = self.project_directory
+        settings.human_readable = True
+        settings.minify = True
+        self.html_path = path.join(self.project_directory, 'index.html')
+        self.write_html(classes='bold padding-10')
+
+        self.saved_stdout = sys.stdout
+        sys.stdout = StringIO()                                                 # Hide the minification stats.
+        self.blowdry_daemon = BlowdryDaemon()
+        self.server = DaemonServer(blowdry_daemon=self.blowdry_daemon, host='127.0.0.1', port=0)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+        sys.stdout = self.saved_stdout
+        settings.project_directory, settings.css_directory, settings.human_readable, settings.minify = self.saved
+        rmtree(self.project_directory)
+
+    def write_html(self, classes=''):
+        with open(self.html_path, 'w') as html_file:
+            html_file.write('<html><div class="' + classes + '"></div></html>')
+
+    def request(self, method='GET', resource='/', data=None, headers=None):
+        connection = HTTPConnection(self.server.host, self.server.port, timeout=10)
+        body = None if data is None else dumps(data)
+        headers = dict({'Content-Type': 'application/json'} if method == 'POST' else {}, **(headers or {}))
+        connection.request(method, resource, body=body, headers=headers)
+        response = connection.getresponse()
+        content = response.read()
+        connection.close()
+        return response, content
+
+    def test_rebuild_full_then_changed_file(self):
+        response, content = self.request('POST', '/rebuild', data={})
+        summary = loads(content.decode('utf-8'))
+        self.assertEqual(response.status, 200)
+        self.assertEqual(summary['added'], ['bold', 'padding-10'])
+        self.assertTrue(summary['written'])
+        with open(path.join(self.project_directory, 'blowdry.css')) as css_file:
+            self.assertTrue('font-weight: bold' in css_file.read())
+
+        self.write_html(classes='bold italic')
+        response, content = self.request('POST', '/rebuild', data={'files': [self.html_path]})
+        summary = loads(content.decode('utf-8'))
+        self.assertEqual(summary['added'], ['italic'])
+        self.assertEqual(summary['removed'], ['padding-10'])
+        self.assertEqual(summary['classes'], 2)
+
+        response, content = self.request('POST', '/rebuild', data={'files': [self.html_path]})
+        self.assertFalse(loads(content.decode('utf-8'))['written'])                # Nothing changed.
+
+        remove(self.html_path)
+        response, content = self.request('POST', '/rebuild', data={'files': [self.html_path]})
+        summary = loads(content.decode('utf-8'))
+        self.assertEqual(summary['removed'], ['bold', 'italic'])
+        self.assertEqual(self.blowdry_daemon.file_classes, {})
+
+    def test_css_for_classes(self):
+        response, content = self.request('POST', '/css', data={'classes': ['bold', 'not-valid-x9']})
+        result = loads(content.decode('utf-8'))
+        self.assertEqual(result['valid'], ['bold'])
+        self.assertEqual(result['invalid'], ['not-valid-x9'])
+        self.assertTrue('font-weight: bold' in result['css'])
+        self.assertFalse(path.isfile(path.join(self.project_directory, 'blowdry.css')))   # Nothing written.
+        self.assertEqual(self.blowdry_daemon.decode_cache['not-valid-x9'], None)          # Invalid is cached too.
+
+    def test_serve_css_with_etag(self):
+        self.blowdry_daemon.rebuild()
+        response, content = self.request('GET', '/blowdry.css')
+        etag = response.getheader('ETag')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader('Content-Type'), 'text/css')
+        with open(path.join(self.project_directory, 'blowdry.css'), 'rb') as css_file:
+            self.assertEqual(content, css_file.read())
+
+        response, content = self.request('GET', '/blowdry.css', headers={'If-None-Match': etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(content, b'')
+
+        response, content = self.request('GET', '/blowdry.min.css', headers={'If-None-Match': etag})
+        self.assertEqual(response.status, 200)                                 # Different file, different ETag.
+
+        self.write_html(classes='italic')
+        self.blowdry_daemon.rebuild(files=[self.html_path])
+        response, content = self.request('GET', '/blowdry.css', headers={'If-None-Match': etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.getheader('ETag'), etag)
+
+    def test_status_bad_request_and_not_found(self):
+        self.blowdry_daemon.rebuild()
+        response, content = self.request('GET', '/status')
+        status = loads(content.decode('utf-8'))
+        self.assertEqual(status['files'], 1)
+        self.assertEqual(status['classes'], 2)
+        self.assertEqual(sorted(status['output']), ['blowdry.css', 'blowdry.min.css'])
+
+        connection = HTTPConnection(self.server.host, self.server.port, timeout=10)
+        connection.request('POST', '/css', body='not json', headers={'Content-Type': 'application/json'})
+        self.assertEqual(connection.getresponse().status, 400)
+        connection.close()
+
+        response, content = self.request('GET', '/nothing')
+        self.assertEqual(response.status, 404)
+
+    def test_bad_requests(self):
+        response, content = self.request('POST', '/rebuild', data={'files': 'index.html'})
+        self.assertEqual(response.status, 400)
+        self.assertEqual(loads(content.decode('utf-8')), {'error': '"files" must be a JSON list.'})
+
+        def rebuild(files=None):
+            raise IOError('disk full')
+
+        self.blowdry_daemon.rebuild = rebuild
+        with self.assertLogs(level='ERROR'):
+            response, content = self.request('POST', '/rebuild', data={})
+        self.assertEqual(response.status, 500)
+        self.assertEqual(loads(content.decode('utf-8')), {'error': 'disk full'})
+
+    def test_cross_origin_requests(self):
+        outside_directory = mkdtemp()
+        try:
+            outside_path = path.join(outside_directory, 'secret.html')
+            with open(outside_path, 'w') as outside_file:
+                outside_file.write('<div class="bold">')
+            for file_path in (outside_path, path.join(self.project_directory, '..', path.basename(outside_directory))):
+                response, content = self.request('POST', '/rebuild', data={'files': [file_path]})
+                self.assertEqual(response.status, 400)
+                self.assertTrue('outside project_directory' in loads(content.decode('utf-8'))['error'])
+            self.assertEqual(self.blowdry_daemon.file_classes, {})                  # Nothing was read.
+        finally:
+            rmtree(outside_directory)
+
+        response, content = self.request('POST', '/rebuild', data={}, headers={'Content-Type': 'text/plain'})
+        self.assertEqual(response.status, 415)
+
+        response, content = self.request('POST', '/rebuild', data={}, headers={'Origin': 'http://evil.example'})
+        self.assertEqual(response.status, 403)
+        self.assertEqual(self.blowdry_daemon.file_classes, {})
+
+        origin = 'http://127.0.0.1:' + str(self.server.port)
+        response, content = self.request('POST', '/rebuild', data={'files': [self.html_path]}, headers={
+            'Origin': origin, 'Content-Type': 'application/json; charset=utf-8',
+        })
+        self.assertEqual(response.status, 200)
+        self.assertEqual(loads(content.decode('utf-8'))['added'], ['bold', 'padding-10'])
+
+    def test_decode_builds_once(self):
+        from blowdrycss import blowdry
+        build_css = blowdry.build_css
+        calls = []
+
+        def counting_build_css(**kwargs):
+            calls.append(kwargs['class_set'])
+            return build_css(**kwargs)
+
+        blowdry.build_css = counting_build_css
+        try:
+            class_set = {'bold', 'padding-10', 'margin-5-medium-up', 'not-valid-x9'}
+            valid_class_set, css_text = self.blowdry_daemon.decode(class_set=class_set)
+            self.assertEqual(calls, [class_set])                                # One build for every missing class.
+            self.assertEqual(valid_class_set, {'bold', 'padding-10', 'margin-5-medium-up'})
+            self.assertTrue(b'font-weight: bold' in self.blowdry_daemon.decode_cache['bold'])
+            self.assertFalse(b'font-weight' in self.blowdry_daemon.decode_cache['padding-10'])
+            self.assertTrue(self.blowdry_daemon.decode_cache['margin-5-medium-up'].startswith(b'@media'))
+            self.assertEqual(self.blowdry_daemon.decode_cache['not-valid-x9'], None)
+
+            valid_class_set, css_text = self.blowdry_daemon.decode(class_set={'bold', 'Italic'})
+            self.assertEqual(calls, [class_set, {'Italic'}])                    # Only the new class.
+            self.assertEqual(valid_class_set, {'bold', 'Italic'})
+            self.assertTrue(b'font-style: italic' in css_text)
+        finally:
+            blowdry.build_css = build_css
+
+
+if __name__ == '__main__':
+    main()
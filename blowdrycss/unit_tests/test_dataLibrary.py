@@ -2,7 +2,11 @@
 from __future__ import absolute_import
 
 # builtin
-from unittest import TestCase, main
+from unittest import TestCase, main, skipIf
+from os import listdir, path
+from shutil import rmtree
+from tempfile import mkdtemp
+import sys
 
 # custom
 from blowdrycss.datalibrary import DataLibrary
@@ -229,6 +233,29 @@ class TestDataLibrary(TestCase):
         self.data_library.remove_clashing_aliases()
         self.assertEqual(self.data_library.property_alias_dict, expected_clean_dict)
 
+    def test_set_clashing_aliases_matches_pairwise_comparison(self):
+        property_alias_dict = dict(
+            ('property' + str(index), {'own' + str(index) + '-', 'shared' + str(index % 7) + '-', 'all-'})
+            for index in range(50)
+        )
+        property_alias_dict['lonely'] = {'lonely-'}
+        expected_clashes = {}
+        for key1, alias_set1 in property_alias_dict.items():
+            for key2, alias_set2 in property_alias_dict.items():
+                intersection = alias_set1.intersection(alias_set2)
+                if intersection and key1 != key2:
+                    expected_clashes[key1] = expected_clashes.get(key1, set()).union(intersection)
+
+        data_library = DataLibrary()
+        data_library.property_alias_dict = property_alias_dict
+        data_library.set_clashing_aliases()
+        self.assertEqual(data_library.clashing_alias_dict, expected_clashes)
+        self.assertFalse('lonely' in data_library.clashing_alias_dict)
+
+        data_library.remove_clashing_aliases()
+        self.assertEqual(data_library.property_alias_dict['property3'], {'own3-'})
+        self.assertFalse(data_library.property_alias_dict['lonely'] is property_alias_dict['lonely'])   # New sets.
+
     def test_default_property_alias_dict(self):
         self.maxDiff = None
         expected = {
@@ -349,6 +376,81 @@ class TestDataLibrary(TestCase):
         actual = data_library.property_alias_dict
         self.assertEqual(actual, expected, msg=expected)
 
+    def test_alias_docs_are_lazy(self):
+        data_library = DataLibrary()
+        self.assertEqual(data_library.docs, {})                                # Nothing rendered at construction.
+
+        clashing_alias_markdown, property_alias_markdown = data_library.alias_docs(doc_format='markdown')
+        self.assertEqual(list(data_library.docs), ['markdown'])
+        self.assertTrue(clashing_alias_markdown.startswith('# Clashing Aliases'), msg=clashing_alias_markdown)
+        self.assertTrue(property_alias_markdown.startswith('# Valid Property Aliases'), msg=property_alias_markdown)
+        self.assertEqual(data_library.clashing_alias_markdown, clashing_alias_markdown)
+
+        self.assertTrue('<table>' in data_library.property_alias_html)
+        self.assertEqual(sorted(data_library.docs), ['html', 'markdown'])    # reStructuredText is still not built.
+
+    @skipIf(sys.version_info < (3, 7), 'Module level __getattr__ requires Python 3.7+')
+    def test_module_doc_tables(self):
+        from blowdrycss import datalibrary
+        from blowdrycss.datalibrary import clashing_alias_markdown, property_alias_rst     # Still importable.
+        self.assertTrue(clashing_alias_markdown.startswith('# Clashing Aliases'), msg=clashing_alias_markdown)
+        self.assertEqual(datalibrary.property_alias_rst, property_alias_rst)
+        with self.assertRaises(AttributeError):
+            datalibrary.not_a_table
+
+    def test_alias_table_cache(self):
+        alias_cache_directory = settings.alias_cache_directory
+        settings.alias_cache_directory = mkdtemp()
+        try:
+            stale_path = path.join(settings.alias_cache_directory, 'alias_tables-0.0.0-0000000000000000.pickle')
+            with open(stale_path, 'wb') as stale_file:
+                stale_file.write(b'older code')
+            built = DataLibrary()                                               # Cache miss. Build and save.
+            cache_path = built.alias_cache_path()                               # The stale file is deleted.
+            self.assertEqual(listdir(settings.alias_cache_directory), [path.basename(cache_path)])
+
+            loaded = DataLibrary()                                              # Cache hit.
+            for name in DataLibrary.cached_tables:
+                self.assertEqual(getattr(loaded, name), getattr(built, name), msg=name)
+            self.assertEqual(list(loaded.ordered_property_dict), list(built.ordered_property_dict))
+        finally:
+            rmtree(settings.alias_cache_directory)
+            settings.alias_cache_directory = alias_cache_directory
+
+    def test_alias_cache_path_keyed_by_custom_property_alias_dict(self):
+        data_library = DataLibrary()
+        cache_path = data_library.alias_cache_path()
+        data_library.custom_property_alias_dict = {'color': {'c-', 'col-', }, }
+        changed_path = data_library.alias_cache_path()
+        data_library.custom_property_alias_dict = {'color': {'col-', 'c-', }, }     # Same content, same key.
+        self.assertNotEqual(cache_path, changed_path)
+        self.assertEqual(changed_path, data_library.alias_cache_path())
+
+    def test_code_version(self):
+        version = {}
+        project_root = path.dirname(path.dirname(path.dirname(path.abspath(__file__))))
+        with open(path.join(project_root, 'version.py'), 'rb') as version_file:
+            exec(version_file.read(), version)
+        blowdrycss_version, cssutils_version, source_hash = DataLibrary.code_version()
+        self.assertEqual(blowdrycss_version, version['__version__'])                # Source checkout. Not 'unknown'.
+        self.assertNotEqual(cssutils_version, 'unknown')
+        self.assertTrue(path.basename(DataLibrary().alias_cache_path()).startswith(
+            'alias_tables-' + version['__version__'] + '-'
+        ))
+
+    def test_alias_table_cache_corrupt_file(self):
+        alias_cache_directory = settings.alias_cache_directory
+        settings.alias_cache_directory = mkdtemp()
+        try:
+            data_library = DataLibrary()
+            with open(data_library.alias_cache_path(), 'wb') as cache_file:
+                cache_file.write(b'not a pickle')
+            self.assertFalse(data_library.load_alias_tables())
+            self.assertEqual(DataLibrary().property_alias_dict, data_library.property_alias_dict)   # Rebuilt.
+        finally:
+            rmtree(settings.alias_cache_directory)
+            settings.alias_cache_directory = alias_cache_directory
+
 
 if __name__ == '__main__':
     main()
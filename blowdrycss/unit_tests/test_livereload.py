@@ -0,0 +1,94 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+from hashlib import sha1
+from json import loads
+from io import StringIO
+from os import path, remove
+import socket
+import sys
+
+# custom
+from blowdrycss import livereload
+from blowdrycss.filehandler import CSSFile
+from blowdrycss.utilities import unittest_file_path, change_settings_for_testing
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestLiveReload(TestCase):
+    def setUp(self):
+        saved_stdout = sys.stdout
+        try:
+            sys.stdout = StringIO()
+            self.server = livereload.start(host='127.0.0.1', port=0)        # Pick a free port.
+        finally:
+            sys.stdout = saved_stdout
+
+    def tearDown(self):
+        livereload.stop()
+
+    def request(self, resource=''):
+        connection = socket.create_connection((self.server.host, self.server.port), timeout=5)
+        connection.sendall(('GET ' + resource + ' HTTP/1.0\r\nHost: localhost\r\n\r\n').encode('utf-8'))
+        return connection
+
+    @staticmethod
+    def read_until(connection, marker=b''):
+        received = b''
+        while marker not in received:
+            chunk = connection.recv(4096)
+            if not chunk:
+                break
+            received += chunk
+        return received
+
+    def test_client_script(self):
+        connection = self.request('/livereload.js')
+        response = self.read_until(connection, b'})();')
+        connection.close()
+        self.assertTrue(b'200' in response.split(b'\r\n')[0], msg=response)
+        self.assertTrue(b'EventSource' in response, msg=response)
+        self.assertTrue(str(self.server.port).encode('utf-8') in response, msg=response)
+
+    def test_not_found(self):
+        connection = self.request('/nothing')
+        response = self.read_until(connection, b'\r\n')
+        connection.close()
+        self.assertTrue(b'404' in response, msg=response)
+
+    def test_css_updated_event(self):
+        css_directory = settings.css_directory
+        settings.css_directory = unittest_file_path(folder='test_css')
+        connection = self.request('/events')
+        try:
+            self.read_until(connection, b': connected\n\n')                  # Subscribed.
+
+            css_file = CSSFile()
+            css_file.write(css_text=b'.bold {\n    font-weight: bold\n    }')
+            file_path = path.join(settings.css_directory, css_file.file_name + css_file.extension)
+            with open(file_path, 'rb') as _file:
+                expected_hash = sha1(_file.read()).hexdigest()
+
+            response = self.read_until(connection, b'}\n\n').decode('utf-8')
+            self.assertTrue('event: css-updated' in response, msg=response)
+            data = loads(response.split('data: ')[1].strip())
+            self.assertEqual(data, {'file': 'blowdry.css', 'hash': expected_hash})
+        finally:
+            connection.close()
+            settings.css_directory = css_directory
+            remove(file_path)
+
+    def test_css_updated_without_server(self):
+        livereload.stop()
+        livereload.css_updated(file_path='/not/a/file.css')                    # Must not raise.
+
+
+if __name__ == '__main__':
+    main()
@@ -144,6 +144,45 @@ class TestEnable(TestCase):
         finally:
             sys.stdout = saved_stdout
 
+    def test_enable_logging_queue(self):
+        settings.logging_enabled = True
+        settings.log_to_console = False
+        settings.log_to_file = True
+        settings.log_queue_enabled = True
+        settings.logging_level = logging.DEBUG
+        settings.log_directory = unittest_file_path(folder='log')       # Create the log directory inside of unit_tests.
+        log_file_path = path.join(settings.log_directory, settings.log_file_name)
+        message = 'Queued message %s'
+
+        if path.isfile(log_file_path):                                                  # Clear log file.
+            with open(log_file_path, 'w'):
+                pass
+
+        logger = logging.getLogger('')
+        saved_handlers = list(logger.handlers)
+        try:
+            log.enable()
+            new_handlers = [handler for handler in logger.handlers if handler not in saved_handlers]
+            self.assertEqual([type(handler).__name__ for handler in new_handlers], ['QueueHandler'])
+
+            log.enable()                                                                # Replaces the queue.
+            new_handlers = [handler for handler in logger.handlers if handler not in saved_handlers]
+            self.assertEqual([type(handler).__name__ for handler in new_handlers], ['QueueHandler'])
+
+            logging.debug(message, 123)
+            log.stop_queue()                                                            # Flush.
+            self.assertEqual(list(logger.handlers), saved_handlers)                     # Detached.
+
+            with open(log_file_path, 'r') as _file:
+                file_as_string = _file.read()
+            self.assertTrue(file_as_string.endswith('Queued message 123\n'), msg=file_as_string)
+        finally:
+            log.stop_queue()
+            settings.log_queue_enabled = False
+            for handler in logger.handlers[:]:
+                if handler not in saved_handlers:
+                    logger.removeHandler(handler)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,97 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+from io import StringIO
+from os import listdir, path, stat
+from shutil import rmtree
+from tempfile import mkdtemp
+import sys
+
+# custom
+from blowdrycss.metrics import Metrics, metrics
+from blowdrycss.timing import RunReport
+from blowdrycss.utilities import change_settings_for_testing, unittest_file_path
+import blowdrycss.blowdry as blowdry
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+def read_samples(file_path=''):
+    """ :return: (*dict*) -- Returns ``{metric name: value}`` of every sample line in ``file_path``. """
+    with open(file_path) as metrics_file:
+        lines = [line.split() for line in metrics_file if not line.startswith('#')]
+    return dict((name, float(value)) for name, value in lines)
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        self.metrics_path = settings.metrics_path
+        self.temporary_directory = mkdtemp()
+
+    def tearDown(self):
+        settings.metrics_path = self.metrics_path
+        rmtree(self.temporary_directory)
+
+    def test_disabled_writes_nothing(self):
+        settings.metrics_path = None
+        Metrics().flush()
+        self.assertEqual(listdir(self.temporary_directory), [])
+
+    def test_observe_text_and_flush(self):
+        settings.metrics_path = path.join(self.temporary_directory, 'blowdrycss.prom')
+        report = RunReport()
+        report.stages['build'] = 0.25
+        for name, value in (('files', 3), ('bytes_read', 300), ('cache_hits', 4), ('cache_misses', 6),
+                            ('rules', 5), ('output_bytes', 700)):
+            report.count(name, value)
+
+        run_metrics = Metrics()
+        run_metrics.observe(report=report, class_set={'bold', 'padding-10'})
+        run_metrics.observe(report=report, class_set={'bold'})
+        run_metrics.flush()
+
+        text = run_metrics.text()
+        self.assertTrue('# TYPE blowdrycss_parses_total counter\n' in text, msg=text)
+        self.assertTrue('# TYPE blowdrycss_classes_live gauge\n' in text, msg=text)
+
+        samples = read_samples(file_path=settings.metrics_path)
+        self.assertEqual(samples['blowdrycss_parses_total'], 2)                 # Counters accumulate.
+        self.assertEqual(samples['blowdrycss_files_scanned_total'], 6)
+        self.assertEqual(samples['blowdrycss_class_cache_hits_total'], 8)
+        self.assertEqual(samples['blowdrycss_class_cache_misses_total'], 12)
+        self.assertEqual(samples['blowdrycss_rules_emitted_total'], 10)
+        self.assertEqual(samples['blowdrycss_classes_live'], 1)                 # Gauges hold the last value.
+        self.assertEqual(samples['blowdrycss_output_bytes'], 700)
+        self.assertEqual(samples['blowdrycss_last_parse_duration_seconds'], 0.25)
+        self.assertEqual(listdir(self.temporary_directory), ['blowdrycss.prom'])   # No temporary file left.
+        self.assertEqual(stat(settings.metrics_path).st_mode & 0o777, 0o644)      # Readable by a collector.
+
+    def test_parse_writes_metrics(self):
+        settings.metrics_path = path.join(self.temporary_directory, 'blowdrycss.prom')
+        project_directory = settings.project_directory
+        settings.project_directory = unittest_file_path()
+        parses = metrics.values['blowdrycss_parses_total']
+
+        saved_stdout = sys.stdout
+        try:
+            sys.stdout = StringIO()
+            class_set, _ = blowdry.parse(recent=False, class_set=set(), css_text=b'')
+        finally:
+            sys.stdout = saved_stdout
+            settings.project_directory = project_directory
+
+        samples = read_samples(file_path=settings.metrics_path)
+        self.assertEqual(samples['blowdrycss_parses_total'], parses + 1)
+        self.assertEqual(samples['blowdrycss_classes_live'], len(class_set))
+        self.assertTrue(samples['blowdrycss_output_bytes'] > 0)
+        self.assertTrue(samples['blowdrycss_files_scanned_total'] > 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+from io import StringIO
+from os import listdir, path
+from shutil import rmtree
+from tempfile import mkdtemp
+import sys
+
+# custom
+from blowdrycss.profiling import Profiler, MemoryProfiler
+from blowdrycss.timing import RunReport
+from blowdrycss.utilities import change_settings_for_testing
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestProfiler(TestCase):
+    def setUp(self):
+        self.saved = settings.profile_enabled, settings.profile_every, settings.profile_directory
+        self.profile_directory = mkdtemp()
+        settings.profile_directory = self.profile_directory
+        self.saved_stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.saved_stdout
+        settings.profile_enabled, settings.profile_every, settings.profile_directory = self.saved
+        rmtree(self.profile_directory)
+
+    def test_disabled_writes_nothing(self):
+        settings.profile_enabled = False
+        profiler = Profiler()
+        self.assertEqual(profiler.run(sorted, [3, 1, 2]), [1, 2, 3])
+        self.assertEqual(listdir(self.profile_directory), [])
+
+    def test_every_nth_call_is_profiled(self):
+        settings.profile_enabled = True
+        settings.profile_every = 2
+        profiler = Profiler()
+        for _ in range(3):
+            self.assertEqual(profiler.run(sorted, [3, 1, 2]), [1, 2, 3])       # Calls 1 and 3 are sampled.
+
+        file_names = sorted(listdir(self.profile_directory))
+        self.assertEqual(len(file_names), 4, msg=file_names)
+        self.assertEqual(sum(file_name.endswith('.pstats') for file_name in file_names), 2)
+        summary_name = [file_name for file_name in file_names if file_name.endswith('.txt')][0]
+        with open(path.join(self.profile_directory, summary_name)) as summary_file:
+            self.assertTrue('cumulative' in summary_file.read())
+
+    def test_nested_call_not_profiled_separately(self):
+        settings.profile_enabled = True
+        settings.profile_every = 1
+        profiler = Profiler()
+
+        def outer():
+            return profiler.run(sorted, [2, 1])
+
+        self.assertEqual(profiler.run(outer), [1, 2])
+        self.assertEqual(profiler.call_count, 1)
+        self.assertEqual(len(listdir(self.profile_directory)), 2)
+
+    def test_concurrent_calls_start_one_collector(self):
+        from threading import Event, Thread
+        settings.profile_enabled = True
+        settings.profile_every = 1
+        profiler = Profiler()
+        start = Event()
+        sampled = []
+
+        def call():
+            start.wait()
+            sampled.append(profiler.should_profile())
+
+        threads = [Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        start.set()                                                             # Release every thread at once.
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sampled.count(True), 1)
+        self.assertTrue(profiler.active)                                        # Until run() finishes the call.
+        self.assertEqual(profiler.call_count, 1)
+
+
+class TestMemoryProfiler(TestCase):
+    def setUp(self):
+        self.memory_profile_enabled = settings.memory_profile_enabled
+        settings.memory_profile_enabled = True
+
+    def tearDown(self):
+        import tracemalloc
+        tracemalloc.stop()
+        settings.memory_profile_enabled = self.memory_profile_enabled
+
+    def test_stage_peak_retained_and_sites(self):
+        memory_profiler = MemoryProfiler()
+        memory = {}
+        with memory_profiler.stage('build', memory=memory):
+            retained = [bytearray(1000) for _ in range(1000)]                        # About 1 MB kept.
+            temporary = [bytearray(1000) for _ in range(2000)]                       # About 2 MB released.
+            del temporary
+
+        self.assertTrue(memory['build']['retained'] >= 1000 * 1000, msg=memory)
+        self.assertTrue(memory['build']['peak'] >= memory['build']['retained'] + 1000 * 1000, msg=memory)
+        self.assertTrue('test_profiling.py' in memory['build']['top'][0][0], msg=memory['build']['top'])
+        self.assertEqual(len(retained), 1000)
+
+    def test_growth_between_runs(self):
+        memory_profiler = MemoryProfiler()
+        self.assertEqual(memory_profiler.growth(), None)                        # First run. Nothing to compare.
+        leak = [bytearray(1000) for _ in range(1000)]
+        growth = memory_profiler.growth()
+        self.assertTrue(growth['bytes'] >= 1000 * 1000, msg=growth)
+        self.assertTrue('Growth since the previous run' in MemoryProfiler.table(memory={}, growth=growth))
+        self.assertEqual(len(leak), 1000)
+
+    def test_disabled_run_report_has_no_memory(self):
+        settings.memory_profile_enabled = False
+        report = RunReport()
+        with report.stage('discovery'):
+            pass
+        self.assertEqual(report.memory, {})
+
+
+if __name__ == '__main__':
+    main()
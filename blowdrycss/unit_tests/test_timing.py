@@ -8,9 +8,13 @@ from datetime import datetime
 from time import time, sleep
 from string import digits
 from io import StringIO
+from json import loads
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
 
 # custom
-from blowdrycss.timing import Timer, LimitTimer
+from blowdrycss.timing import Timer, LimitTimer, AdaptiveLimitTimer, RunReport, LatencyHistogram
 from blowdrycss.utilities import change_settings_for_testing
 import blowdrycss_settings as settings
 
@@ -101,5 +105,123 @@ class TestTiming(TestCase):
         self.assertTrue(start1 < start2)
 
 
+class TestAdaptiveLimitTimer(TestCase):
+    def setUp(self):
+        self.saved = settings.time_limit, settings.rescan_cost_ratio, settings.max_time_limit
+        settings.time_limit, settings.rescan_cost_ratio, settings.max_time_limit = 10, 100, 40
+
+    def tearDown(self):
+        settings.time_limit, settings.rescan_cost_ratio, settings.max_time_limit = self.saved
+
+    def test_adapt_idle_backs_off_to_max_time_limit(self):
+        limit_timer = AdaptiveLimitTimer()
+        expected_limits = [20, 40, 40]
+        for expected_limit in expected_limits:
+            limit_timer.adapt(scan_duration=0.0, event_count=0)
+            self.assertEqual(limit_timer.time_limit, expected_limit)
+        self.assertTrue('no file events' in limit_timer.reason, msg=limit_timer.reason)
+
+    def test_adapt_events_return_to_time_limit(self):
+        limit_timer = AdaptiveLimitTimer()
+        limit_timer.adapt(scan_duration=0.0, event_count=0)
+        limit_timer.adapt(scan_duration=0.01, event_count=3)
+        self.assertEqual(limit_timer.time_limit, 10)
+        self.assertTrue('3 file event(s)' in limit_timer.reason, msg=limit_timer.reason)
+
+    def test_adapt_scan_cost_floor(self):
+        limit_timer = AdaptiveLimitTimer()
+        limit_timer.adapt(scan_duration=2.0, event_count=5)
+        self.assertEqual(limit_timer.time_limit, 200.0)
+        self.assertTrue('100x the last scan duration' in limit_timer.reason, msg=limit_timer.reason)
+
+
+class TestRunReport(TestCase):
+    def test_stage_and_count_accumulate(self):
+        report = RunReport()
+        with report.stage('build'):
+            sleep(0.01)
+        first = report.stages['build']
+        with report.stage('build'):
+            pass
+        report.count('rules', 3)
+        report.count('rules', 2)
+        self.assertTrue(report.stages['build'] >= first >= 0.01, msg=report.stages)
+        self.assertEqual(report.counts['rules'], 5)
+
+    def test_stage_recorded_on_exception(self):
+        report = RunReport()
+        with self.assertRaises(ValueError):
+            with report.stage('discovery'):
+                raise ValueError('boom')
+        self.assertTrue('discovery' in report.stages)
+
+    def test_write_and_table(self):
+        report = RunReport()
+        with report.stage('extraction'):
+            pass
+        report.count('files', 4)
+        temporary_directory = mkdtemp()
+        try:
+            file_path = path.join(temporary_directory, 'report.json')
+            report.write(file_path=file_path)
+            with open(file_path) as report_file:
+                written = loads(report_file.read())
+            self.assertEqual(list(written['stages']), ['extraction'])
+            self.assertEqual(written['counts'], {'files': 4})
+            self.assertTrue(written['total_seconds'] >= written['stages']['extraction'])
+        finally:
+            rmtree(temporary_directory)
+
+        table = report.table()
+        for substring in ('extraction', 'total', 'files'):
+            self.assertTrue(substring in table, msg=table)
+
+    def test_top_table(self):
+        report = RunReport()
+        report.file_costs = {'/site/vendor.min.js': [0.9, 500 * 1024, 3], '/site/index.html': [0.1, 2048, 40]}
+        report.add_class_costs(class_costs={'bold': 0.001, 'padding-10-s': 0.004})
+        report.add_class_costs(class_costs={'padding-10-s': 0.002})
+
+        self.assertEqual(report.slowest_files(top=1), [['/site/vendor.min.js', 0.9, 500 * 1024, 3]])
+        self.assertEqual(report.costliest_classes(top=2)[0][0], 'padding-10-s')
+        self.assertAlmostEqual(report.costliest_classes(top=2)[0][1], 0.006)
+
+        table = report.top_table(top=5)
+        for substring in ('/site/vendor.min.js', '/site/index.html', 'padding-10-s', 'Suggestion: /site/vendor.min.js'):
+            self.assertTrue(substring in table, msg=table)
+
+
+class TestLatencyHistogram(TestCase):
+    def test_percentiles_rolling_window(self):
+        latency = LatencyHistogram(window=100)
+        self.assertEqual(latency.percentiles('total'), {})
+        for index in range(150):
+            latency.record(queueing=0.001 * index, debounce=-1.0, parse=0.002, write=0.0)   # Negative is clamped.
+
+        self.assertEqual(latency.count, 150)
+        self.assertEqual(len(latency.samples['queueing']), 100)               # Samples 50 to 149 are kept.
+        percentiles = latency.percentiles('queueing')
+        self.assertAlmostEqual(percentiles['p50'], 0.099)
+        self.assertAlmostEqual(percentiles['p95'], 0.144)
+        self.assertAlmostEqual(percentiles['p99'], 0.148)
+        self.assertAlmostEqual(latency.percentiles('total')['p50'], 0.101)
+        self.assertEqual(latency.percentiles('debounce')['p99'], 0.0)
+
+    def test_write_and_table(self):
+        latency = LatencyHistogram()
+        latency.record(queueing=0.01, debounce=0.0, parse=0.02, write=0.005)
+        temporary_directory = mkdtemp()
+        try:
+            file_path = path.join(temporary_directory, 'latency.json')
+            latency.write(file_path=file_path)
+            with open(file_path) as stats_file:
+                stats = loads(stats_file.read())
+            self.assertEqual(stats['samples'], 1)
+            self.assertAlmostEqual(stats['phases']['total']['p95'], 0.035)
+        finally:
+            rmtree(temporary_directory)
+        self.assertTrue('parse' in latency.table() and '35.0' in latency.table(), msg=latency.table())
+
+
 if __name__ == '__main__':
     main()
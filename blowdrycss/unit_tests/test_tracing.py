@@ -0,0 +1,82 @@
+# python 2
+from __future__ import absolute_import, unicode_literals
+
+# builtins
+from unittest import TestCase, main
+from io import StringIO
+from json import loads
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+import sys
+
+# custom
+from blowdrycss.tracing import Tracer, tracer
+from blowdrycss.utilities import change_settings_for_testing, unittest_file_path
+import blowdrycss.blowdry as blowdry
+import blowdrycss_settings as settings
+
+change_settings_for_testing()
+
+__author__ = 'chad nelson'
+__project__ = 'blowdrycss'
+
+
+class TestTracer(TestCase):
+    def setUp(self):
+        self.trace_path = settings.trace_path
+        self.temporary_directory = mkdtemp()
+
+    def tearDown(self):
+        settings.trace_path = self.trace_path
+        rmtree(self.temporary_directory)
+
+    def test_disabled_records_nothing(self):
+        settings.trace_path = None
+        trace = Tracer()
+        with trace.span('build', category='stage'):
+            pass
+        trace.instant('modified', category='watch')
+        trace.flush()
+        self.assertEqual(len(trace.events), 0)
+
+    def test_span_instant_and_flush(self):
+        settings.trace_path = path.join(self.temporary_directory, 'trace.json')
+        trace = Tracer(max_events=2)
+        with trace.span('extract', category='file', file='index.html'):
+            pass
+        trace.instant('modified', category='watch', file='index.html')
+        with trace.span('write', category='output'):
+            pass
+        trace.flush()
+
+        with open(settings.trace_path) as trace_file:
+            events = loads(trace_file.read())['traceEvents']
+        self.assertEqual([event['ph'] for event in events], ['M', 'i', 'X'])     # Oldest event dropped.
+        self.assertEqual(events[1]['args'], {'file': 'index.html'})
+        self.assertTrue(events[2]['dur'] >= 0 and events[2]['ts'] >= events[1]['ts'])
+        self.assertEqual(events[0]['tid'], events[2]['tid'])
+
+    def test_parse_records_stages_files_and_outputs(self):
+        settings.trace_path = path.join(self.temporary_directory, 'trace.json')
+        project_directory = settings.project_directory
+        settings.project_directory = unittest_file_path()
+        tracer.events.clear()
+
+        saved_stdout = sys.stdout
+        try:
+            sys.stdout = StringIO()
+            blowdry.parse(recent=False, class_set=set(), css_text=b'')
+        finally:
+            sys.stdout = saved_stdout
+            settings.project_directory = project_directory
+
+        with open(settings.trace_path) as trace_file:
+            events = loads(trace_file.read())['traceEvents']
+        categories = set((event.get('cat'), event['name']) for event in events)
+        for expected in (('stage', 'discovery'), ('stage', 'extraction'), ('file', 'extract'), ('output', 'write')):
+            self.assertTrue(expected in categories, msg=categories)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ import logging
 import sys
 from io import StringIO, open
 from time import sleep
+from json import loads
 
 # plugins
 from watchdog.observers import Observer
@@ -234,5 +235,127 @@ class TestFileEditEventHandler(TestCase):
         observer.join()
 
 
+    def test_fast_path_then_reconcile(self):
+        # Integration test
+        test_examplesite = unittest_file_path(folder='test_examplesite')
+        fast_dot_html = unittest_file_path(folder='test_examplesite', filename='fast.html')
+        reconcile_delay = settings.reconcile_delay
+        settings.reconcile_delay = 0.05
+
+        make_directory(test_examplesite)
+        with open(fast_dot_html, 'w', encoding='utf-8') as _file:
+            _file.write('<html><div class="bold"></div></html>')
+
+        event_handler = FileEditEventHandler(
+            patterns=['*.html'],
+            ignore_patterns=[],
+            ignore_directories=True
+        )
+
+        saved_stdout = sys.stdout
+        try:
+            out = StringIO()
+            sys.stdout = out
+
+            event_handler.fast_path(src_path=fast_dot_html)
+            self.assertTrue('bold' in event_handler.class_set)
+            self.assertTrue('Fast path: 1 class selector(s) added' in out.getvalue(), msg=out.getvalue())
+            self.assertTrue(event_handler.reconcile_timer is not None)
+
+            count = 0
+            while 'Ctrl + C' not in out.getvalue():
+                if count > 100:             # Max wait is 5 seconds.
+                    break
+                else:
+                    sleep(0.05)
+                    count += 1
+
+            output = out.getvalue()
+            self.assertTrue('~~~ blowdrycss started ~~~' in output, msg=output)
+            self.assertTrue('bold' in event_handler.class_set)
+        finally:
+            sys.stdout = saved_stdout
+            settings.reconcile_delay = reconcile_delay
+            remove(fast_dot_html)
+
+
+    def test_fast_path_records_latency(self):
+        test_examplesite = unittest_file_path(folder='test_examplesite')
+        latency_dot_html = unittest_file_path(folder='test_examplesite', filename='latency.html')
+        stats_path = unittest_file_path(folder='test_examplesite', filename='latency.json')
+        saved = settings.reconcile_delay, settings.latency_stats_path, settings.latency_print_every
+        settings.reconcile_delay, settings.latency_stats_path, settings.latency_print_every = 60, stats_path, 1
+
+        make_directory(test_examplesite)
+        with open(latency_dot_html, 'w', encoding='utf-8') as _file:
+            _file.write('<html><div class="italic"></div></html>')
+
+        event_handler = FileEditEventHandler(
+            patterns=['*.html'],
+            ignore_patterns=[],
+            ignore_directories=True
+        )
+
+        saved_stdout = sys.stdout
+        try:
+            out = StringIO()
+            sys.stdout = out
+
+            event_handler.fast_path(src_path=latency_dot_html)
+            event_handler.fast_path(src_path=latency_dot_html)                  # Nothing new. Nothing written.
+            event_handler.reconcile_timer.cancel()
+
+            self.assertEqual(event_handler.latency.count, 1)
+            self.assertTrue('Latency (ms)' in out.getvalue(), msg=out.getvalue())
+            with open(stats_path, encoding='utf-8') as stats_file:
+                stats = loads(stats_file.read())
+            self.assertEqual(stats['samples'], 1)
+            self.assertEqual(sorted(stats['phases']), ['debounce', 'parse', 'queueing', 'total', 'write'])
+        finally:
+            sys.stdout = saved_stdout
+            settings.reconcile_delay, settings.latency_stats_path, settings.latency_print_every = saved
+            remove(latency_dot_html)
+            remove(stats_path)
+
+    def test_suppressed_event_records_debounce(self):
+        from os import utime
+        from time import time
+        from watchdog.events import FileModifiedEvent
+        test_examplesite = unittest_file_path(folder='test_examplesite')
+        debounce_dot_html = unittest_file_path(folder='test_examplesite', filename='debounce.html')
+        saved = settings.fast_path_enabled, settings.latency_stats_path, settings.latency_print_every
+        settings.fast_path_enabled, settings.latency_stats_path, settings.latency_print_every = False, '', 0
+
+        make_directory(test_examplesite)
+        with open(debounce_dot_html, 'w', encoding='utf-8') as _file:
+            _file.write('<html><div class="italic"></div></html>')
+
+        event_handler = FileEditEventHandler(patterns=['*.html'], ignore_patterns=[], ignore_directories=True)
+        saved_stdout = sys.stdout
+        try:
+            sys.stdout = StringIO()
+            event_handler.on_modified(FileModifiedEvent(debounce_dot_html))     # First event always runs.
+            self.assertEqual(list(event_handler.latency.samples['debounce']), [0.0])
+
+            event_handler.on_modified(FileModifiedEvent(debounce_dot_html))     # Within the limit. Suppressed.
+            self.assertEqual(event_handler.latency.count, 1)
+            self.assertTrue(event_handler.suppressed_since is not None)
+
+            event_handler.suppressed_since -= 2                                 # It waited two seconds.
+            event_handler.limit_timer.start_time -= 10                          # The limit has passed.
+            with open(debounce_dot_html, 'w', encoding='utf-8') as _file:
+                _file.write('<html><div class="italic bold"></div></html>')
+            utime(debounce_dot_html, (time() + 1, time() + 1))                  # Newer than blowdry.css.
+            event_handler.on_modified(FileModifiedEvent(debounce_dot_html))
+
+            self.assertEqual(event_handler.latency.count, 2)
+            self.assertTrue(event_handler.latency.samples['debounce'][-1] >= 2, msg=event_handler.latency.samples)
+            self.assertEqual(event_handler.suppressed_since, None)
+        finally:
+            sys.stdout = saved_stdout
+            settings.fast_path_enabled, settings.latency_stats_path, settings.latency_print_every = saved
+            remove(debounce_dot_html)
+
+
 if __name__ == '__main__':
     main()
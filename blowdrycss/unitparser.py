@@ -5,7 +5,7 @@ from __future__ import absolute_import
 from string import digits
 
 # custom
-import blowdrycss_settings as settings
+from blowdrycss.config import Config
 
 __author__ = 'chad nelson'
 __project__ = 'blowdrycss'
@@ -55,10 +55,13 @@ class UnitParser(object):
         one em in a 16-point typeface is 16 points. Therefore, this unit is the same for all typefaces at a
         given point size.
 
+    **config** (*Config*) -- Optional. Holds ``use_em`` and ``base``. Defaults to ``Config.from_settings()``.
+
     """
 
-    def __init__(self, property_name=''):
+    def __init__(self, property_name='', config=None):
         self.property_name = property_name
+        self.config = Config.from_settings() if config is None else config
         self.allowed = set(digits + '-.px')
 
         # Reference: http://www.w3.org/TR/CSS21/propidx.html
@@ -205,8 +208,8 @@ class UnitParser(object):
             for val in property_value.split():                                      # single, double and quadruple
                 if set(val) <= self.allowed:
                     val = val.replace('px', '')                                     # Handle 'px' units case.
-                    if settings.use_em and default_units == 'px':                   # Convert units if required.
-                        new_value.append(settings.px_to_em(pixels=val))
+                    if self.config.use_em and default_units == 'px':                # Convert units if required.
+                        new_value.append(self.config.px_to_em(pixels=val))
                     else:
                         new_value.append(val + default_units)                       # Use default units.
                 else:                                                               
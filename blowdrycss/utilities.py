@@ -6,6 +6,7 @@ from builtins import str, round
 from re import search, findall
 from inspect import currentframe
 from os import path, stat, getcwd, makedirs, remove
+from tempfile import gettempdir
 import logging
 
 # custom
@@ -197,6 +198,9 @@ def change_settings_for_testing():
         settings.css_directory = path.join(settings.project_directory, 'test_css')
         settings.docs_directory = path.join(cwd, 'blowdrycss', 'unit_tests', 'test_docs')
 
+    # Keep the caches out of the developer's home directory.
+    settings.alias_cache_directory = path.join(gettempdir(), 'blowdrycss_unit_tests_cache')
+
 
 def unittest_file_path(folder='', filename=''):
     """ Determines the path of assigned to the folder and file based on the directory in which the unittest command
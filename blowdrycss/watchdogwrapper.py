@@ -4,7 +4,9 @@ from builtins import str
 
 # builtins
 import logging
-from time import sleep
+from os import path
+from threading import Lock, Timer
+from time import sleep, time
 
 # plugins
 from watchdog.events import PatternMatchingEventHandler, FileModifiedEvent
@@ -12,7 +14,12 @@ from watchdog.observers import Observer
 
 # custom
 from blowdrycss.utilities import print_blow_dryer
-from blowdrycss.timing import LimitTimer
+from blowdrycss.timing import LimitTimer, AdaptiveLimitTimer, LatencyHistogram, RunReport
+from blowdrycss.filehandler import FileManifest
+from blowdrycss.metrics import metrics
+from blowdrycss.tracing import tracer
+from blowdrycss.pollingobserver import ManifestPollingObserver
+from blowdrycss import livereload
 from blowdrycss import blowdry
 import blowdrycss_settings as settings
 
@@ -28,12 +35,34 @@ class FileEditEventHandler(PatternMatchingEventHandler):
 
     class_set (*set*) -- Keeps track of the current set of css class selectors.
 
+    event_count (*int*) -- Number of file events parsed since the last comprehensive run. Used by
+    ``AdaptiveLimitTimer`` to gauge file activity.
+
+    **Two-phase update:** If ``settings.fast_path_enabled == True``, then each save first runs
+    ``blowdry.fast_parse()`` on the saved file only. Its new rules are appended to the output immediately.
+    Afterwards, once no file was saved for ``settings.reconcile_delay`` seconds, a background reconciliation
+    runs ``blowdry.parse(recent=True)`` over every file modified since the previous reconciliation and rewrites
+    the output in its canonical form. ``lock`` serializes the two phases.
+
+    latency (*LatencyHistogram*) -- Rolling edit-to-CSS latency of every save that rewrote the output files. With the
+    fast path, ``debounce`` is the time spent waiting for a running reconciliation. Without it, ``debounce`` runs
+    from the first event suppressed by ``limit_timer`` to the run that picks its edit up.
+
+    suppressed_since (*float*) -- Epoch time of the first event suppressed by ``limit_timer`` since the last run.
+    ``None`` if no event is pending.
+
     """
     def __init__(self, patterns=None, ignore_patterns=None, ignore_directories=False, case_sensitive=False):
         self.class_set = set()
         self.css_text = b''
+        self.event_count = 0
+        self.lock = Lock()
+        self.reconcile_timer = None
+        self.reconcile_since = time()
         self.limit_timer = LimitTimer()
         self.limit_timer.time_limit = 0
+        self.latency = LatencyHistogram(window=settings.latency_window)
+        self.suppressed_since = None
         super(PatternMatchingEventHandler, self).__init__()
 
         self._patterns = patterns
@@ -93,6 +122,12 @@ class FileEditEventHandler(PatternMatchingEventHandler):
         file_modified = type(event) == FileModifiedEvent
         not_excluded = not self.excluded(src_path=event.src_path)
         limit = 3
+        tracer.instant(event.event_type, category='watch', file=event.src_path)
+
+        if settings.fast_path_enabled:                                          # Double runs are cheap no-ops.
+            if file_modified and not_excluded:
+                self.fast_path(src_path=event.src_path)
+            return
 
         if self.limit_timer.time_limit == limit:
             limit_exceeded = self.limit_timer.limit_exceeded
@@ -100,12 +135,126 @@ class FileEditEventHandler(PatternMatchingEventHandler):
             self.limit_timer.time_limit = limit
             limit_exceeded = True
 
+        if file_modified and not_excluded and not limit_exceeded:
+            if self.suppressed_since is None:                                   # The edit waits for the next run.
+                self.suppressed_since = time()
+
         if file_modified and not_excluded and limit_exceeded:
-            logging.debug('File ' + event.event_type + ' --> ' + str(event.src_path))
-            self.class_set, self.css_text = blowdry.parse(recent=True, class_set=self.class_set, css_text=self.css_text)
+            logging.debug('File %s --> %s', event.event_type, event.src_path)
+            started = time()
+            received = started if self.suppressed_since is None else self.suppressed_since
+            self.suppressed_since = None
+            report = RunReport()
+            self.class_set, self.css_text = blowdry.parse(
+                recent=True, class_set=self.class_set, css_text=self.css_text, report=report
+            )
+            self.record_latency(
+                src_path=event.src_path, received=received, started=started, finished=time(), report=report
+            )
+            self.event_count += 1
             self.print_status()
             self.limit_timer.reset()
 
+    def fast_path(self, src_path=''):
+        """ Phase one: immediately append the rules for classes introduced by ``src_path``. Then (re)schedule the
+        background reconciliation.
+
+        :type src_path: str
+        :param src_path: Source path of the saved file.
+
+        :return: None
+
+        """
+        logging.debug('Fast path --> %s', src_path)
+        received = time()
+        report = RunReport()
+        with self.lock, tracer.span('fast_path', category='watch', file=src_path):
+            started = time()
+            try:
+                self.class_set, self.css_text = blowdry.fast_parse(
+                    file_path=src_path, class_set=self.class_set, css_text=self.css_text, report=report
+                )
+            except OSError:                                                     # Deleted before it could be read.
+                return
+            self.event_count += 1
+        finished = time()
+        tracer.flush()
+        if settings.metrics_path:
+            metrics.observe(report=report, class_set=self.class_set)
+            metrics.flush()
+        self.record_latency(src_path=src_path, received=received, started=started, finished=finished, report=report)
+        self.schedule_reconcile()
+
+    def record_latency(self, src_path='', received=0.0, started=0.0, finished=0.0, report=None):
+        """ Add the edit-to-CSS latency of ``src_path`` to ``latency`` if the output files were rewritten.
+        Print the percentiles every ``settings.latency_print_every`` edits, and rewrite ``settings.latency_stats_path``.
+
+        :type src_path: str
+        :param src_path: Source path of the saved file. Its modification time is when the edit happened.
+
+        :type received: float
+        :param received: Epoch time the file event reached the event handler.
+
+        :type started: float
+        :param started: Epoch time processing started.
+
+        :type finished: float
+        :param finished: Epoch time the output files were written.
+
+        :type report: RunReport
+        :param report: Stages of the parse that processed the event.
+
+        :return: None
+
+        """
+        if not ('write' in report.stages or 'minify' in report.stages):     # Nothing was rewritten.
+            return
+
+        write = report.stages.get('write', 0.0) + report.stages.get('minify', 0.0)
+
+        try:
+            modified = path.getmtime(src_path)
+        except OSError:                                                         # Deleted since.
+            modified = received
+        self.latency.record(
+            queueing=received - modified,
+            debounce=started - received,
+            parse=finished - started - write,
+            write=write,
+        )
+
+        if settings.latency_stats_path:
+            self.latency.write(file_path=settings.latency_stats_path)
+        if settings.latency_print_every and self.latency.count % settings.latency_print_every == 0:
+            print(self.latency.table())
+
+    def schedule_reconcile(self):
+        """ Cancel the pending reconciliation (if any), and schedule a new one ``settings.reconcile_delay`` seconds
+        from now. Successive saves are coalesced into one reconciliation.
+
+        :return: None
+
+        """
+        if self.reconcile_timer is not None:
+            self.reconcile_timer.cancel()
+        self.reconcile_timer = Timer(settings.reconcile_delay, self.reconcile)
+        self.reconcile_timer.daemon = True
+        self.reconcile_timer.start()
+
+    def reconcile(self):
+        """ Phase two: parse every file modified since the previous reconciliation, and rewrite the output files.
+
+        :return: None
+
+        """
+        with self.lock, tracer.span('reconcile', category='watch'):
+            since, self.reconcile_since = self.reconcile_since, time()
+            self.class_set, self.css_text = blowdry.parse(
+                recent=True, class_set=self.class_set, css_text=self.css_text, since=since
+            )
+        tracer.flush()
+        self.print_status()
+
 
 def main():
     """ If ``settings.auto_generate == True`` indefinitely run blowdrycss inside of the watchdog wrapper.
@@ -114,6 +263,9 @@ def main():
 
     Else, blowdry.comprehensive_parser() is run once.
 
+    If ``settings.adaptive_time_limit == True`` the periodic comprehensive run is skipped whenever the
+    ``FileManifest`` shows that no project file changed, and ``AdaptiveLimitTimer`` chooses the next interval.
+
     :return: None
 
     **Example**
@@ -141,30 +293,62 @@ def main():
             ignore_directories=True
         )
 
-        observer = Observer()
+        if settings.polling_enabled:                                            # File events may never arrive.
+            observer = ManifestPollingObserver()
+        else:
+            observer = Observer()
         observer.schedule(event_handler, settings.project_directory, recursive=True)
         observer.start()
 
-        limit_timer = LimitTimer()
+        if settings.live_reload_enabled:
+            livereload.start(host=settings.live_reload_host, port=settings.live_reload_port)
+
+        if settings.adaptive_time_limit:
+            limit_timer = AdaptiveLimitTimer()
+            file_manifest = FileManifest()                                      # Snapshot before parsing.
+        else:
+            limit_timer = LimitTimer()
 
         # Parse all files.
+        scan_start = time()
         event_handler.class_set, event_handler.css_text = blowdry.parse(recent=False, class_set=set(), css_text=b'')
+        scan_duration = time() - scan_start
         event_handler.print_status()
 
         try:
             while True:
                 sleep(1)
+                if settings.metrics_path:
+                    event_queue = getattr(observer, 'event_queue', None)       # The polling observer has no queue.
+                    queue_depth = 0 if event_queue is None else event_queue.qsize()
+                    if queue_depth != metrics.values['blowdrycss_event_queue_depth']:
+                        metrics.set('blowdrycss_event_queue_depth', queue_depth)
+                        metrics.flush()
                 if limit_timer.limit_exceeded:                                          # Periodically parse all files.
                     print('----- Limit timer expired -----')
-                    event_handler.class_set, event_handler.css_text = blowdry.parse(
-                        recent=False, class_set=set(), css_text=b''
-                    )
-                    event_handler.print_status()
+                    if settings.adaptive_time_limit and not file_manifest.has_drifted():
+                        print('----- No file changes detected. Comprehensive run skipped. -----')
+                        logging.info('Comprehensive run skipped. No drift detected by the file manifest.')
+                    else:
+                        if settings.adaptive_time_limit:
+                            file_manifest.refresh()                             # Snapshot before parsing.
+                        scan_start = time()
+                        with event_handler.lock:                                # Wait for the fast path.
+                            event_handler.class_set, event_handler.css_text = blowdry.parse(
+                                recent=False, class_set=set(), css_text=b''
+                            )
+                        scan_duration = time() - scan_start
+                        event_handler.print_status()
+                    if settings.adaptive_time_limit:
+                        limit_timer.adapt(scan_duration=scan_duration, event_count=event_handler.event_count)
+                        event_handler.event_count = 0
+                        print('----- Next comprehensive run in', limit_timer.time_limit, 'seconds -----')
                     limit_timer.reset()
                     print('----- Limit timer reset -----')
 
         except KeyboardInterrupt:
             observer.stop()
+            livereload.stop()
             print_blow_dryer()
 
         observer.join()
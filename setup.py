@@ -196,7 +196,7 @@ setup(
     #package_dir={'': 'blowdrycss'},
     #packages=find_packages('blowdrycss', exclude=['*.settings', '*.settings.*', 'settings.*', 'settings']),
     #packages=find_packages(exclude=['*.settings']),   # THIS ONE WORKED BUT IS NO LONGER NEEDED
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
 
     # Alternatively, if you want to distribute just a my_module.py, uncomment
     # this:
@@ -241,7 +241,8 @@ setup(
     entry_points={
         'console_scripts': [
             #'blowdrycss=blowdrycss.blowdry:main',
-            'blowdrycss=blowdrycss.watchdogwrapper:main',
+            'blowdrycss=blowdrycss.cli:main',
+            'blowdrycss-daemon=blowdrycss.daemon:main',
         ],
     },
 